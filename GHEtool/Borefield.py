@@ -5,21 +5,24 @@ from __future__ import annotations
 
 import copy
 import math
+import os
 import warnings
 from math import pi
-from typing import Tuple, Union
+from time import perf_counter
+from typing import Callable, Tuple, Union
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pygfunction as gt
 
 from numpy.typing import ArrayLike
-from scipy.signal import convolve
+from scipy.signal import convolve, fftconvolve
 
 from GHEtool.VariableClasses import FluidData, Borehole, GroundConstantTemperature, ResultsMonthly, ResultsHourly, \
     TemperatureDependentFluidData, SCOP, SEER
 from GHEtool.VariableClasses import CustomGFunction, load_custom_gfunction, GFunction, CalculationSetup, Cluster, \
-    EERCombined
+    EERCombined, GFunctionLibrary
+from GHEtool.VariableClasses.LoadAggregation import LoadAggregation
+from GHEtool.VariableClasses.SpectralConvolution import SpectralConvolution
 from GHEtool.VariableClasses.LoadData import *
 from GHEtool.VariableClasses.LoadData import _LoadData, _LoadDataBuilding
 from GHEtool.VariableClasses.PipeData import _PipeData
@@ -76,6 +79,8 @@ class Borefield(BaseClass):
         """
 
         self.limiting_quadrant: int = 0  # parameter that tells in which quadrant the field is limited
+        self.sizing_iterations: int = 0  # number of temperature profile evaluations in the last sizing iteration
+        self.sizing_stage_times: dict = {}  # time spent in every sizing method of the last sizing [s]
         # m hereafter one needs to chance to fewer boreholes with more depth, because the calculations are no longer
         # that accurate.
 
@@ -83,6 +88,9 @@ class Borefield(BaseClass):
             raise ValueError('Please check your input for the Borefield class')
 
         self.gfunction_calculation_object: GFunction = GFunction()
+        self._spectral_convolution: SpectralConvolution = SpectralConvolution()
+        self._load_aggregation: LoadAggregation = LoadAggregation()
+        self._gfunction_library: GFunctionLibrary = None
 
         # initialize variables for temperature plotting
         self.results: ResultsMonthly | ResultsHourly = ResultsMonthly()
@@ -448,7 +456,13 @@ class Borefield(BaseClass):
         self.avg_tilt = np.average(borefield.tilt)
         if not np.all(borefield.tilt == 0):
             self.gfunction_calculation_object.options['method'] = 'similarities'
-        self.gfunction_calculation_object.remove_previous_data()
+        if self.gfunction_calculation_object._check_borefield(borefield):
+            # the same borefield is set again, so its previous data is reset
+            self.gfunction_calculation_object.remove_previous_data()
+        else:
+            # the previous data is kept in the cache, in case the previous borefield is used again
+            self.gfunction_calculation_object.cache_previous_data()
+        self._spectral_convolution.reset()
         unequal_length = not np.all(borefield.H == self.H)
         if unequal_length:
             self.gfunction_calculation_object._store_previous_values = not unequal_length
@@ -468,7 +482,8 @@ class Borefield(BaseClass):
         None
         """
         self._borefield = None
-        self.gfunction_calculation_object.remove_previous_data()
+        self.gfunction_calculation_object.cache_previous_data()
+        self._spectral_convolution.reset()
         self.custom_gfunction = None
 
     def load_custom_gfunction(self, location: str) -> None:
@@ -486,6 +501,7 @@ class Borefield(BaseClass):
         """
 
         self.custom_gfunction = load_custom_gfunction(location)
+        self._spectral_convolution.reset()
 
     def set_investment_cost(self, investment_cost: list = None) -> None:
         """
@@ -641,8 +657,9 @@ class Borefield(BaseClass):
         # new ground data implies that a new g-function should be loaded
         self.custom_gfunction = None
 
-        # the stored gfunction data should be deleted
-        self.gfunction_calculation_object.remove_previous_data()
+        # the stored gfunction data is moved to the cache, since it is only valid for the previous alpha
+        self.gfunction_calculation_object.cache_previous_data()
+        self._spectral_convolution.reset()
 
     @property
     def pipe_data(self) -> _PipeData:
@@ -1034,6 +1051,9 @@ class Borefield(BaseClass):
         .. [#PeereThesis] Peere, W. (2020) Methode voor economische optimalisatie van geothermische verwarmings- en koelsystemen. Master thesis, Department of Mechanical Engineering, KU Leuven, Belgium.
         """
 
+        # the g-values can depend on the calculation setup, so the stored convolution responses are removed
+        self._spectral_convolution.reset()
+
         # if calculation_setup is not None, then the sizing setup is set directly
         if calculation_setup is not None:
             self._calculation_setup = calculation_setup
@@ -1102,17 +1122,26 @@ class Borefield(BaseClass):
         self._calculation_setup.update_variables(H_init=H_init, L2_sizing=L2_sizing, L3_sizing=L3_sizing,
                                                  L4_sizing=L4_sizing, quadrant_sizing=quadrant_sizing)
         self._calculation_setup.update_variables(**kwargs)
+        if kwargs:
+            # the g-values can depend on these options
+            self._spectral_convolution.reset()
 
         if not use_constant_Rb is None:
             self.borehole.use_constant_Rb = use_constant_Rb
 
         # sizes according to the correct algorithm
-        if self._calculation_setup.L2_sizing:
+        start = perf_counter()
+        if self._calculation_setup.cascade_sizing and not self._calculation_setup.L2_sizing:
+            length = self._size_cascade(H_init, self._calculation_setup.quadrant_sizing)
+        elif self._calculation_setup.L2_sizing:
             length = self.size_L2(H_init, self._calculation_setup.quadrant_sizing)
-        if self._calculation_setup.L3_sizing:
+            self.sizing_stage_times = {'L2': perf_counter() - start}
+        elif self._calculation_setup.L3_sizing:
             length = self.size_L3(H_init, self._calculation_setup.quadrant_sizing)
-        if self._calculation_setup.L4_sizing:
+            self.sizing_stage_times = {'L3': perf_counter() - start}
+        elif self._calculation_setup.L4_sizing:
             length = self.size_L4(H_init, self._calculation_setup.quadrant_sizing)
+            self.sizing_stage_times = {'L4': perf_counter() - start}
 
         # reset initial parameters
         self._calculation_setup.restore_backup()
@@ -1120,6 +1149,56 @@ class Borefield(BaseClass):
 
         return length
 
+    def _size_cascade(self, H_init: float, quadrant_sizing: int) -> float:
+        """
+        This function sizes the borefield with a cascade of sizing methods. The borefield is first sized with the
+        (fast) L2 method, of which the result is the initial borehole length of the L3 sizing. When the L4 sizing is
+        requested, the result of the L3 sizing is then used as the initial borehole length of the L4 sizing.
+        All but the last sizing method use tolerances that are cascade_tolerance_factor times larger.
+        When a preliminary sizing fails, the next sizing method starts from the previous initial borehole length.
+        The time spent in every sizing method is stored in sizing_stage_times.
+
+        Parameters
+        ----------
+        H_init : float
+            Initial borehole length for the first sizing method. If None, the default H_init is chosen.
+        quadrant_sizing : int
+            Differs from 0 when a sizing in a certain quadrant is desired.
+
+        Returns
+        -------
+        borehole length : float
+        """
+        stages = [('L3', self.size_L3)]
+        if not isinstance(self.load, _LoadDataBuilding):
+            # the L2 sizing falls back to the L3 sizing for building loads
+            stages.insert(0, ('L2', self.size_L2))
+        if self._calculation_setup.L4_sizing:
+            stages.append(('L4', self.size_L4))
+
+        atol, rtol = self._calculation_setup.atol, self._calculation_setup.rtol
+        factor = self._calculation_setup.cascade_tolerance_factor
+        self.sizing_stage_times = {}
+        for name, method in stages[:-1]:
+            self._calculation_setup.atol = atol * factor if atol else atol
+            self._calculation_setup.rtol = rtol * factor if rtol else rtol
+            start = perf_counter()
+            try:
+                H_init = method(H_init, quadrant_sizing) if name == 'L2' else \
+                    method(H_init, quadrant_sizing, optimise=True)
+            except (ValueError, MaximumNumberOfIterations, UnsolvableDueToTemperatureGradient):
+                # the next sizing method starts from the same initial borehole length
+                pass
+            finally:
+                self._calculation_setup.atol, self._calculation_setup.rtol = atol, rtol
+                self.sizing_stage_times[name] = perf_counter() - start
+
+        name, method = stages[-1]
+        start = perf_counter()
+        length = method(H_init, quadrant_sizing)
+        self.sizing_stage_times[name] = perf_counter() - start
+        return length
+
     def _select_size(self, size_max_temp: float, size_min_temp: float, hourly: bool = False) -> float:
         """
         This function selects the correct size based on a size for the minimum and maximum temperature.
@@ -1484,8 +1563,8 @@ class Borefield(BaseClass):
 
         return new_length
 
-    def _size_based_on_temperature_profile(self, quadrant: int, hourly: bool = False, deep_sizing: bool = False) -> (
-            float, bool):
+    def _size_based_on_temperature_profile(self, quadrant: int, hourly: bool = False, deep_sizing: bool = False,
+                                           hours: np.ndarray = None) -> (float, bool):
         """
         This function sizes based on the temperature profile.
         It sizes for a specific quadrant and can both size with a monthly or an hourly resolution.
@@ -1499,6 +1578,9 @@ class Borefield(BaseClass):
             True if an hourly resolution should be used
         deep_sizing : bool
             True if the slower method should be used for the sizing, which is robuster.
+        hours : np.ndarray
+            Hours at which the hourly temperatures are evaluated during the iteration. If None, the temperatures are
+            evaluated at all hours, or at the critical hours when sparse_hourly_sizing is set.
 
         Returns
         -------
@@ -1514,6 +1596,9 @@ class Borefield(BaseClass):
         if self.H < 1:
             self.H = 50
 
+        if hourly and hours is None and not deep_sizing and self._sparse_hourly_sizing_possible():
+            return self._size_sparse(quadrant)
+
         if deep_sizing:
             # set borefield to minimal borehole length
             self.H = 20
@@ -1537,15 +1622,59 @@ class Borefield(BaseClass):
 
             return tmin, tmax
 
+        def limiting_temperature(Tmin, Tmax) -> (float, float, float, float):
+            """
+            This function returns the limiting fluid temperature of the current temperature profile for the quadrant,
+            together with the temperature limit it is compared with and the (corrected) temperature limits.
+            """
+            if quadrant in (1, 2, 10):
+                # maximum temperature
+                if quadrant == 1:
+                    slice = self.results.peak_injection[: 8760 if hourly else 12]
+                    power = self.load.hourly_net_resulting_injection_power[:8760] if hourly else \
+                        self.load.monthly_peak_injection_simulation_period[:12]
+                elif quadrant == 2:
+                    slice = self.results.peak_injection[-8760 if hourly else -12:]
+                    power = self.load.hourly_net_resulting_injection_power[-8760:] if hourly else \
+                        self.load.monthly_peak_injection_simulation_period[-12:]
+                else:
+                    # over all years
+                    slice = self.results.peak_injection
+                    power = self.load.hourly_net_resulting_injection_power if hourly else \
+                        self.load.monthly_peak_injection_simulation_period
+                idx = np.argmax(slice)
+                Tmin, Tmax = correct_limits(power[idx], Tmin, Tmax, 'max')
+                return slice[idx], Tmax, Tmin, Tmax
+            # minimum temperature
+            if quadrant == 3:
+                slice = self.results.peak_extraction[: 8760 if hourly else 12]
+                power = self.load.hourly_net_resulting_injection_power[:8760] if hourly else \
+                    (-1) * self.load.monthly_peak_extraction_simulation_period[:12]
+            elif quadrant == 4:
+                slice = self.results.peak_extraction[-8760 if hourly else -12:]
+                power = self.load.hourly_net_resulting_injection_power[-8760:] if hourly else \
+                    (-1) * self.load.monthly_peak_extraction_simulation_period[-12:]
+            else:
+                # over all years
+                slice = self.results.peak_extraction
+                power = self.load.hourly_net_resulting_injection_power if hourly else \
+                    (-1) * self.load.monthly_peak_extraction_simulation_period
+            idx = np.argmin(slice)
+            Tmin, Tmax = correct_limits(power[idx], Tmin, Tmax, 'min')
+            return slice[idx], Tmin, Tmin, Tmax
+
+        solver = self._calculation_setup.sizing_solver
+        if solver != 'fixed_point' and not deep_sizing:
+            return self._size_with_root_finding(quadrant, hourly, limiting_temperature, hours)
+
         while not self._check_convergence(self.H, H_prev, i):
             if H_prev != 0:
                 self.H = self.H * .5 + H_prev * 0.5
-            if hourly:
-                self._calculate_temperature_profile(self.H, hourly=True, sizing=True, Tmin=Tmin, Tmax=Tmax,
+            if hours is None:
+                self._calculate_temperature_profile(self.H, hourly=hourly, sizing=True, Tmin=Tmin, Tmax=Tmax,
                                                     first_last_year=True)
             else:
-                self._calculate_temperature_profile(self.H, hourly=False, sizing=True, Tmin=Tmin, Tmax=Tmax,
-                                                    first_last_year=True)
+                self._calculate_sparse_temperature_profile(self.H, hours, Tmin)
 
             if np.isclose(H_prev2, self.H):
                 self.H = max(H_prev, self.H)
@@ -1555,77 +1684,292 @@ class Borefield(BaseClass):
             H_prev = self.H
 
             if not deep_sizing:
-                if quadrant == 1:
-                    # maximum temperature
-                    # convert back to required length
-                    slice = self.results.peak_injection[: 8760 if hourly else 12]
-                    idx = np.argmax(slice)
-                    max_val = slice[idx]
-                    Tmin, Tmax = correct_limits(
-                        self.load.hourly_net_resulting_injection_power[:8760][idx] if hourly else
-                        self.load.monthly_peak_injection_simulation_period[:12][idx], Tmin, Tmax, 'max')
-                    self.H = (max_val - self._Tg()) / (Tmax - self._Tg()) * H_prev
-                elif quadrant == 2:
-                    # maximum temperature
-                    # convert back to required length
-                    slice = self.results.peak_injection[-8760 if hourly else -12:]
-                    idx = np.argmax(slice)
-                    max_val = slice[idx]
-                    Tmin, Tmax = correct_limits(
-                        self.load.hourly_net_resulting_injection_power[-8760:][idx] if hourly else
-                        self.load.monthly_peak_injection_simulation_period[-12:][idx], Tmin, Tmax, 'max')
-                    self.H = (max_val - self._Tg()) / (Tmax - self._Tg()) * H_prev
-                elif quadrant == 3:
-                    # minimum temperature
-                    # convert back to required length
-                    slice = self.results.peak_extraction[: 8760 if hourly else 12]
-                    idx = np.argmin(slice)
-                    min_val = slice[idx]
-                    Tmin, Tmax = correct_limits(
-                        self.load.hourly_net_resulting_injection_power[:8760][idx] if hourly else
-                        (-1) * self.load.monthly_peak_extraction_simulation_period[:12][idx], Tmin, Tmax, 'min')
-                    self.H = (min_val - self._Tg()) / (Tmin - self._Tg()) * H_prev
-                elif quadrant == 4:
-                    # minimum temperature
-                    # convert back to required length
-                    slice = self.results.peak_extraction[-8760 if hourly else -12:]
-                    idx = np.argmin(slice)
-                    min_val = slice[idx]
-                    Tmin, Tmax = correct_limits(
-                        self.load.hourly_net_resulting_injection_power[-8760:][idx] if hourly else
-                        (-1) * self.load.monthly_peak_extraction_simulation_period[-12:][idx], Tmin, Tmax, 'min')
-                    self.H = (min_val - self._Tg()) / (Tmin - self._Tg()) * H_prev
-                elif quadrant == 10:
-                    # over all years
-                    # maximum temperature
-                    # convert back to required length
-                    slice = self.results.peak_injection
-                    idx = np.argmax(slice)
-                    max_val = slice[idx]
-                    Tmin, Tmax = correct_limits(
-                        self.load.hourly_net_resulting_injection_power[idx] if hourly else
-                        self.load.monthly_peak_injection_simulation_period[idx], Tmin, Tmax, 'max')
-                    self.H = (max_val - self._Tg()) / (Tmax - self._Tg()) * H_prev
-                elif quadrant == 20:
-                    # over all years
-                    # minimum temperature
-                    # convert back to required length
-                    slice = self.results.peak_extraction
-                    idx = np.argmin(slice)
-                    min_val = slice[idx]
-                    Tmin, Tmax = correct_limits(self.load.hourly_net_resulting_injection_power[idx] if hourly else
-                                                (-1) * self.load.monthly_peak_extraction_simulation_period[idx], Tmin,
-                                                Tmax,
-                                                'min')
-                    self.H = (min_val - self._Tg()) / (Tmin - self._Tg()) * H_prev
+                # convert back to required length
+                value, limit, Tmin, Tmax = limiting_temperature(Tmin, Tmax)
+                self.H = (value - self._Tg()) / (limit - self._Tg()) * H_prev
             elif self.ground_data.variable_Tg:
                 # for when the temperature gradient is active and it is injection
                 self.H = self.calculate_next_depth_deep_sizing(H_prev)
             if self.H < 0:
+                self.sizing_iterations = i + 1
                 return 0, False
 
             i += 1
+        self.sizing_iterations = i
+
+        return self._check_sizing(quadrant)
+
+    def _size_with_root_finding(self, quadrant: int, hourly: bool, limiting_temperature: Callable,
+                                hours: np.ndarray = None) -> (float, bool):
+        """
+        This function sizes the borefield by solving limiting temperature(H) = temperature limit with a bracketed
+        root-finding method (the sizing_solver of the calculation setup).
+
+        The root is first bracketed by the rescaling of the borehole length that is also used in the fixed-point
+        iteration, which is exact when the temperature difference with the ground is inversely proportional to the
+        borehole length. Once there is a borehole length that is too short and one that is too long,
+        the 'secant', 'illinois' (modified regula falsi) or 'brent' (inverse quadratic interpolation safeguarded with
+        bisection) method is used to find the root within this bracket. Every iteration costs one temperature profile
+        evaluation.
+
+        Parameters
+        ----------
+        quadrant : int
+            Quadrant for which the borefield is sized
+        hourly : bool
+            True if an hourly resolution should be used
+        limiting_temperature : callable
+            Function that returns the limiting fluid temperature of the current temperature profile, the temperature
+            limit and the (corrected) minimum and maximum temperature limits, given the current temperature limits.
+        hours : np.ndarray
+            Hours at which the hourly temperatures are evaluated. If None, the temperatures are evaluated at all hours.
+
+        Returns
+        -------
+        Borehole length : float
+            Required borehole length of the borefield [m]
+        Sized : bool
+            True if the required borehole length also satisfies the other temperature constraint [m]
+        """
+        solver = self._calculation_setup.sizing_solver
+        # the residual is positive when the borefield is too short
+        sign = 1 if quadrant in (1, 2, 10) else -1
+        Tmin, Tmax = self.Tf_min, self.Tf_max
+
+        # bracket with a borehole length that is too short (low) and one that is too long (high)
+        low, high = None, None
+        # residuals used in the Illinois method and the side of the bracket that was updated last
+        f_low, f_high, side = 0., 0., None
+        points = []
+        # last two steps of the borehole length, used in Brent's method
+        H, H_prev, steps, i = self.H, 0, (np.inf, np.inf), 0
+
+        while not self._check_convergence(H, H_prev, i):
+            self.H = H
+            if hours is None:
+                self._calculate_temperature_profile(H, hourly=hourly, sizing=True, Tmin=Tmin, Tmax=Tmax,
+                                                    first_last_year=True)
+            else:
+                self._calculate_sparse_temperature_profile(H, hours, Tmin)
+            value, limit, Tmin, Tmax = limiting_temperature(Tmin, Tmax)
+            residual = sign * (value - limit)
+            points.append((H, residual))
+            H_prev = H
+            i += 1
+
+            if residual == 0:
+                break
+            if residual > 0:
+                if solver == 'illinois' and side == 'low':
+                    f_high /= 2
+                low, f_low, side = H, residual, 'low'
+            else:
+                if solver == 'illinois' and side == 'high':
+                    f_low /= 2
+                high, f_high, side = H, residual, 'high'
+
+            if low is None or high is None:
+                # rescale the borehole length until the root is bracketed
+                H = (value - self._Tg()) / (limit - self._Tg()) * H_prev
+                if H < 0:
+                    self.sizing_iterations = i
+                    return 0, False
+                if low is None and H >= H_prev:
+                    H = H_prev / 2
+                elif high is None and H <= H_prev:
+                    H = H_prev * 2
+                continue
+
+            if solver == 'illinois':
+                H = (low * f_high - high * f_low) / (f_high - f_low)
+            else:
+                (H0, f0), (H1, f1) = points[-2], points[-1]
+                H = H1 - f1 * (H1 - H0) / (f1 - f0) if f1 != f0 else np.nan
+                if solver == 'brent' and len(points) > 2:
+                    (H2, f2) = points[-3]
+                    if f0 != f2 and f1 != f2 and f0 != f1:
+                        # inverse quadratic interpolation
+                        H = H2 * f0 * f1 / ((f2 - f0) * (f2 - f1)) + H0 * f2 * f1 / ((f0 - f2) * (f0 - f1)) + \
+                            H1 * f2 * f0 / ((f1 - f2) * (f1 - f0))
+                if not min(low, high) < H < max(low, high) or (solver == 'brent' and abs(H - H_prev) > steps[1] / 2):
+                    # bisection
+                    H = (low + high) / 2
+            steps = (abs(H - H_prev), steps[0])
+        self.sizing_iterations = i
+        self.H = H
+
+        return self._check_sizing(quadrant)
+
+    def _sparse_hourly_sizing_possible(self) -> bool:
+        """
+        This function checks whether the hourly sizing can evaluate the temperatures at the critical hours only.
+        This is not the case when the temperatures at different hours depend on each other through the load or the
+        fluid properties, when the flow rate is given per hour or when another convolution method than the direct
+        one is used.
+
+        Returns
+        -------
+        bool
+            True if the sparse hourly sizing can be used
+        """
+        return self._calculation_setup.sparse_hourly_sizing and \
+            self._calculation_setup.convolution_method == 'direct' and \
+            not isinstance(self.load, _LoadDataBuilding) and \
+            not isinstance(self.borehole.fluid_data, TemperatureDependentFluidData) and \
+            (self.borehole.use_constant_Rb or
+             not isinstance(self.borehole.flow_data, (VariableHourlyFlowRate, VariableHourlyMultiyearFlowRate)))
+
+    def _critical_hours(self, number_of_hours: int) -> np.ndarray:
+        """
+        This function returns the candidate critical hours of the current hourly temperature profile.
+        These are, for the first year, the last year and the whole simulation period, the hours with the highest and
+        lowest fluid temperatures and with the highest injection and extraction loads.
+
+        Parameters
+        ----------
+        number_of_hours : int
+            Number of hours that is selected for every criterion
+
+        Returns
+        -------
+        np.ndarray
+            Sorted array with the candidate critical hours
+        """
+        hourly_load = self.load.hourly_net_resulting_injection_power
+        size = hourly_load.size
+        hours = []
+        for window in (slice(0, min(8760, size)), slice(max(size - 8760, 0), size), slice(0, size)):
+            for values in (self.results.peak_injection[window], -self.results.peak_extraction[window],
+                           hourly_load[window], -hourly_load[window]):
+                k = min(number_of_hours, values.size)
+                hours.append(window.start + np.argpartition(-values, k - 1)[:k])
+        return np.unique(np.concatenate(hours))
+
+    def _critical_hour(self, quadrant: int) -> int:
+        """
+        This function returns the hour of the current hourly temperature profile that limits the sizing in a certain
+        quadrant.
+
+        Parameters
+        ----------
+        quadrant : int
+            Quadrant for which the borefield is sized
+
+        Returns
+        -------
+        int
+            Critical hour
+        """
+        size = self.results.peak_injection.size
+        start = max(size - 8760, 0) if quadrant in (2, 4) else 0
+        end = min(8760, size) if quadrant in (1, 3) else size
+        if quadrant in (1, 2, 10):
+            return start + int(np.argmax(self.results.peak_injection[start:end]))
+        return start + int(np.argmin(self.results.peak_extraction[start:end]))
+
+    def _calculate_sparse_temperature_profile(self, H: float, hours: np.ndarray, Tmin: float) -> None:
+        """
+        This function calculates the hourly fluid temperatures during sizing at some hours only.
+        The convolution with the hourly load and the borehole thermal resistance are only evaluated at these hours.
+        The peak injection temperature is -inf and the peak extraction temperature is inf at all the other hours,
+        so they are never selected as the limiting hour.
+
+        Parameters
+        ----------
+        H : float
+            Borehole length at which the temperatures should be evaluated [m]
+        hours : np.ndarray
+            Hours at which the temperatures should be evaluated
+        Tmin : float
+            Minimum allowed average fluid temperature [°C]
+
+        Returns
+        -------
+        None
+        """
+        hourly_load = self.load.hourly_net_resulting_injection_power
+        g_value_differences = np.diff(self.gfunction(self.load.time_L4, H), prepend=0)
+        result_convolution = np.array([np.dot(hourly_load[:hour + 1], g_value_differences[hour::-1])
+                                       for hour in hours]) * 1000
+
+        depth = self.calculate_depth(H, self.D)
+        k_s = self.ground_data.k_s(depth, self.D)
+        Tb = result_convolution / (2 * pi * k_s) / (H * self.number_of_boreholes) + self._Tg(H)
+        Rb = self.borehole.get_Rb(H, self.D, self.r_b, k_s, depth, temperature=Tmin,
+                                  nb_of_boreholes=self.number_of_boreholes,
+                                  use_explicit_models=self._calculation_setup.use_explicit_multipole,
+                                  simulation_period=self.load.simulation_period, power=hourly_load[hours])
+        Tf = Tb + hourly_load[hours] * 1000 * Rb / self.number_of_boreholes / H
+
+        borehole_wall_temperature = np.full(hourly_load.size, np.nan)
+        borehole_wall_temperature[hours] = Tb
+        peak_injection = np.full(hourly_load.size, -np.inf)
+        peak_injection[hours] = Tf
+        self.results = ResultsHourly(borehole_wall_temp=borehole_wall_temperature, temperature_fluid=peak_injection)
+        self.results._Tf_extraction = np.full(hourly_load.size, np.inf)
+        self.results._Tf_extraction[hours] = Tf
+
+    def _size_sparse(self, quadrant: int) -> (float, bool):
+        """
+        This function sizes the borefield with an hourly resolution, whilst the temperatures are only evaluated at
+        a set of candidate critical hours during the iteration.
+        The candidates are selected from a full temperature profile at the initial borehole length. After the
+        iteration, the full temperature profile is verified: when the limiting hour is not one of the candidates,
+        the critical hours of this profile are added to the candidates and the iteration is repeated.
+
+        Parameters
+        ----------
+        quadrant : int
+            Quadrant for which the borefield is sized
 
+        Returns
+        -------
+        Borehole length : float
+            Required borehole length of the borefield [m]
+        Sized : bool
+            True if the required borehole length also satisfies the other temperature constraint [m]
+
+        Raises
+        ------
+        MaximumNumberOfIterations
+            When the limiting hour is still not a candidate after the maximum number of iterations
+        """
+        number_of_hours = self._calculation_setup.sparse_hourly_candidates
+        self._calculate_temperature_profile(self.H, hourly=True, sizing=True, first_last_year=True)
+        hours = self._critical_hours(number_of_hours)
+        iterations = 1
+        for _ in range(self._calculation_setup.max_nb_of_iterations):
+            length, sized = self._size_based_on_temperature_profile(quadrant, hourly=True, hours=hours)
+            iterations += self.sizing_iterations
+            if length == 0:
+                self.sizing_iterations = iterations
+                return length, sized
+            # verification with the full temperature profile
+            self._calculate_temperature_profile(self.H, hourly=True, sizing=True, first_last_year=True)
+            iterations += 1
+            if self._critical_hour(quadrant) in hours:
+                self.sizing_iterations = iterations
+                return self._check_sizing(quadrant)
+            hours = np.union1d(hours, self._critical_hours(number_of_hours))
+        raise MaximumNumberOfIterations(self._calculation_setup.max_nb_of_iterations)
+
+    def _check_sizing(self, quadrant: int) -> (float, bool):
+        """
+        This function checks whether the current borehole length also satisfies the temperature constraint that is
+        not sized for.
+
+        Parameters
+        ----------
+        quadrant : int
+            Quadrant for which the borefield is sized
+
+        Returns
+        -------
+        Borehole length : float
+            Required borehole length of the borefield [m]
+        Sized : bool
+            True if the required borehole length also satisfies the other temperature constraint [m]
+        """
         # calculate the relevant parameters for the sizing check
         if self._calculation_setup.size_based_on == 'average':
             min_temperatures = self.results.peak_extraction
@@ -1673,6 +2017,101 @@ class Borefield(BaseClass):
         """
         self._calculate_temperature_profile(H=length, hourly=hourly, **kwargs)
 
+    def calculate_temperature_profiles(self, lengths: ArrayLike, hourly: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This function calculates the fluid temperatures in peak injection and peak extraction for multiple
+        borehole lengths at once. The g-values for all the borehole lengths are looked up in one batch and the
+        temporal superposition is done for all borehole lengths in one broadcasted (FFT) convolution. The fluid
+        temperatures are the same as the ones calculated with calculate_temperatures for every borehole length, and
+        are the average, inlet or outlet fluid temperatures depending on size_based_on in the calculation setup.
+
+        When the load or the fluid properties depend on the fluid temperature, the temperature profiles are
+        calculated for one borehole length at a time. The results and the borehole length of the borefield
+        are not changed.
+
+        Parameters
+        ----------
+        lengths : list, np.ndarray
+            Borehole lengths for which the temperature profiles should be calculated [m]
+        hourly : bool
+            True when the temperatures should be calculated based on hourly data
+
+        Returns
+        -------
+        peak injection, peak extraction : np.ndarray, np.ndarray
+            2D arrays with the fluid temperatures in peak injection and peak extraction [°C] for every borehole
+            length (rows) and every month or hour of the simulation period (columns)
+
+        Raises
+        ------
+        ValueError
+            When hourly is True and there is no hourly load, or when hourly is False and there is a variable hourly
+            flow rate with a borehole thermal resistance that is not constant
+        """
+        lengths = np.atleast_1d(np.asarray(lengths, dtype=np.float64))
+        H_backup, results_backup = self.H, self.results
+
+        if isinstance(self.load, _LoadDataBuilding) or \
+                isinstance(self.borehole.fluid_data, TemperatureDependentFluidData):
+            # the temperatures depend on each other, so no broadcasting is possible
+            suffix = '' if self._calculation_setup.size_based_on == 'average' else \
+                f'_{self._calculation_setup.size_based_on}'
+            peak_injection, peak_extraction = [], []
+            for length in lengths:
+                self._calculate_temperature_profile(length, hourly=hourly)
+                peak_injection.append(getattr(self.results, f'peak_injection{suffix}'))
+                peak_extraction.append(getattr(self.results, f'peak_extraction{suffix}'))
+            self.H, self.results = H_backup, results_backup
+            return np.array(peak_injection), np.array(peak_extraction)
+
+        if hourly and not self.load._hourly:
+            raise ValueError("There is no hourly resolution available!")
+        if not hourly and not self.borehole.use_constant_Rb and isinstance(
+                self.borehole.flow_data, (VariableHourlyFlowRate, VariableHourlyMultiyearFlowRate)):
+            raise ValueError('No monthly temperature profile can be calculated when an hourly flow rate is given.')
+
+        if hourly:
+            time_values = self.load.time_L4
+            powers = (self.load.hourly_net_resulting_injection_power,)
+        else:
+            # the peak durations are looked up in the same batch as the monthly time values
+            time_values, indices = np.unique(np.concatenate(([self.load.peak_injection_duration,
+                                                              self.load.peak_extraction_duration],
+                                                             self.load.time_L3)), return_inverse=True)
+            powers = (self.load.monthly_peak_injection_simulation_period,
+                      self.load.monthly_peak_extraction_simulation_period * (-1))
+        g_values = self.gfunction_batch(time_values, lengths)
+        # temporal superposition for all borehole lengths at once
+        load = powers[0] if hourly else self.load.monthly_average_injection_power_simulation_period
+        result_convolution = fftconvolve(load[np.newaxis] * 1000, np.diff(
+            g_values if hourly else g_values[:, indices[2:]], prepend=0, axis=1), axes=1)[:, :load.size]
+
+        # the temperatures are calculated in the same way as for a single borehole length
+        peak_injection, peak_extraction = np.zeros_like(result_convolution), np.zeros_like(result_convolution)
+        for i, length in enumerate(lengths):
+            self.H = length
+            Tb = self._calculate_borehole_wall_temperature(result_convolution[i], length)
+            if hourly:
+                # outside of sizing, there is only one fluid temperature for both peaks
+                peak_injection[i] = peak_extraction[i] = self._calculate_fluid_temperature(
+                    Tb, load, self._calculate_Rb(length, self.Tf_min, load), length)
+                continue
+            peak_injection[i] = self._calculate_peak_temperature(
+                Tb, powers[0], load, g_values[i, indices[0]], self._calculate_Rb(length, self.Tf_min, powers[0]),
+                length)
+            peak_extraction[i] = self._calculate_peak_temperature(
+                Tb, powers[1], load, g_values[i, indices[1]], self._calculate_Rb(length, self.Tf_min, powers[1]),
+                length)
+        self.H, self.results = H_backup, results_backup
+
+        if self._calculation_setup.size_based_on == 'average':
+            return peak_injection, peak_extraction
+        # inlet or outlet temperatures
+        index = 0 if self._calculation_setup.size_based_on == 'inlet' else 1
+        kwargs = {'simulation_period': self.load.simulation_period} if hourly else {}
+        return self.calculate_borefield_inlet_outlet_temperature(powers[0], peak_injection, **kwargs)[index], \
+            self.calculate_borefield_inlet_outlet_temperature(powers[-1], peak_extraction, **kwargs)[index]
+
     def print_temperature_profile(self, legend: bool = True, plot_hourly: bool = False, type: str = 'average',
                                   **kwargs) -> None:
         """
@@ -1751,6 +2190,8 @@ class Borefield(BaseClass):
         else:
             time_array = self.load.time_L3 / 12 / 730.0 / 3600.0
 
+        import matplotlib.pyplot as plt
+
         # plt.rc('figure')
         # create new figure and axes if it not already exits otherwise clear it.
         fig = plt.figure()
@@ -1828,6 +2269,105 @@ class Borefield(BaseClass):
         self.results = ResultsMonthly()
         self.load.reset_results(self.Tf_min, self.Tf_max)
 
+    def _calculate_Rb(self, H: float, temperature: Union[float, np.ndarray],
+                      power: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        This function calculates the effective borehole thermal resistance for a given borehole length.
+
+        Parameters
+        ----------
+        H : float
+            Borehole length [m]
+        temperature : float, np.ndarray
+            Average fluid temperature [°C]
+        power : float, np.ndarray
+            Power of the borefield (negative means extraction) [kW]
+
+        Returns
+        -------
+        Rb : float, np.ndarray
+            Effective borehole thermal resistance [mK/W]
+        """
+        depth = self.calculate_depth(H, self.D)
+        return self.borehole.get_Rb(H, self.D, self.r_b, self.ground_data.k_s(depth, self.D), depth,
+                                    temperature=temperature, nb_of_boreholes=self.number_of_boreholes,
+                                    use_explicit_models=self._calculation_setup.use_explicit_multipole,
+                                    simulation_period=self.load.simulation_period, power=power)
+
+    def _calculate_borehole_wall_temperature(self, result_convolution: np.ndarray, H: float) -> np.ndarray:
+        """
+        This function calculates the borehole wall temperature from the temporal superposition of the load.
+
+        Parameters
+        ----------
+        result_convolution : np.ndarray
+            Convolution of the load [W] with the g-value differences
+        H : float
+            Borehole length [m]
+
+        Returns
+        -------
+        Tb : np.ndarray
+            Borehole wall temperature [°C]
+        """
+        k_s = self.ground_data.k_s(self.calculate_depth(H, self.D), self.D)
+        return result_convolution / (2 * pi * k_s) / (H * self.number_of_boreholes) + self._Tg(H)
+
+    def _calculate_fluid_temperature(self, Tb: np.ndarray, power: Union[float, np.ndarray],
+                                     Rb: Union[float, np.ndarray], H: float) -> np.ndarray:
+        """
+        This function calculates the average fluid temperature as Tf = Tb + Q * Rb.
+
+        Parameters
+        ----------
+        Tb : np.ndarray
+            Borehole wall temperature [°C]
+        power : float, np.ndarray
+            Power of the borefield (negative means extraction) [kW]
+        Rb : float, np.ndarray
+            Effective borehole thermal resistance [mK/W]
+        H : float
+            Borehole length [m]
+
+        Returns
+        -------
+        Tf : np.ndarray
+            Average fluid temperature [°C]
+        """
+        return Tb + power * 1000 * (Rb / self.number_of_boreholes / H)
+
+    def _calculate_peak_temperature(self, Tb: np.ndarray, peak_power: np.ndarray, average_power: np.ndarray,
+                                    g_value_peak: float, Rb: Union[float, np.ndarray], H: float) -> np.ndarray:
+        """
+        This function calculates the average fluid temperature during the monthly peak, where the average load of the
+        month is replaced by the peak load for the duration of the peak.
+
+        Parameters
+        ----------
+        Tb : np.ndarray
+            Borehole wall temperature [°C]
+        peak_power : np.ndarray
+            Monthly peak power (negative means extraction) [kW]
+        average_power : np.ndarray
+            Monthly average power (negative means extraction) [kW]
+        g_value_peak : float
+            G-value at the duration of the peak
+        Rb : float, np.ndarray
+            Effective borehole thermal resistance [mK/W]
+        H : float
+            Borehole length [m]
+
+        Returns
+        -------
+        Tf : np.ndarray
+            Average fluid temperature during the peak [°C]
+        """
+        k_s = self.ground_data.k_s(self.calculate_depth(H, self.D), self.D)
+        temperature = Tb + (peak_power * (g_value_peak / k_s / 2 / pi + Rb)
+                            - average_power * g_value_peak / k_s / 2 / pi) * 1000 / self.number_of_boreholes / H
+        # without a peak, the temperature is the borehole wall temperature
+        return np.where(peak_power == 0, Tb, temperature)
+
     def _calculate_temperature_profile(self, H: float = None, hourly: bool = False, sizing: bool = False,
                                        Tmin: float = None, Tmax: float = None, **kwargs) -> None:
         """
@@ -1853,9 +2393,16 @@ class Borefield(BaseClass):
         Tmin = Tmin if Tmin is not None else self.Tf_min
         Tmax = Tmax if Tmax is not None else self.Tf_max
         g_values = kwargs.get('g_values')
+        # during sizing with the spectral convolution, the g-values are only calculated at the anchor lengths
+        spectral = hourly and sizing and self._calculation_setup.convolution_method == 'spectral'
+        # with load aggregation, the g-values are only needed at the aggregation times
+        aggregation = hourly and self._calculation_setup.convolution_method == 'load_aggregation'
         if hourly:
-            if g_values is None:
-                g_values = self.gfunction(self.load.time_L4, H)
+            if g_values is None and not spectral:
+                if aggregation:
+                    g_values = self.gfunction(self._load_aggregation.get_times(len(self.load.time_L4)), H)
+                else:
+                    g_values = self.gfunction(self.load.time_L4, H)
         else:
             # self.g-function is a function that uses the precalculated data to interpolate the correct values of the
             # g-function. This dataset is checked over and over again and is correct
@@ -1872,7 +2419,7 @@ class Borefield(BaseClass):
         # calculation of needed differences of the g-function values. These are the weight factors in the calculation
         # of Tb.
         g_value_differences = kwargs.get('g_value_differences')
-        if g_value_differences is None:
+        if g_value_differences is None and g_values is not None and not aggregation:
             g_value_differences = np.diff(g_values, prepend=0)
 
         # save temp
@@ -1889,6 +2436,22 @@ class Borefield(BaseClass):
                 isinstance(self.load.cop, SCOP) and isinstance(self.load.cop_dhw, SCOP) and isinstance(
             self.load.eer, SEER))
 
+        def get_g_value_differences() -> np.ndarray:
+            nonlocal g_values, g_value_differences
+            if g_value_differences is None:
+                g_values = self.gfunction(self.load.time_L4, H)
+                g_value_differences = np.diff(g_values, prepend=0)
+                self._temp_results['g_values'] = g_values
+                self._temp_results['g_value_differences'] = g_value_differences
+            return g_value_differences
+
+        def get_g_value_differences_anchor(length: float) -> np.ndarray:
+            # the gfunction method changes the borehole length of the borefield, so this is restored afterwards
+            H_backup = self.H
+            g_value_differences_anchor = np.diff(self.gfunction(self.load.time_L4, length), prepend=0)
+            self.H = H_backup
+            return g_value_differences_anchor
+
         index_mask = None
         if ((kwargs.get('first_last_year', False) and not self.load._multiyear) or kwargs.get(
                 'index_mask') is not None):
@@ -1911,49 +2474,18 @@ class Borefield(BaseClass):
         def calculate_temperatures(H, hourly=hourly, results_temperature=ResultsMonthly(), indices=None):
             # set Rb* value
             H_var = H if H is not None else self.H
-            depth = self.calculate_depth(H_var, self.D)
 
             results = None
 
             def get_rb(temperature, limit=None, power=None):
-                if self.USE_SPEED_UP_IN_SIZING and sizing and not variable_efficiency:
-                    # use only extreme temperatures when sizing
-                    if limit is not None:
-                        if len(temperature) == 0:
-                            return self.borehole.get_Rb(H_var, self.D, self.r_b, self.ground_data.k_s(depth, self.D),
-                                                        depth,
-                                                        temperature=Tmin, nb_of_boreholes=self.number_of_boreholes,
-                                                        use_explicit_models=self._calculation_setup.use_explicit_multipole,
-                                                        simulation_period=self.load.simulation_period,
-                                                        power=power)
-                        elif limit == (Tmax if Tmax is not None else self.Tf_max):
-                            return self.borehole.get_Rb(H_var, self.D, self.r_b, self.ground_data.k_s(depth, self.D),
-                                                        depth,
-                                                        temperature=max(temperature),
-                                                        nb_of_boreholes=self.number_of_boreholes,
-                                                        use_explicit_models=self._calculation_setup.use_explicit_multipole,
-                                                        simulation_period=self.load.simulation_period,
-                                                        power=power)
-                        else:
-                            return self.borehole.get_Rb(H_var, self.D, self.r_b, self.ground_data.k_s(depth, self.D),
-                                                        depth,
-                                                        temperature=min(temperature),
-                                                        nb_of_boreholes=self.number_of_boreholes,
-                                                        use_explicit_models=self._calculation_setup.use_explicit_multipole,
-                                                        simulation_period=self.load.simulation_period,
-                                                        power=power)
                 if len(temperature) == 0:
-                    return self.borehole.get_Rb(H_var, self.D, self.r_b, self.ground_data.k_s(depth, self.D), depth,
-                                                temperature=Tmin, nb_of_boreholes=self.number_of_boreholes,
-                                                use_explicit_models=self._calculation_setup.use_explicit_multipole,
-                                                simulation_period=self.load.simulation_period,
-                                                power=power)
-
-                return self.borehole.get_Rb(H_var, self.D, self.r_b, self.ground_data.k_s(depth, self.D), depth,
-                                            temperature=temperature, nb_of_boreholes=self.number_of_boreholes,
-                                            use_explicit_models=self._calculation_setup.use_explicit_multipole,
-                                            simulation_period=self.load.simulation_period,
-                                            power=power)
+                    return self._calculate_Rb(H_var, Tmin, power)
+                if self.USE_SPEED_UP_IN_SIZING and sizing and not variable_efficiency and limit is not None:
+                    # use only extreme temperatures when sizing
+                    if limit == (Tmax if Tmax is not None else self.Tf_max):
+                        return self._calculate_Rb(H_var, max(temperature), power)
+                    return self._calculate_Rb(H_var, min(temperature), power)
+                return self._calculate_Rb(H_var, temperature, power)
 
             if not hourly:
                 if not self.borehole.use_constant_Rb and isinstance(self.borehole.flow_data, (VariableHourlyFlowRate,
@@ -1966,51 +2498,39 @@ class Borefield(BaseClass):
                                               g_value_differences)[: 12 * self.simulation_period]
 
                 # calculation the borehole wall temperature for every month i
-                k_s = self.ground_data.k_s(self.calculate_depth(H_var, self.D), self.D)
-                Tb = (result_convolution + kwargs.get('offset_convolution', 0)) / (2 * pi * k_s) / (
-                        H_var * self.number_of_boreholes) + self._Tg(H_var)
+                Tb = self._calculate_borehole_wall_temperature(
+                    result_convolution + kwargs.get('offset_convolution', 0), H_var)
 
                 # now the Tf will be calculated based on
                 # Tf = Tb + Q * R_b
                 power = np.where(self.load.monthly_average_injection_power_simulation_period > 0,
                                  self.load.monthly_peak_injection_simulation_period,
                                  self.load.monthly_peak_extraction_simulation_period)
-                results_month_avg = Tb + self.load.monthly_average_injection_power_simulation_period * 1000 * (
-                        get_rb(results_temperature.baseload_temperature, Tmin,
-                               power=power) / self.number_of_boreholes / H_var)
+                results_month_avg = self._calculate_fluid_temperature(
+                    Tb, self.load.monthly_average_injection_power_simulation_period,
+                    get_rb(results_temperature.baseload_temperature, Tmin, power=power), H_var)
 
                 # extra summation if the g-function value for the peak is included
-                results_peak_injection = (
-                        Tb
-                        + (self.load.monthly_peak_injection_simulation_period
-                           * (g_value_peak_injection / k_s / 2 / pi + get_rb(results_temperature.peak_injection, Tmax,
-                                                                             self.load.monthly_peak_injection_simulation_period))
-                           - self.load.monthly_average_injection_power_simulation_period * g_value_peak_injection / k_s / 2 / pi)
-                        * 1000 / self.number_of_boreholes / H_var
-                )
-                results_peak_injection[self.load.monthly_peak_injection_simulation_period == 0] = Tb[
-                    self.load.monthly_peak_injection_simulation_period == 0]
-
-                results_peak_extraction = (
-                        Tb +
-                        (- self.load.monthly_peak_extraction_simulation_period
-                         * (g_value_peak_extraction / k_s / 2 / pi + get_rb(results_temperature.peak_extraction, Tmin,
-                                                                            self.load.monthly_peak_extraction_simulation_period * (
-                                                                                -1)))
-                         - self.load.monthly_average_injection_power_simulation_period * g_value_peak_extraction / k_s / 2 / pi)
-                        * 1000 / self.number_of_boreholes / H_var
-                )
-
-                results_peak_extraction[self.load.monthly_peak_extraction_simulation_period == 0] = Tb[
-                    self.load.monthly_peak_extraction_simulation_period == 0]
+                results_peak_injection = self._calculate_peak_temperature(
+                    Tb, self.load.monthly_peak_injection_simulation_period,
+                    self.load.monthly_average_injection_power_simulation_period, g_value_peak_injection,
+                    get_rb(results_temperature.peak_injection, Tmax,
+                           self.load.monthly_peak_injection_simulation_period), H_var)
+                results_peak_extraction = self._calculate_peak_temperature(
+                    Tb, self.load.monthly_peak_extraction_simulation_period * (-1),
+                    self.load.monthly_average_injection_power_simulation_period, g_value_peak_extraction,
+                    get_rb(results_temperature.peak_extraction, Tmin,
+                           self.load.monthly_peak_extraction_simulation_period * (-1)), H_var)
 
                 # these results will be depreciated in v2.5.0
-                results_month_injection = Tb + self.load.monthly_baseload_injection_power_simulation_period * 1000 * (
-                        get_rb(results_temperature.monthly_injection, Tmax,
-                               self.load.monthly_baseload_injection_power_simulation_period) / self.number_of_boreholes / H_var)
-                results_month_extraction = Tb - self.load.monthly_baseload_extraction_power_simulation_period * 1000 * (
-                        get_rb(results_temperature.monthly_extraction, Tmin,
-                               self.load.monthly_baseload_extraction_power_simulation_period) / self.number_of_boreholes / H_var)
+                results_month_injection = self._calculate_fluid_temperature(
+                    Tb, self.load.monthly_baseload_injection_power_simulation_period,
+                    get_rb(results_temperature.monthly_injection, Tmax,
+                           self.load.monthly_baseload_injection_power_simulation_period), H_var)
+                results_month_extraction = self._calculate_fluid_temperature(
+                    Tb, self.load.monthly_baseload_extraction_power_simulation_period * (-1),
+                    get_rb(results_temperature.monthly_extraction, Tmin,
+                           self.load.monthly_baseload_extraction_power_simulation_period), H_var)
 
                 # save temperatures under variable
                 results = ResultsMonthly(
@@ -2043,8 +2563,15 @@ class Borefield(BaseClass):
                     # convolution to get the hourly results
                     result_convolution = np.zeros_like(hourly_load, dtype=float)
 
-                    result_convolution[:max_idx + 1] = convolve(hourly_load[:max_idx + 1] * 1000, g_value_differences)[
-                        :max_idx + 1]
+                    if spectral:
+                        result_convolution[:max_idx + 1] = self._spectral_convolution.convolve(
+                            hourly_load * 1000, H_var, get_g_value_differences_anchor)[:max_idx + 1]
+                    elif aggregation:
+                        result_convolution[:max_idx + 1] = self._load_aggregation.convolve(
+                            hourly_load * 1000, g_values)[:max_idx + 1]
+                    else:
+                        result_convolution[:max_idx + 1] = convolve(hourly_load[:max_idx + 1] * 1000,
+                                                                    g_value_differences)[:max_idx + 1]
 
                     self._temp_results['result_convolution'] = result_convolution
                     self._temp_results['hourly_load_prev'] = hourly_load.copy()
@@ -2065,7 +2592,10 @@ class Borefield(BaseClass):
                             first_idx:max_idx + 1]) * 1000
                         if len(delta) == 0:  # pragma: no cover
                             pass
-                        update = convolve(delta, g_value_differences)
+                        if aggregation:
+                            update = self._load_aggregation.convolve(delta, g_values, len(hourly_load))
+                        else:
+                            update = convolve(delta, get_g_value_differences())
 
                         self._temp_results['result_convolution'][first_idx:max_idx + 1] += update[
                             :max_idx - first_idx + 1]
@@ -2073,9 +2603,8 @@ class Borefield(BaseClass):
                         self._temp_results['temperature_result'] = None
 
                 # calculation the borehole wall temperature for every month i
-                Tb = (self._temp_results['result_convolution'] + kwargs.get('offset_convolution', 0)) / (
-                        2 * pi * self.ground_data.k_s(self.calculate_depth(H_var, self.D), self.D)) / (
-                             H_var * self.number_of_boreholes) + self._Tg(H_var)
+                Tb = self._calculate_borehole_wall_temperature(
+                    self._temp_results['result_convolution'] + kwargs.get('offset_convolution', 0), H_var)
 
                 # now the Tf will be calculated based on
                 # Tf = Tb + Q * R_b
@@ -2089,23 +2618,21 @@ class Borefield(BaseClass):
                         # all indices are important up to the last one
                         # requires plus 1, since arange excludes the last value
                         idx = np.arange(0, np.max(idx) + 1)
-                    self._temp_results['temperature_result'][idx] = Tb[idx] + hourly_load[idx] * 1000 * (
-                            get_rb([] if len(results_temperature.peak_injection) == 0 else
-                                   results_temperature.peak_injection[idx], Tmax,
-                                   hourly_load[idx]) / self.number_of_boreholes / H_var)
+                    self._temp_results['temperature_result'][idx] = self._calculate_fluid_temperature(
+                        Tb[idx], hourly_load[idx],
+                        get_rb([] if len(results_temperature.peak_injection) == 0 else
+                               results_temperature.peak_injection[idx], Tmax, hourly_load[idx]), H_var)
                 else:
-                    self._temp_results['temperature_result'] = Tb + hourly_load * 1000 * (
-                            get_rb(results_temperature.peak_injection, Tmax,
-                                   hourly_load) / self.number_of_boreholes / H_var)
+                    self._temp_results['temperature_result'] = self._calculate_fluid_temperature(
+                        Tb, hourly_load, get_rb(results_temperature.peak_injection, Tmax, hourly_load), H_var)
 
                 # reset other variables
                 results = ResultsHourly(borehole_wall_temp=Tb,
                                         temperature_fluid=self._temp_results['temperature_result'].copy())
                 if sizing:
                     # do the same for extraction
-                    results._Tf_extraction = Tb + hourly_load * 1000 * (
-                            get_rb(results_temperature.peak_extraction, Tmin,
-                                   hourly_load) / self.number_of_boreholes / H_var)
+                    results._Tf_extraction = self._calculate_fluid_temperature(
+                        Tb, hourly_load, get_rb(results_temperature.peak_extraction, Tmin, hourly_load), H_var)
                 if not self.borehole.use_constant_Rb:
                     results._Tf_inlet, results._Tf_outlet = self.calculate_borefield_inlet_outlet_temperature(
                         hourly_load, results.peak_injection, simulation_period=self.load.simulation_period)
@@ -2184,6 +2711,7 @@ class Borefield(BaseClass):
         None
         """
         self.gfunction_calculation_object.set_options_gfunction_calculation(options)
+        self._spectral_convolution.reset()
 
     def gfunction(self, time_value: ArrayLike, H: float = None) -> np.ndarray:
         """
@@ -2224,6 +2752,8 @@ class Borefield(BaseClass):
             if not H is None:
                 # only update if H is provided, otherwise the borehole length of the borefield itself will be used
                 self.H = H
+            self.gfunction_calculation_object.set_disk_cache(self._calculation_setup.gfunction_cache_directory,
+                                                             self._calculation_setup.gfunction_cache_size)
             return self.gfunction_calculation_object.calculate(
                 time_value, self.borefield, self.ground_data.alpha(self.depth, self.D),
                 interpolate=self._calculation_setup.interpolate_gfunctions,
@@ -2243,11 +2773,82 @@ class Borefield(BaseClass):
             if self.custom_gfunction.within_range(time_value, H_var):
                 return self.custom_gfunction.calculate_gfunction(time_value, H_var)
 
+        # check if there is a matching dataset in the g-function library
+        library = self._get_gfunction_library()
+        if library is not None:
+            dataset = library.find(self.borefield, self.ground_data.alpha, self.gfunction_calculation_object.options,
+                                   time_value, H_var)
+            if dataset is not None:
+                return dataset.calculate_gfunction(time_value, H_var)
+
         ## 3 calculate g-function jit
         return jit_gfunction_calculation()
 
+    def gfunction_batch(self, time_value: ArrayLike, lengths: ArrayLike) -> np.ndarray:
+        """
+        This function returns the gfunction values for multiple borehole lengths at once.
+        When a custom dataset (or a dataset of the g-function library) covers all the borehole lengths, the g-values
+        are interpolated for all borehole lengths in one lookup. Otherwise, the g-functions are calculated for one
+        borehole length at a time.
+
+        Parameters
+        ----------
+        time_value : list, float, np.ndarray
+            Time value(s) in seconds at which the gfunctions should be calculated
+        lengths : list, np.ndarray
+            Borehole lengths [m] at which the gfunctions should be calculated
+
+        Returns
+        -------
+        gvalues : np.ndarray
+            2D array with the g-values for every borehole length (rows) and time value (columns)
+        """
+        lengths = np.atleast_1d(np.asarray(lengths, dtype=np.float64))
+        # when using a variable ground temperature, sometimes no solution can be found
+        if not isinstance(self.ground_data, GroundConstantTemperature) and \
+                np.max(lengths) > Borefield.THRESHOLD_DEPTH_ERROR:
+            raise UnsolvableDueToTemperatureGradient
+
+        if self._calculation_setup.use_precalculated_dataset:
+            if self.custom_gfunction is not None and self.custom_gfunction.within_range(time_value, np.min(lengths)) \
+                    and self.custom_gfunction.within_range(time_value, np.max(lengths)):
+                return self.custom_gfunction.calculate_gfunctions(time_value, lengths)
+            library = self._get_gfunction_library()
+            if library is not None:
+                dataset = library.find(self.borefield, self.ground_data.alpha,
+                                       self.gfunction_calculation_object.options, time_value, lengths)
+                if dataset is not None:
+                    return dataset.calculate_gfunctions(time_value, lengths)
+
+        # the gfunction method changes the borehole length of the borefield, so this is restored afterwards
+        H_backup = self.H
+        gvalues = np.array([self.gfunction(time_value, length) for length in lengths])
+        self.H = H_backup
+        return gvalues
+
+    def _get_gfunction_library(self) -> GFunctionLibrary:
+        """
+        This function returns the g-function library of the calculation setup.
+        The library is only recreated when the directory or the tolerance changes.
+
+        Returns
+        -------
+        GFunctionLibrary
+            Library with the precalculated datasets, or None if no library directory is set
+        """
+        directory = self._calculation_setup.gfunction_library_directory
+        if directory is None:
+            self._gfunction_library = None
+            return None
+        tolerance = self._calculation_setup.gfunction_library_tolerance
+        if self._gfunction_library is None or self._gfunction_library.directory != os.fspath(directory) or \
+                self._gfunction_library.alpha_rtol != tolerance:
+            self._gfunction_library = GFunctionLibrary(directory, tolerance)
+        return self._gfunction_library
+
     def create_custom_dataset(self, time_array: ArrayLike = None, borehole_length_array: ArrayLike = None,
-                              options: dict = {}) -> None:
+                              options: dict = {}, n_workers: int = 1, chunksize: int = 1,
+                              progress: Callable[[int, int, float], None] = None, rtol: float = None) -> None:
         """
         This function makes a datafile for a given custom borefield and sets it for the borefield object.
         It automatically sets this datafile in the current borefield object, so it can be used as a source for
@@ -2261,6 +2862,17 @@ class Borefield(BaseClass):
             List or arrays of borehole lengths for which the datafile should be created
         options : dict
             Options for the g-function calculation (check pygfunction.gfunction.gFunction() for more information)
+        n_workers : int
+            Number of processes that calculate the g-values for the different borehole lengths in parallel
+        chunksize : int
+            Number of borehole lengths that are sent to a worker at once
+        progress : callable
+            Function that is called after every calculated borehole length with the number of calculated lengths,
+            the total number of lengths and the borehole length [m] that is finished.
+        rtol : float
+            If given, the borehole length grid is refined adaptively between the minimum and maximum borehole length
+            until the estimated interpolation error w.r.t. the largest g-value is below this tolerance
+            (see CustomGFunction.create_adaptive_custom_dataset).
 
         Returns
         -------
@@ -2280,7 +2892,14 @@ class Borefield(BaseClass):
             raise ValueError("No ground data is set for which the gfunctions should be calculated")
 
         self.custom_gfunction = CustomGFunction(time_array, borehole_length_array, options)
-        self.custom_gfunction.create_custom_dataset(self.borefield, self.ground_data.alpha)
+        if rtol is None:
+            self.custom_gfunction.create_custom_dataset(self.borefield, self.ground_data.alpha, n_workers, chunksize,
+                                                        progress)
+        else:
+            self.custom_gfunction.create_adaptive_custom_dataset(self.borefield, self.ground_data.alpha, rtol,
+                                                                 n_workers=n_workers, chunksize=chunksize,
+                                                                 progress=progress)
+        self._spectral_convolution.reset()
 
     @property
     def Re(self) -> float:
@@ -2,16 +2,18 @@
 This file contains the code for the optimisation function of the borefield configuration.
 """
 import copy
+import os
+import tempfile
+
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 
 from GHEtool import Borefield
 from GHEtool.VariableClasses.BaseClass import UnsolvableOptimalFieldError
 from GHEtool.VariableClasses.FlowData import *
+from GHEtool.VariableClasses.LoadData import _LoadDataBuilding
 import pygfunction as gt
-import optuna
-
-optuna.logging.disable_default_handler()
 
 
 def _find_borefield(borefield, n_1, n_2, b_1, b_2, shape, **kwargs) -> gt.borefield.Borefield:
@@ -59,85 +61,223 @@ def _check_identical_field(new_params: dict, seen_params: set) -> bool:
     return True
 
 
-def optimise_borefield_configuration(
-        borefield: Borefield,
-        l_1_max: float,
-        l_2_max: float,
-        b_min: float,
-        b_max: float,
-        b_step: float,
-        h_min: float,
-        h_max: float,
-        nb_min: int = 1,
-        nb_max: int = 999,
-        nb_of_trials: int = 100,
-        types: list = [0, 1, 2, 3, 4],
-        size_L3: bool = True,
-        optimise: str = 'length',
-        dense: bool = False,
-        **kwargs) -> list:
+class _LengthSurrogate:
+    """
+    Gaussian process model of the logarithm of the borehole length as a function of the borefield configuration.
+    It is fitted on the trials of a study that are sized, so it can predict the borehole length of new
+    configurations without sizing them.
     """
-    This function calculates the optimal borefield configuration within a certain area.
-    This is done using the hyperparameter optimization framework optuna.
 
-    Parameters
-    ----------
-    borefield
-    l_1_max : float
-        Maximum size in the length direction [m]
-    l_2_max : float
-        Maximum size in the width direction [m]
-    b_min : float
-        Minimum borehole spacing [m]
-    b_max : float
-        Maximum borehole spacing [m]
-    b_step : float
-        Step size borehole spacing [m]
-    h_min : float
-        Minimum borehole depth [m]
-    h_max : float
-        Maximum borehole depth [m]
-    nb_min : int
-        Minimum number of boreholes [-]
-    nb_max : int
-        Maximum number of boreholes [-]
-    nb_of_trials : int
-        Number of trials [-]
-    types : list
-        List with the shapes of the borefields that should be investigated, where type 0: L, type 1: U,
-                type 2: box, type 3: rectangle, type 4: staggered
-    size_L3 : bool
-        True if L3 sizing should be used.
-    optimise : str
-        'Length' if the borefield should be optimised for the minimum borehole length, 'number' when the
-        minimum number of boreholes should be selected.
-    dense : bool
-        True if the staggered configuration is dense.
+    LENGTH_SCALES = (0.1, 0.2, 0.4, 0.8, 1.6)
+    NOISE = 1e-4
 
-    Returns
-    -------
-    List
-        List with found solutions, from optimal to less optimal. Each element in the list is a tuple which consists of
-        the total borehole length, borefield configuration, number of boreholes and pygfunction borefield object.
+    def __init__(self, types: list, l_1_max: float, l_2_max: float, b_min: float, b_max: float, warmup: int = 20):
+        """
 
-    Raises
-    ------
-    UnsolvableOptimalFieldError
-        When it is infeasible to find an optimal borefield size given the parameters
+        Parameters
+        ----------
+        types : list
+            List with the shapes of the borefields that are investigated
+        l_1_max : float
+            Maximum size in the length direction [m]
+        l_2_max : float
+            Maximum size in the width direction [m]
+        b_min : float
+            Minimum borehole spacing [m]
+        b_max : float
+            Maximum borehole spacing [m]
+        warmup : int
+            Minimum number of sized trials before the model is used [-]
+        """
+        self.types = list(types)
+        self.b_min = b_min
+        self.b_range = max(b_max - b_min, 1e-12)
+        self.n_1_max = int(l_1_max / b_min) + 1
+        self.n_2_max = int(l_2_max / b_min) + 1
+        self.warmup = warmup
+        self._nb_of_points = 0
+        self._x = None
+        self._cholesky = None
+        self._alpha = None
+        self._y_mean = 0.
+        self._y_std = 1.
+        self._length_scale = 1.
+
+    def features(self, n_1: int, n_2: int, b_1: float, b_2: float, shape: int) -> np.ndarray:
+        """
+        This function returns the scaled features of a borefield configuration.
+
+        Parameters
+        ----------
+        n_1 : int
+            Number of boreholes in the length direction [-]
+        n_2 : int
+            Number of boreholes in the width direction [-]
+        b_1 : float
+            Borehole spacing in the length direction [-]
+        b_2 : float
+            Borehole spacing in the width direction [-]
+        shape : int
+            Shape of the borefield
+
+        Returns
+        -------
+        np.ndarray
+            Features
+        """
+        shapes = [float(shape == i) for i in self.types] if len(self.types) > 1 else []
+        return np.array([(b_1 - self.b_min) / self.b_range, (b_2 - self.b_min) / self.b_range,
+                         np.log(n_1) / np.log(self.n_1_max + 1), np.log(n_2) / np.log(self.n_2_max + 1),
+                         np.log(n_1 * n_2) / np.log(self.n_1_max * self.n_2_max + 1)] + shapes)
+
+    def _kernel(self, x_1: np.ndarray, x_2: np.ndarray, length_scale: float) -> np.ndarray:
+        distance = np.sum((x_1[:, None, :] - x_2[None, :, :]) ** 2, axis=-1)
+        return np.exp(-0.5 * distance / length_scale ** 2)
+
+    def update(self, study) -> bool:
+        """
+        This function refits the model on the sized trials of the study, when new trials are available.
+
+        Parameters
+        ----------
+        study : optuna.Study
+            Study with the trials
+
+        Returns
+        -------
+        bool
+            True if the model can be used
+        """
+        from scipy.linalg import cho_factor, cho_solve
+        from optuna.trial import TrialState
+
+        data = [(trial.params, trial.user_attrs['borehole_length'])
+                for trial in study.get_trials(deepcopy=False, states=(TrialState.COMPLETE,))
+                if trial.user_attrs.get('borehole_length', 0) > 0]
+        if len(data) < self.warmup:
+            return False
+        if len(data) == self._nb_of_points:
+            return True
+
+        x = np.array([self.features(params['n_1'], params['n_2'], params['b_1'], params.get('b_2', params['b_1']),
+                                    params['shape']) for params, _ in data])
+        y = np.log([length for _, length in data])
+        self._y_mean, self._y_std = np.mean(y), max(np.std(y), 1e-12)
+        y = (y - self._y_mean) / self._y_std
+
+        # select the length scale with the highest marginal likelihood
+        best = -np.inf
+        for length_scale in self.LENGTH_SCALES:
+            cholesky = cho_factor(self._kernel(x, x, length_scale) + self.NOISE * np.eye(len(x)), lower=True)
+            alpha = cho_solve(cholesky, y)
+            likelihood = -0.5 * y @ alpha - np.sum(np.log(np.diag(cholesky[0])))
+            if likelihood > best:
+                best = likelihood
+                self._cholesky, self._alpha, self._length_scale = cholesky, alpha, length_scale
+        self._x = x
+        self._nb_of_points = len(data)
+        return True
+
+    def predict(self, n_1: int, n_2: int, b_1: float, b_2: float, shape: int, confidence: float) -> tuple:
+        """
+        This function predicts the borehole length of a borefield configuration.
+
+        Parameters
+        ----------
+        n_1 : int
+            Number of boreholes in the length direction [-]
+        n_2 : int
+            Number of boreholes in the width direction [-]
+        b_1 : float
+            Borehole spacing in the length direction [-]
+        b_2 : float
+            Borehole spacing in the width direction [-]
+        shape : int
+            Shape of the borefield
+        confidence : float
+            Number of standard deviations for the lower bound [-]
+
+        Returns
+        -------
+        tuple
+            Predicted borehole length [m], lower bound on the borehole length [m]
+        """
+        from scipy.linalg import cho_solve
+
+        x = self.features(n_1, n_2, b_1, b_2, shape)[None, :]
+        k = self._kernel(x, self._x, self._length_scale)
+        mean = (k @ self._alpha)[0]
+        variance = max(1 + self.NOISE - (k @ cho_solve(self._cholesky, k.T))[0, 0], 0)
+        mean, std = self._y_mean + self._y_std * mean, self._y_std * np.sqrt(variance)
+        return float(np.exp(mean)), float(np.exp(mean - confidence * std))
+
+
+def _create_objective(borefield: Borefield, l_1_max: float, l_2_max: float, b_min: float, b_max: float,
+                      b_step: float, h_min: float, h_max: float, nb_min: int, nb_max: int, types: list,
+                      size_L3: bool, optimise: str, dense: bool, max_value: float, pruning: bool = False,
+                      pruning_margin: float = 0.1, surrogate: bool = False, surrogate_warmup: int = 20,
+                      surrogate_confidence: float = 2.) -> callable:
     """
+    This function creates the objective function for optuna. Every objective function works on its own copy of the
+    borefield, so it has its own g-function cache.
+    The parameters are the same as for optimise_borefield_configuration, with max_value the theoretical maximum
+    value of the total borehole length.
 
-    if 'flow_field' in kwargs:
-        raise AttributeError(
-            'flow_field is no longer an option to this function. Please define your borefield with a flow rate '
-            'per borefield to achieve the same result.')
+    When pruning is True, the trials are evaluated in stages. A trial is pruned (and its 'pruned_at' attribute is
+    set to the stage) when an estimate of the lower bound on its objective cannot beat the best trial so far:
 
-    # set a theoretical maximum value of the total borehole length
-    max_value = int(l_1_max / b_min) * int(l_2_max / b_min) * h_max
+    * 'configuration': a bound based on the number of boreholes and the minimum borehole length only;
+    * 'L2': an estimate based on the (fast) L2 sizing, reduced with the heuristic pruning margin. Configurations of
+      which this estimate exceeds the maximum borehole length are pruned as well. This is not a strict bound, since
+      the L3/L4 borehole length can be smaller than the reduced L2 borehole length, so a too small margin can prune
+      the optimal configuration.
+
+    Only the remaining trials are sized with the L3 or L4 method.
+
+    When surrogate is True, a Gaussian process model of the borehole length is fitted on the sized trials. Once
+    there are surrogate_warmup of them, a trial is pruned at the stage 'surrogate' when the lower confidence bound
+    of its predicted borehole length (surrogate_confidence standard deviations below the prediction) exceeds the
+    maximum borehole length or cannot beat the best trial so far. The prediction of the remaining trials is stored
+    in their 'predicted_length' attribute.
+
+    Returns
+    -------
+    callable
+        Objective function for optuna
+    """
+    import optuna
 
     # copy borefield
     borefield_temp = copy.deepcopy(borefield)
+    length_model = _LengthSurrogate(types, l_1_max, l_2_max, b_min, b_max, surrogate_warmup) if surrogate else None
+
+    def best_value(trial: optuna.Trial) -> float:
+        """
+        This function returns the objective value of the best trial so far, or infinity if there is none.
+        """
+        try:
+            return trial.study.best_value
+        except ValueError:
+            return np.inf
+
+    def prune(trial: optuna.Trial, stage: str) -> None:
+        trial.set_user_attr('pruned_at', stage)
+        raise optuna.TrialPruned()
 
-    def f(n_1: int, n_2: int, b_1: float, b_2: float, h_min: float, h_max: float, shape: int) -> tuple:
+    def estimate_length() -> float:
+        """
+        This function returns the borehole length according to the L2 sizing, or None if this is not possible.
+        """
+        if isinstance(borefield_temp.load, _LoadDataBuilding):
+            # the L2 method falls back to the (expensive) L3 method for building loads
+            return None
+        try:
+            return borefield_temp.size_L2()
+        except:
+            return None
+
+    def f(n_1: int, n_2: int, b_1: float, b_2: float, h_min: float, h_max: float, shape: int,
+          trial: optuna.Trial = None) -> tuple:
         """
         This function calculates the required borehole depth for a certain set of input parameters.
 
@@ -157,11 +297,18 @@ def optimise_borefield_configuration(
             Maximum borehole depth [m]
         shape : int
             Shape of the borefield, where type 0: L, type 1: U, type 2: box, type 3: rectangle, type 4: staggered
+        trial : optuna.Trial
+            Trial that is evaluated (only needed for the pruning and the surrogate model)
 
         Returns
         -------
         tuple
             Total borehole length [m], number of boreholes [-]
+
+        Raises
+        ------
+        optuna.TrialPruned
+            When the trial cannot beat the best trial so far
         """
         borefield_temp.borefield = _find_borefield(borefield, n_1, n_2, b_1, b_2, shape)
         # set description
@@ -170,14 +317,36 @@ def optimise_borefield_configuration(
         try:
             if borefield_temp.number_of_boreholes < nb_min or borefield_temp.number_of_boreholes > nb_max:
                 return max_value * 2, max_value * 2
+            H_init = None
+            number = borefield_temp.number_of_boreholes
+            if pruning and trial is not None:
+                if (optimise == 'length' and (h_min - borefield_temp.D) * number >= best_value(trial)) or \
+                        (optimise != 'length' and number > best_value(trial)):
+                    prune(trial, 'configuration')
+            if length_model is not None and trial is not None and h_min != h_max and length_model.update(trial.study):
+                predicted, lower_bound = length_model.predict(n_1, n_2, b_1, b_2, shape, surrogate_confidence)
+                if lower_bound + borefield_temp.D > h_max or (optimise == 'length' and max(
+                        lower_bound, h_min - borefield_temp.D) * number >= best_value(trial)):
+                    prune(trial, 'surrogate')
+                trial.set_user_attr('predicted_length', predicted)
+            if pruning and trial is not None:
+                if h_min != h_max and optimise == 'length':
+                    H_init = estimate_length()
+                    if H_init is not None:
+                        lower_bound = (1 - pruning_margin) * H_init
+                        if lower_bound + borefield_temp.D > h_max or \
+                                max(lower_bound, h_min - borefield_temp.D) * number >= best_value(trial):
+                            prune(trial, 'L2')
             if h_min == h_max:
                 # only the number of boreholes can vary, no need for the simulation
                 length = 0
             else:
                 if size_L3:
-                    length = borefield_temp.size_L3(optimise=True)
+                    length = borefield_temp.size_L3(H_init, optimise=True)
                 else:
-                    length = borefield_temp.size_L4(optimise=True)
+                    length = borefield_temp.size_L4(H_init, optimise=True)
+                if trial is not None:
+                    trial.set_user_attr('borehole_length', float(length))
             if h_min <= length + borefield_temp.D <= h_max:
                 return length * borefield_temp.number_of_boreholes, borefield_temp.number_of_boreholes
             elif length + borefield_temp.D <= h_min:
@@ -187,10 +356,12 @@ def optimise_borefield_configuration(
                     return (h_min - borefield_temp.D) * borefield_temp.number_of_boreholes, \
                         borefield_temp.number_of_boreholes
             return max_value * 2, max_value * 2
+        except optuna.TrialPruned:
+            raise
         except:
             return max_value * 2, max_value * 2
 
-    def objective(trial: optuna.Trial):
+    def objective(trial):
         # Suggest shape first because b_2 depends on it
         shape = trial.suggest_categorical('shape', types)
 
@@ -209,23 +380,232 @@ def optimise_borefield_configuration(
         n_2 = trial.suggest_int('n_2', 1, max_n_2)
 
         # Evaluate
-        total_length, number = f(n_1, n_2, b_1, b_2, h_min, h_max, shape)
+        total_length, number = f(n_1, n_2, b_1, b_2, h_min, h_max, shape, trial)
 
-        trial.set_user_attr("n_boreholes", number)
-        trial.set_user_attr("total_length", total_length)
+        # the attributes should be JSON serialisable for the storage of the workers
+        trial.set_user_attr("n_boreholes", int(number))
+        trial.set_user_attr("total_length", float(total_length))
 
         return total_length if optimise == 'length' else number
 
-    study = optuna.create_study()
-    study.optimize(objective, n_trials=nb_of_trials)
+    return objective
+
+
+def _journal_storage(path: str):
+    """
+    This function returns an optuna storage that is stored in a local journal file, so multiple processes can work
+    on the same study.
+
+    Parameters
+    ----------
+    path : str
+        Path to the journal file
+
+    Returns
+    -------
+    optuna.storages.JournalStorage
+        Optuna storage
+    """
+    import optuna
+    try:
+        from optuna.storages.journal import JournalFileBackend, JournalFileOpenLock
+    except ImportError:  # pragma: no cover
+        # optuna < 4.0
+        from optuna.storages import JournalFileStorage as JournalFileBackend, JournalFileOpenLock
+    return optuna.storages.JournalStorage(JournalFileBackend(path, lock_obj=JournalFileOpenLock(path)))
+
+
+def _optimise_worker(storage_path: str, study_name: str, nb_of_trials: int, seed: int, objective_args: dict) -> None:
+    """
+    This function runs a number of trials of a study in a local storage. It is executed in a worker process.
+
+    Parameters
+    ----------
+    storage_path : str
+        Path to the journal file of the study
+    study_name : str
+        Name of the study
+    nb_of_trials : int
+        Number of trials for this worker [-]
+    seed : int
+        Seed for the sampler of this worker
+    objective_args : dict
+        Arguments for _create_objective
+
+    Returns
+    -------
+    None
+    """
+    import optuna
+    optuna.logging.disable_default_handler()
+    study = optuna.load_study(study_name=study_name, storage=_journal_storage(storage_path),
+                              sampler=optuna.samplers.TPESampler(seed=seed))
+    study.optimize(_create_objective(**objective_args), n_trials=nb_of_trials)
+
+
+def optimise_borefield_configuration(
+        borefield: Borefield,
+        l_1_max: float,
+        l_2_max: float,
+        b_min: float,
+        b_max: float,
+        b_step: float,
+        h_min: float,
+        h_max: float,
+        nb_min: int = 1,
+        nb_max: int = 999,
+        nb_of_trials: int = 100,
+        types: list = [0, 1, 2, 3, 4],
+        size_L3: bool = True,
+        optimise: str = 'length',
+        dense: bool = False,
+        n_workers: int = 1,
+        pruning: bool = False,
+        pruning_margin: float = 0.1,
+        surrogate: bool = False,
+        surrogate_warmup: int = 20,
+        surrogate_confidence: float = 2.,
+        statistics: dict = None,
+        seed: int = None,
+        **kwargs) -> list:
+    """
+    This function calculates the optimal borefield configuration within a certain area.
+    This is done using the hyperparameter optimization framework optuna.
+
+    Parameters
+    ----------
+    borefield
+    l_1_max : float
+        Maximum size in the length direction [m]
+    l_2_max : float
+        Maximum size in the width direction [m]
+    b_min : float
+        Minimum borehole spacing [m]
+    b_max : float
+        Maximum borehole spacing [m]
+    b_step : float
+        Step size borehole spacing [m]
+    h_min : float
+        Minimum borehole depth [m]
+    h_max : float
+        Maximum borehole depth [m]
+    nb_min : int
+        Minimum number of boreholes [-]
+    nb_max : int
+        Maximum number of boreholes [-]
+    nb_of_trials : int
+        Number of trials [-]
+    types : list
+        List with the shapes of the borefields that should be investigated, where type 0: L, type 1: U,
+                type 2: box, type 3: rectangle, type 4: staggered
+    size_L3 : bool
+        True if L3 sizing should be used.
+    optimise : str
+        'Length' if the borefield should be optimised for the minimum borehole length, 'number' when the
+        minimum number of boreholes should be selected.
+    dense : bool
+        True if the staggered configuration is dense.
+    n_workers : int
+        Number of worker processes in which the trials are run. When this is larger than 1, the workers share the
+        study through a temporary journal file and every worker uses its own copy of the borefield.
+    pruning : bool
+        True if trials that cannot beat the best trial so far should be pruned before the L3/L4 sizing, based on a
+        bound on the number of boreholes and the minimum borehole length, and on the (fast) L2 sizing.
+    pruning_margin : float
+        Heuristic relative margin on the L2 borehole length to estimate a lower bound on the L3/L4 borehole length.
+        This is not a strict bound, so the optimal configuration can be pruned when the margin is too small [-]
+    surrogate : bool
+        True if a Gaussian process model of the borehole length, fitted on the sized trials, should be used to
+        prune trials of which the predicted borehole length is too far from the optimum, before the L3/L4 sizing.
+    surrogate_warmup : int
+        Number of sized trials before the surrogate model is used [-]
+    surrogate_confidence : float
+        Number of standard deviations below the predicted borehole length that is used as a lower bound [-]
+    statistics : dict
+        Dictionary that, when given, is filled with the number of trials ('trials'), the number of trials that are
+        pruned at every stage ('pruned', with the keys 'configuration', 'surrogate' and 'L2'), the number of trials
+        that are completely evaluated ('completed') and the mean relative error of the surrogate model on the
+        trials that were sized after its prediction ('surrogate_error', None if there are none).
+    seed : int
+        Seed for the sampler of optuna, so the same trials are suggested in every run. When there are multiple
+        workers, every worker uses this seed plus its index. None for a random seed (with a single worker).
+
+    Returns
+    -------
+    List
+        List with found solutions, from optimal to less optimal. Each element in the list is a tuple which consists of
+        the total borehole length, borefield configuration, number of boreholes and pygfunction borefield object.
+
+    Raises
+    ------
+    UnsolvableOptimalFieldError
+        When it is infeasible to find an optimal borefield size given the parameters
+    ValueError
+        When the number of workers is smaller than 1
+    """
+
+    if 'flow_field' in kwargs:
+        raise AttributeError(
+            'flow_field is no longer an option to this function. Please define your borefield with a flow rate '
+            'per borefield to achieve the same result.')
+
+    if n_workers < 1:
+        raise ValueError(f'The number of workers should be at least 1, not {n_workers}.')
+
+    # set a theoretical maximum value of the total borehole length
+    max_value = int(l_1_max / b_min) * int(l_2_max / b_min) * h_max
+
+    objective_args = {'borefield': borefield, 'l_1_max': l_1_max, 'l_2_max': l_2_max, 'b_min': b_min, 'b_max': b_max,
+                      'b_step': b_step, 'h_min': h_min, 'h_max': h_max, 'nb_min': nb_min, 'nb_max': nb_max,
+                      'types': types, 'size_L3': size_L3, 'optimise': optimise, 'dense': dense,
+                      'max_value': max_value, 'pruning': pruning, 'pruning_margin': pruning_margin,
+                      'surrogate': surrogate, 'surrogate_warmup': surrogate_warmup,
+                      'surrogate_confidence': surrogate_confidence}
+
+    # optuna is only imported when it is needed, since it is slow to import
+    import optuna
+    optuna.logging.disable_default_handler()
+
+    if n_workers == 1:
+        study = optuna.create_study(sampler=optuna.samplers.TPESampler(seed=seed))
+        study.optimize(_create_objective(**objective_args), n_trials=nb_of_trials)
+        trials = study.trials
+    else:
+        # the workers coordinate their trials through a study in a local journal file
+        with tempfile.TemporaryDirectory() as directory:
+            storage_path = os.path.join(directory, 'study.log')
+            study = optuna.create_study(study_name='borefield_configuration', storage=_journal_storage(storage_path))
+            trials_per_worker = [nb_of_trials // n_workers + (i < nb_of_trials % n_workers) for i in range(n_workers)]
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                futures = [executor.submit(_optimise_worker, storage_path, study.study_name, trials,
+                                           i if seed is None else seed + i, objective_args)
+                           for i, trials in enumerate(trials_per_worker) if trials > 0]
+                for future in futures:
+                    future.result()
+            trials = optuna.load_study(study_name=study.study_name, storage=_journal_storage(storage_path)).trials
+
     results = []
 
     seen_params = set()
     seen_values = set()
 
-    for trial in study.trials:
-        if trial.values is None:
-            continue  # pragma: no cover
+    if statistics is not None:
+        pruned_at = [trial.user_attrs.get('pruned_at') for trial in trials if trial.state.name == 'PRUNED']
+        errors = [abs(trial.user_attrs['predicted_length'] / trial.user_attrs['borehole_length'] - 1)
+                  for trial in trials if trial.user_attrs.get('predicted_length') is not None and
+                  trial.user_attrs.get('borehole_length', 0) > 0]
+        statistics.update({'trials': len(trials),
+                           'pruned': {stage: pruned_at.count(stage) for stage in ('configuration', 'surrogate', 'L2')},
+                           'completed': sum(trial.state.name == 'COMPLETE' for trial in trials),
+                           'surrogate_error': float(np.mean(errors)) if errors else None})
+
+    # the trials are handled in a fixed order, so the results only depend on the evaluated configurations and not
+    # on the order in which the workers finished them
+    trials = sorted((trial for trial in trials if trial.values is not None),
+                    key=lambda trial: (trial.user_attrs.get('total_length'), trial.user_attrs.get('n_boreholes'),
+                                       tuple(sorted(trial.params.items()))))
+
+    for trial in trials:
 
         params = trial.params
         total_length = trial.user_attrs.get('total_length')
@@ -246,10 +626,10 @@ def optimise_borefield_configuration(
             results.append((total_length, params, n_boreholes if n_boreholes is not None else n_boreholes))
 
     if optimise == 'length':
-        # x = (objective_value, params, total_length, n_boreholes)
-        results.sort(key=lambda x: (x[0], x[2]))
+        # x = (total_length, params, n_boreholes)
+        results.sort(key=lambda x: (x[0], x[2], tuple(sorted(x[1].items()))))
     else:
-        results.sort(key=lambda x: (x[2], x[0]))
+        results.sort(key=lambda x: (x[2], x[0], tuple(sorted(x[1].items()))))
 
     def find_borefield(params: dict, total_borehole_length: float) -> gt.borefield.Borefield:
         """
@@ -309,6 +689,122 @@ def optimise_borefield_configuration(
     return [(i[0], i[1], i[2], find_borefield(i[1], i[0])) for i in results]
 
 
+def _brute_force_block(borefield: Borefield, shape: int, b_1: float, b_2_values: np.ndarray, l_1_max: float,
+                       l_2_max: float, h_min: float, h_max: float, size_L3: bool, optimise: str,
+                       best_value: float = np.inf) -> tuple:
+    """
+    This function searches the optimal configuration for a certain shape and spacing b_1 over all the spacings b_2
+    and numbers of boreholes n_1 and n_2.
+
+    It is assumed that the required length per borehole does not increase with the number of boreholes n_2 and the
+    spacing b_2. The first n_2 for which the borehole length is below the maximum borehole length is therefore
+    found with a binary search, of which the upper limit is the result for the previous (smaller) spacing b_2.
+    From there on, n_2 is increased until the borehole length drops below the minimum borehole length or until
+    the lower bound on the objective (the number of boreholes, or this number times the minimum borehole length)
+    cannot beat the best value anymore.
+
+    Parameters
+    ----------
+    borefield : Borefield
+        Borefield object
+    shape : int
+        Shape of the borefield, where type 0: L, type 1: U, type 2: box, type 3: rectangle, type 4: staggered
+    b_1 : float
+        Borehole spacing in the length direction [m]
+    b_2_values : np.ndarray
+        Borehole spacings in the width direction [m], in ascending order
+    l_1_max : float
+        Maximum size in the length direction [m]
+    l_2_max : float
+        Maximum size in the width direction [m]
+    h_min : float
+        Minimum borehole depth [m]
+    h_max : float
+        Maximum borehole depth [m]
+    size_L3 : bool
+        True if L3 sizing should be used.
+    optimise : str
+        'length' if the borefield should be optimised for the minimum borehole length, 'number' when the
+        minimum number of boreholes should be selected.
+    best_value : float
+        Best objective value so far
+
+    Returns
+    -------
+    tuple
+        Best objective value, and a tuple with the total borehole length, parameters and number of boreholes
+        (or None if no configuration beats the given best value)
+    """
+    borefield_temp = copy.deepcopy(borefield)
+    D = borefield.D
+    best = None
+    # n_1: first n_2 that satisfies the maximum borehole length for the previous spacing b_2
+    first_feasible = {}
+
+    for b_2 in b_2_values:
+        lengths = {}
+
+        def length(n_1: int, n_2: int) -> float:
+            if n_2 not in lengths:
+                borefield_temp.borefield = _find_borefield(borefield, n_1, n_2, b_1, b_2, shape)
+                # set description
+                borefield_temp._borefield_description = {'B_1': b_1, 'B_2': b_2, 'N_1': n_1, 'N_2': n_2,
+                                                         'type': shape}
+                try:
+                    if size_L3:
+                        lengths[n_2] = borefield_temp.size_L3(optimise=True)
+                    else:  # pragma: no cover
+                        lengths[n_2] = borefield_temp.size_L4(optimise=True)
+                except:
+                    # the configuration is treated as too small
+                    lengths[n_2] = np.inf
+            return lengths[n_2]
+
+        for n_1 in range(1, int(l_1_max / b_1) + 1):
+            lengths.clear()
+            n_2_max = int(l_2_max / b_2)
+            if n_2_max < 1:
+                continue
+
+            def bound(n_2: int) -> float:
+                number = _find_borefield(borefield, n_1, n_2, b_1, b_2, shape).nBoreholes
+                return (h_min - D) * number if optimise == 'length' else number
+
+            if bound(1) >= best_value:
+                continue
+
+            # binary search for the first n_2 that satisfies the maximum borehole length
+            low, high = 1, min(n_2_max, first_feasible.get(n_1, n_2_max))
+            if length(n_1, high) + D > h_max:
+                # the maximum borehole length is also exceeded for smaller spacings
+                first_feasible[n_1] = n_2_max + 1
+                continue
+            while low < high:
+                middle = (low + high) // 2
+                if length(n_1, middle) + D <= h_max:
+                    high = middle
+                else:
+                    low = middle + 1
+            first_feasible[n_1] = low
+
+            for n_2 in range(low, n_2_max + 1):
+                if bound(n_2) >= best_value:
+                    break
+                borehole_length = length(n_1, n_2)
+                if borehole_length + D < h_min:
+                    # the borehole length only decreases for larger n_2
+                    break
+                number = _find_borefield(borefield, n_1, n_2, b_1, b_2, shape).nBoreholes
+                value = borehole_length * number if optimise == 'length' else number
+                if value < best_value:
+                    best_value = value
+                    best = (borehole_length * number, [n_1, n_2, b_1, b_2, shape], number)
+                if optimise != 'length':
+                    # the number of boreholes only increases for larger n_2
+                    break
+    return best_value, best
+
+
 def brute_force_config(
         borefield: Borefield,
         l_1_max: float,
@@ -320,43 +816,87 @@ def brute_force_config(
         h_max: float,
         types: list = [0, 1, 2, 3, 4],
         size_L3: bool = True,
-        optimise: str = 'length'
+        optimise: str = 'length',
+        n_workers: int = 1
 ):
-    borefield_temp = copy.deepcopy(borefield)
+    """
+    This function calculates the optimal borefield configuration within a certain area by searching all the
+    combinations of shape, spacings and number of boreholes.
+    Since the required length per borehole does not increase with the number of boreholes and the spacing, the search
+    uses a binary search and bounds on the objective, so only a fraction of the configurations is sized, but the
+    same optimum as with an exhaustive search is found. Every combination of shape and spacing b_1 is a separate
+    block that can be searched in a worker process.
+
+    Parameters
+    ----------
+    borefield : Borefield
+        Borefield object
+    l_1_max : float
+        Maximum size in the length direction [m]
+    l_2_max : float
+        Maximum size in the width direction [m]
+    b_min : float
+        Minimum borehole spacing [m]
+    b_max : float
+        Maximum borehole spacing [m]
+    b_step : float
+        Step size borehole spacing [m]
+    h_min : float
+        Minimum borehole depth [m]
+    h_max : float
+        Maximum borehole depth [m]
+    types : list
+        List with the shapes of the borefields that should be investigated, where type 0: L, type 1: U,
+                type 2: box, type 3: rectangle, type 4: staggered
+    size_L3 : bool
+        True if L3 sizing should be used.
+    optimise : str
+        'length' if the borefield should be optimised for the minimum borehole length, 'number' when the
+        minimum number of boreholes should be selected.
+    n_workers : int
+        Number of worker processes [-]
+
+    Returns
+    -------
+    tuple
+        Total borehole length, parameters [n_1, n_2, b_1, b_2, shape], number of boreholes and pygfunction borefield
+        object
+
+    Raises
+    ------
+    UnsolvableOptimalFieldError
+        When no configuration satisfies the minimum and maximum borehole length
+    ValueError
+        When the number of workers is smaller than 1
+    """
+    if n_workers < 1:
+        raise ValueError(f'The number of workers should be at least 1, not {n_workers}.')
+
+    spacings = np.arange(b_min, b_max + 0.1, b_step)
+    blocks = [(shape, b_1) for shape in types for b_1 in spacings]
+    args = (l_1_max, l_2_max, h_min, h_max, size_L3, optimise)
+
+    if n_workers == 1:
+        # the best value is shared between the blocks
+        best_value, best = np.inf, None
+        for shape, b_1 in blocks:
+            best_value, result = _brute_force_block(borefield, shape, b_1, spacings, *args, best_value=best_value)
+            best = result if result is not None else best
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [executor.submit(_brute_force_block, borefield, shape, b_1, spacings, *args)
+                       for shape, b_1 in blocks]
+            results = [future.result() for future in futures]
+        # the first block with the best value is selected, as in a sequential search
+        best_value, best = np.inf, None
+        for value, result in results:
+            if value < best_value:
+                best_value, best = value, result
+
+    if best is None:
+        raise UnsolvableOptimalFieldError
 
-    # set vars
-    nb_of_boreholes = 999
-    total_length = 1e9
-    params = None
-
-    for shape in types:
-        for b_1 in np.arange(b_min, b_max + 0.1, b_step):
-            for b_2 in np.arange(b_min, b_max + 0.1, b_step):
-                for n_1 in range(1, int(l_1_max / b_1) + 1):
-                    for n_2 in range(1, int(l_2_max / b_2) + 1):
-                        borefield_temp.borefield = _find_borefield(borefield, n_1, n_2, b_1, b_2, shape)
-                        # set description
-                        borefield_temp._borefield_description = {'B_1': b_1, 'B_2': b_2, 'N_1': n_1, 'N_2': n_2,
-                                                                 'type': shape}
-                        try:
-                            if size_L3:
-                                length = borefield_temp.size_L3(optimise=True)
-                            else:  # pragma: no cover
-                                length = borefield_temp.size_L4(optimise=True)
-                            if h_min <= length + borefield_temp.D <= h_max:
-
-                                if optimise == 'length':
-                                    if length * borefield_temp.number_of_boreholes < total_length:
-                                        total_length = length * borefield_temp.number_of_boreholes
-                                        nb_of_boreholes = borefield_temp.number_of_boreholes
-                                        params = [n_1, n_2, b_1, b_2, shape]
-                                else:
-                                    if borefield_temp.number_of_boreholes < nb_of_boreholes:
-                                        total_length = length * borefield_temp.number_of_boreholes
-                                        nb_of_boreholes = borefield_temp.number_of_boreholes
-                                        params = [n_1, n_2, b_1, b_2, shape]
-                        except:
-                            pass
+    total_length, params, nb_of_boreholes = best
     borefield = _find_borefield(borefield, *params)
     borefield.H = total_length / nb_of_boreholes
     return (total_length, params, nb_of_boreholes, borefield)
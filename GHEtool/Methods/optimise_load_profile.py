@@ -10,6 +10,79 @@ from GHEtool.VariableClasses import HourlyBuildingLoad, MonthlyBuildingLoadMulti
 from GHEtool.VariableClasses.LoadData.Baseclasses import _LoadDataBuilding
 
 
+class _PeakLimiter:
+    """
+    This class searches the clip level of a peak load for which the limiting fluid temperature is within a threshold
+    of its limit. Since this temperature is monotone in the clip level, the level is bracketed between a level at which
+    the limit is satisfied and a level at which it is violated. This bracket is narrowed with secant steps, with a
+    bisection step whenever the same end of the bracket is moved twice in a row, so the number of temperature
+    profile evaluations is logarithmic in the required precision.
+    """
+
+    def __init__(self, lower: float, upper: float, threshold: float):
+        """
+
+        Parameters
+        ----------
+        lower : float
+            Minimum clip level [kW]
+        upper : float
+            Maximum clip level [kW]
+        threshold : float
+            Allowed temperature difference with the limit [K]
+        """
+        self.lower = lower
+        self.upper = upper
+        self.threshold = threshold
+        # clip level and temperature deviation at both ends of the bracket (None if it is not evaluated)
+        self._feasible: tuple = (lower, None)
+        self._infeasible: tuple = (upper, None)
+        self._last_end: bool = None
+
+    def update(self, level: float, deviation: float) -> tuple[float, bool]:
+        """
+        This function updates the bracket with an evaluated clip level and returns the next clip level.
+
+        Parameters
+        ----------
+        level : float
+            Evaluated clip level [kW]
+        deviation : float
+            Temperature difference with which the limit is exceeded at this level (negative if it is satisfied) [K]
+
+        Returns
+        -------
+        tuple [float, bool]
+            Next clip level [kW], True if the current level has converged
+        """
+        feasible = deviation <= 0
+        if feasible:
+            self._feasible = (level, deviation)
+        else:
+            self._infeasible = (level, deviation)
+
+        if abs(deviation) <= self.threshold or (feasible and level >= self.upper) or \
+                (not feasible and level <= self.lower):
+            return level, True
+
+        (x_0, d_0), (x_1, d_1) = self._feasible, self._infeasible
+        if x_1 - x_0 <= 1e-9 * max(self.upper, 1):
+            if feasible:
+                # the limit cannot be approached closer
+                return level, True
+            # the feasible end is outdated, since the temperatures depend on the other clip level as well
+            self._feasible = (x_0, d_0) = (self.lower, None)
+
+        if d_0 is None or d_1 is None or self._last_end == feasible:
+            next_level = (x_0 + x_1) / 2
+        else:
+            next_level = x_0 - d_0 * (x_1 - x_0) / (d_1 - d_0)
+            if not x_0 < next_level < x_1:
+                next_level = (x_0 + x_1) / 2
+        self._last_end = feasible
+        return next_level, False
+
+
 def optimise_load_profile_power(
         borefield,
         building_load: Union[HourlyBuildingLoad, HourlyBuildingLoadMultiYear],
@@ -22,7 +95,8 @@ def optimise_load_profile_power(
     Union[HourlyBuildingLoad, HourlyBuildingLoadMultiYear], Union[HourlyBuildingLoad, HourlyBuildingLoadMultiYear]]:
     """
     This function optimises the load for maximum power in extraction and injection based on the given borefield and
-    the given hourly building load. It does so based on a load-duration curve.
+    the given hourly building load. It does so based on a load-duration curve, of which the peak extraction and
+    injection are clipped at levels that are found with a bracketing solver.
 
     Parameters
     ----------
@@ -91,10 +165,32 @@ def optimise_load_profile_power(
     if max_peak_cooling is not None:
         init_peak_cooling = min(init_peak_cooling, max_peak_cooling)
 
-    # peak loads for iteration
-    peak_heat_load: float = init_peak_heating
-    peak_dhw_load: float = init_peak_dhw
-    peak_cool_load: float = init_peak_cooling
+    # minimum peak loads
+    min_peak_heating: float = min(0.1, init_peak_heating)
+    min_peak_dhw: float = min(0.1, init_peak_dhw)
+
+    def extraction_peaks(level: float) -> tuple[float, float]:
+        """
+        This function returns the peak heating and dhw load for a certain clip level of the extraction.
+        If dhw_preferential is True, the heating is reduced first, if it is False, the dhw is reduced first and
+        if it is None, only the heating is reduced.
+        """
+        if dhw_preferential is None:
+            return level, init_peak_dhw
+        if dhw_preferential:
+            return min(init_peak_heating, max(min_peak_heating, level - init_peak_dhw)), \
+                min(init_peak_dhw, max(min_peak_dhw, level - min_peak_heating))
+        return min(init_peak_heating, max(min_peak_heating, level - min_peak_dhw)), \
+            min(init_peak_dhw, max(min_peak_dhw, level - init_peak_heating))
+
+    # the clip levels of the extraction and injection are searched for with a bracketing solver
+    if dhw_preferential is None:
+        heat_limiter = _PeakLimiter(min_peak_heating, init_peak_heating, temperature_threshold)
+    else:
+        heat_limiter = _PeakLimiter(min_peak_heating + min_peak_dhw, init_peak_heating + init_peak_dhw,
+                                    temperature_threshold)
+    cool_limiter = _PeakLimiter(min(0.1, init_peak_cooling), init_peak_cooling, temperature_threshold)
+    extraction_level, peak_cool_load = heat_limiter.upper, cool_limiter.upper
 
     n_hours = borefield.load.simulation_period * 8760
     if isinstance(borefield.load, HourlyBuildingLoad) and use_hourly_resolution:
@@ -105,6 +201,7 @@ def optimise_load_profile_power(
     # set iteration criteria
     cool_ok, heat_ok = False, False
     while not cool_ok or not heat_ok:
+        peak_heat_load, peak_dhw_load = extraction_peaks(extraction_level)
         # limit the primary geothermal extraction and injection load to peak_heat_load and peak_cool_load
         borefield.load.set_hourly_cooling_load(
             np.minimum(peak_cool_load, building_load._hourly_cooling_load
@@ -121,6 +218,9 @@ def optimise_load_profile_power(
                                                  g_values=borefield._temp_results.get('g_values'),  # always the same
                                                  g_value_differences=borefield._temp_results.get(
                                                      'g_value_differences'),
+                                                 hourly_load_prev=borefield._temp_results.get('hourly_load_prev'),
+                                                 result_convolution=borefield._temp_results.get('result_convolution'),
+                                                 temperature_result=borefield._temp_results.get('temperature_result'),
                                                  first_last_year=isinstance(borefield.load,
                                                                             HourlyBuildingLoad))  # always the same
         if borefield._calculation_setup.size_based_on == 'average':
@@ -133,45 +233,9 @@ def optimise_load_profile_power(
             min_temperature, max_temperature = np.min(borefield.results.peak_extraction_outlet[index_mask]), np.max(
                 borefield.results.peak_injection_outlet[index_mask])
 
-        # deviation from minimum temperature
-        if abs(min_temperature - borefield.Tf_min) > temperature_threshold:
-            # check if it goes below the threshold
-            if min_temperature < borefield.Tf_min:
-                if (dhw_preferential and peak_heat_load > 0.1) \
-                        or (not dhw_preferential and peak_dhw_load <= 0.1) \
-                        or dhw_preferential is None:
-                    # first reduce the peak load in heating before touching the dhw load
-                    # if dhw_preferential is None, it is not optimised and kept constant
-                    peak_heat_load = max(0.1, peak_heat_load - 1 * max(1, 10 * (
-                            borefield.Tf_min - min_temperature)))
-                else:
-                    peak_dhw_load = max(0.1, peak_dhw_load - 1 * max(1, 10 * (
-                            borefield.Tf_min - min_temperature)))
-                heat_ok = False
-            else:
-                if (dhw_preferential and peak_heat_load != init_peak_heating) or (
-                        not dhw_preferential and 0.1 >= peak_dhw_load) or dhw_preferential is None:
-                    peak_heat_load = min(init_peak_heating, peak_heat_load * 1.01)
-                else:
-                    peak_dhw_load = min(init_peak_dhw, peak_dhw_load * 1.01)
-                if peak_heat_load == init_peak_heating and peak_dhw_load == init_peak_dhw:
-                    heat_ok = True
-        else:
-            heat_ok = True
-
-        # deviation from maximum temperature
-        if abs(max_temperature - borefield.Tf_max) > temperature_threshold:
-            # check if it goes above the threshold
-            if max_temperature > borefield.Tf_max:
-                peak_cool_load = max(0.1, peak_cool_load - 1 * max(1, 10 * (
-                        -borefield.Tf_max + max_temperature)))
-                cool_ok = False
-            else:
-                peak_cool_load = min(init_peak_cooling, peak_cool_load * 1.01)
-                if peak_cool_load == init_peak_cooling:
-                    cool_ok = True
-        else:
-            cool_ok = True
+        # the minimum temperature decreases and the maximum temperature increases with their clip level
+        extraction_level, heat_ok = heat_limiter.update(extraction_level, borefield.Tf_min - min_temperature)
+        peak_cool_load, cool_ok = cool_limiter.update(peak_cool_load, max_temperature - borefield.Tf_max)
 
     # calculate external load
     if isinstance(building_load, HourlyBuildingLoad):
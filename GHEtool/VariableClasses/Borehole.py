@@ -3,6 +3,9 @@ This document contains all the information of the borehole class.
 """
 import copy
 import numbers
+import threading
+
+from collections import OrderedDict
 
 import pygfunction as gt
 
@@ -16,6 +19,151 @@ from typing import Union
 import numpy as np
 
 
+class RbTableCache:
+    """
+    This class is a process-wide, least recently used cache for the tables of the equivalent borehole thermal
+    resistance in function of the fluid temperature, which are used when the Rb* is calculated for an array of
+    temperatures. Since the cache is shared by all the Borehole objects, copies of the same borefield (e.g. in the
+    optimisation methods) never recalculate the table for the same borehole design.
+
+    The tables are stored under a structural key of the pipe, fluid and flow data and the borehole geometry, which is
+    built from the attributes of these objects instead of their string representation.
+    """
+
+    DEFAULT_MAX_SIZE: int = 128
+    # results of calculate_resistances, these do not define the borehole design
+    DERIVED_ATTRIBUTES: tuple = ('R_p', 'R_f', 'R_ff', 'R_fp')
+
+    def __init__(self, max_size: int = None):
+        """
+
+        Parameters
+        ----------
+        max_size : int
+            Maximum number of tables in the cache
+        """
+        self.max_size: int = max_size if max_size is not None else RbTableCache.DEFAULT_MAX_SIZE
+        self.hits: int = 0
+        self.misses: int = 0
+        self._tables: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    # types that can be used in the key directly, checked before the slower isinstance checks
+    _SCALAR_TYPES: frozenset = frozenset((int, float, bool, str, np.float64, np.int64, np.bool_))
+    # class: names of the attributes in the __slots__ of the class and its parents
+    _slots: dict = {}
+
+    @staticmethod
+    def _freeze(value):
+        """
+        This function converts an attribute value into a hashable value. Other objects, like the fluid models of
+        the TemperatureDependentFluidData, are derived from the other attributes and return None.
+        """
+        if value is None or type(value) in RbTableCache._SCALAR_TYPES or isinstance(value, (numbers.Number, str)):
+            return value
+        if isinstance(value, np.ndarray):
+            return value.dtype.str, value.shape, value.tobytes()
+        if isinstance(value, (list, tuple)):
+            return tuple(RbTableCache._freeze(i) for i in value)
+        return None
+
+    @staticmethod
+    def structural_key(obj) -> tuple:
+        """
+        This function returns a hashable key that is built from the type and the attributes of an object.
+
+        Parameters
+        ----------
+        obj : _PipeData, _FluidData or _FlowData
+            Object for which the key should be calculated
+
+        Returns
+        -------
+        tuple
+            Structural key
+        """
+        cls = type(obj)
+        slots = RbTableCache._slots.get(cls)
+        if slots is None:
+            slots = set()
+            for parent in cls.__mro__:
+                names = getattr(parent, '__slots__', ())
+                slots.update((names,) if isinstance(names, str) else names)
+            slots = RbTableCache._slots[cls] = tuple(slots.difference(RbTableCache.DERIVED_ATTRIBUTES))
+
+        attributes = {name: getattr(obj, name) for name in slots if hasattr(obj, name)}
+        attributes.update(getattr(obj, '__dict__', {}))
+        return (cls.__qualname__,) + tuple(
+            (name, RbTableCache._freeze(attributes[name])) for name in sorted(attributes)
+            if name not in RbTableCache.DERIVED_ATTRIBUTES)
+
+    def get(self, key: tuple) -> tuple:
+        """
+        This function returns the stored table for a certain key.
+
+        Parameters
+        ----------
+        key : tuple
+            Key of the table
+
+        Returns
+        -------
+        tuple
+            Temperatures [deg C] and the corresponding equivalent borehole thermal resistances [mK/W],
+            or None if there is no table for this key
+        """
+        with self._lock:
+            table = self._tables.get(key)
+            if table is None:
+                self.misses += 1
+                return None
+            self._tables.move_to_end(key)
+            self.hits += 1
+            return table
+
+    def put(self, key: tuple, temperatures: np.ndarray, resistances: np.ndarray) -> None:
+        """
+        This function stores a table and removes the least recently used tables when the cache is full.
+
+        Parameters
+        ----------
+        key : tuple
+            Key of the table
+        temperatures : np.ndarray
+            Temperatures [deg C]
+        resistances : np.ndarray
+            Equivalent borehole thermal resistances [mK/W]
+
+        Returns
+        -------
+        None
+        """
+        # the tables are shared, so they should not be altered
+        temperatures.flags.writeable = False
+        resistances.flags.writeable = False
+        with self._lock:
+            self._tables[key] = (temperatures, resistances)
+            self._tables.move_to_end(key)
+            while len(self._tables) > max(self.max_size, 0):
+                self._tables.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        This function removes all the tables of the cache.
+
+        Returns
+        -------
+        None
+        """
+        with self._lock:
+            self._tables.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._tables)
+
+
 class Borehole(BaseClass):
     """
     The borehole class contains all the functionalities related to the calculation of the equivalent
@@ -24,6 +172,9 @@ class Borehole(BaseClass):
 
     __slots__ = '_fluid_data', '_pipe_data', '_Rb', 'use_constant_Rb', '_flow_data'
 
+    # process-wide cache for the Rb* tables, shared by all the Borehole objects
+    rb_table_cache: RbTableCache = RbTableCache()
+
     def __init__(self, fluid_data: _FluidData = None,
                  pipe_data: _PipeData = None,
                  flow_data: _FlowData = None):
@@ -256,25 +407,27 @@ class Borehole(BaseClass):
                      use_explicit_models: bool = False, **kwargs) -> float:
         """
         This function calculates the equivalent borehole thermal resistance.
+        When the explicit models of the U-tubes or the coaxial pipe are used, the borehole length, borehole radius and
+        ground thermal conductivity can also be arrays, which are broadcast against the flow rates and temperatures.
 
         Parameters
         ----------
-        H : float
+        H : float or np.ndarray
             Borehole depth [m]
         D : float
             Borehole burial depth [m]
-        r_b : float
+        r_b : float or np.ndarray
             Borehole radius [m]
-        k_s : float or callable
+        k_s : float, np.ndarray or callable
             (Function to calculate the) ground thermal conductivity [mk/W]
-        depth : float
+        depth : float or np.ndarray
             Borehole depth [m] (only needed if k_s is a function, not a number)
         use_explicit_models : bool
             True if the explicit multipole method should be used.
 
         Returns
         -------
-        Rb : float
+        Rb : float or np.ndarray
             Equivalent borehole thermal resistance
 
         Raises
@@ -291,12 +444,14 @@ class Borehole(BaseClass):
             print("Please make sure you set al the pipe and fluid data.")
             raise ValueError
 
-        # initiate temporary borefield
-        borehole = gt.boreholes.Borehole(H, D, r_b, 0, 0)
-
         if use_explicit_models:
+            # the explicit models can be calculated for arrays of borehole lengths and radii at once
+            borehole = gt.boreholes.Borehole(H, D, r_b, 0, 0) if np.ndim(H) == 0 and np.ndim(r_b) == 0 else None
             return np.nan_to_num(self.pipe_data.explicit_model_borehole_resistance(self.fluid_data, self.flow_data, (
-                k_s if isinstance(k_s, numbers.Real) else k_s(depth, D)), borehole, borehole_length=H, **kwargs))
+                k_s if not callable(k_s) else k_s(depth, D)), borehole, borehole_length=H, r_b=r_b, **kwargs))
+
+        # initiate temporary borefield
+        borehole = gt.boreholes.Borehole(H, D, r_b, 0, 0)
 
         if isinstance(self.flow_data,
                       (VariableHourlyFlowRate, VariableHourlyMultiyearFlowRate, ConstantDeltaTFlowRate)):
@@ -322,36 +477,30 @@ class Borehole(BaseClass):
 
             else:
                 # there are multiple values to be calculated
-                # check if stored data is still accurate
-                stored_interp_data = {
-                    'D': D,
-                    'H': H,
-                    'r_b': r_b,
-                    'k_s': k_s if isinstance(k_s, (float, int)) else k_s(depth, D),
-                    'fluid': str(self.fluid_data),
-                    'pipe': str(self.pipe_data),
-                    'flow': str(self.flow_data)
-                }
-                if stored_interp_data != self._stored_interp_data or not self._use_stored_data:
-                    self._temperature_range = np.concatenate((
-                        np.linspace(self.fluid_data.freezing_point, 30,
-                                    kwargs.get('nb_of_points', self._nb_of_data_points)), np.arange(35, 105, 5)))
-
-                    self._y_val = np.zeros(self._temperature_range.shape)
-
-                    for idx, temperature in enumerate(self._temperature_range):
+                # check if the table for this borehole design is already calculated
+                nb_of_points = kwargs.get('nb_of_points', self._nb_of_data_points)
+                self._stored_interp_data = (
+                    RbTableCache.structural_key(self.pipe_data),
+                    RbTableCache.structural_key(self.fluid_data),
+                    RbTableCache.structural_key(self.flow_data),
+                    H, D, r_b, k_s if isinstance(k_s, (float, int)) else k_s(depth, D), nb_of_points,
+                    # scalar arguments like the number of boreholes influence the flow rate per borehole
+                    tuple((key, value) for key, value in sorted(kwargs.items())
+                          if key not in ('temperature', 'nb_of_points') and isinstance(value, (numbers.Number, str))))
+                table = Borehole.rb_table_cache.get(self._stored_interp_data) if self._use_stored_data else None
+                if table is None:
+                    temperature_range = np.concatenate((
+                        np.linspace(self.fluid_data.freezing_point, 30, nb_of_points), np.arange(35, 105, 5)))
+
+                    y_val = np.zeros(temperature_range.shape)
+
+                    for idx, temperature in enumerate(temperature_range):
                         kwargs_new['temperature'] = temperature
-                        self._y_val[idx] = calculate(**kwargs_new)
-
-                    self._stored_interp_data = {
-                        'D': D,
-                        'H': H,
-                        'r_b': r_b,
-                        'k_s': k_s if isinstance(k_s, (float, int)) else k_s(depth, D),
-                        'fluid': str(self.fluid_data),
-                        'pipe': str(self.pipe_data),
-                        'flow': str(self.flow_data)
-                    }
+                        y_val[idx] = calculate(**kwargs_new)
+
+                    Borehole.rb_table_cache.put(self._stored_interp_data, temperature_range, y_val)
+                    table = temperature_range, y_val
+                self._temperature_range, self._y_val = table
 
                 # interpolate
                 return np.interp(kwargs['temperature'], self._temperature_range, self._y_val)
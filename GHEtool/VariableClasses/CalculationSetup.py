@@ -17,7 +17,13 @@ class CalculationSetup(BaseClass):
     __slots__ = '_L2_sizing', '_L3_sizing', '_L4_sizing', 'quadrant_sizing', '_backup', \
         'atol', 'rtol', 'max_nb_of_iterations', 'interpolate_gfunctions', 'H_init', \
         'use_precalculated_dataset', 'deep_sizing', 'force_deep_sizing', 'use_neural_network', 'approximate_req_depth', \
-        'size_based_on', 'use_explicit_multipole'
+        'size_based_on', 'use_explicit_multipole', 'convolution_method', 'gfunction_cache_directory', \
+        'gfunction_cache_size', 'gfunction_library_directory', 'gfunction_library_tolerance', \
+        'sizing_solver', 'cascade_sizing', 'cascade_tolerance_factor', 'sparse_hourly_sizing', \
+        'sparse_hourly_candidates'
+
+    CONVOLUTION_METHODS: tuple = ('direct', 'spectral', 'load_aggregation')
+    SIZING_SOLVERS: tuple = ('fixed_point', 'secant', 'illinois', 'brent')
 
     def __init__(self, quadrant_sizing: int = 0,
                  L2_sizing: bool = None, L3_sizing: bool = None, L4_sizing: bool = None,
@@ -26,7 +32,12 @@ class CalculationSetup(BaseClass):
                  use_precalculated_dataset: bool = True, deep_sizing: bool = False,
                  force_deep_sizing: bool = False, use_neural_network: bool = False,
                  approximate_req_depth: bool = False, size_based_on: str = 'average',
-                 use_explicit_multipole: bool = True):
+                 use_explicit_multipole: bool = True, convolution_method: str = 'direct',
+                 gfunction_cache_directory: str = None, gfunction_cache_size: float = 100.,
+                 gfunction_library_directory: str = None, gfunction_library_tolerance: float = 0.001,
+                 sizing_solver: str = 'fixed_point', cascade_sizing: bool = False,
+                 cascade_tolerance_factor: float = 10., sparse_hourly_sizing: bool = False,
+                 sparse_hourly_candidates: int = 10):
         """
 
         Parameters
@@ -76,6 +87,50 @@ class CalculationSetup(BaseClass):
             'outlet' if the borefield should be sized based on the borefield outlet temperature
         use_explicit_multipole : bool
             True if the explicit formulations of the multipole method should be used by default.
+        convolution_method : str
+            'direct' (default) if the hourly temperature profile should be calculated with a full convolution for
+            every borehole length,
+            'spectral' if the spectrum of the hourly load should be reused between borehole lengths and the convolved
+            response should be interpolated between previously calculated borehole lengths. This speeds up the L4
+            sizing,
+            'load_aggregation' if the hourly temperature profile should be calculated with the load aggregation scheme
+            of Claesson and Javed. This only requires the g-values at the aggregation times and scales linearly with
+            the simulation period, at the cost of a small approximation error.
+        gfunction_cache_directory : str
+            Directory of the persistent cache for the g-values calculated with pygfunction. These g-values can then be
+            reused in other sessions and processes. If None (default), no persistent cache is used.
+        gfunction_cache_size : float
+            Maximum size of the persistent g-function cache [MB]. When it is exceeded, the least recently used
+            g-values are removed.
+        gfunction_library_directory : str
+            Directory with precalculated custom g-function datasets (in the binary format of dump_custom_dataset).
+            Before the g-values are calculated with pygfunction, the dataset for the same borefield geometry and
+            options, and with the nearest ground thermal diffusivity, is used when it covers the requested borehole
+            length and time values. If None (default), no library is used.
+        gfunction_library_tolerance : float
+            Maximum relative difference between the ground thermal diffusivity of a dataset in the g-function library
+            and the one of the borefield.
+        sizing_solver : str
+            Solver for the borehole length in the L3 and L4 sizing.
+            'fixed_point' (default) if the borehole length should be rescaled and relaxed until it converges,
+            'secant', 'illinois' or 'brent' if the root of the limiting temperature minus the temperature limit should be
+            bracketed and found with the secant method, the Illinois method or Brent's method respectively. These
+            require less temperature profile evaluations. The deep sizing always uses the fixed-point iteration.
+        cascade_sizing : bool
+            True if the L3 and L4 sizing should start from the result of the cheaper sizing methods, i.e. L2 for the
+            L3 sizing and L2 followed by L3 for the L4 sizing.
+        cascade_tolerance_factor : float
+            Factor with which the tolerances atol and rtol are multiplied for the preliminary sizing methods of the
+            cascade sizing.
+        sparse_hourly_sizing : bool
+            True if the hourly fluid temperatures should only be calculated at a set of candidate critical hours
+            during the iterations of the L4 sizing. The result is verified with the full temperature profile and the
+            iteration is repeated with more candidate hours when the limiting hour was not a candidate. This is not
+            used for building loads, temperature dependent fluid properties, hourly flow rates or other convolution
+            methods than 'direct'.
+        sparse_hourly_candidates : int
+            Number of candidate hours that is selected for every criterion (highest and lowest temperature, highest
+            injection and extraction load) in the first year, the last year and the whole simulation period.
 
         References
         ----------
@@ -100,6 +155,16 @@ class CalculationSetup(BaseClass):
         self.approximate_req_depth: bool = approximate_req_depth
         self.size_based_on: str = size_based_on
         self.use_explicit_multipole: bool = use_explicit_multipole
+        self.convolution_method: str = convolution_method
+        self.gfunction_cache_directory: str = gfunction_cache_directory
+        self.gfunction_cache_size: float = gfunction_cache_size
+        self.gfunction_library_directory: str = gfunction_library_directory
+        self.gfunction_library_tolerance: float = gfunction_library_tolerance
+        self.sizing_solver: str = sizing_solver
+        self.cascade_sizing: bool = cascade_sizing
+        self.cascade_tolerance_factor: float = cascade_tolerance_factor
+        self.sparse_hourly_sizing: bool = sparse_hourly_sizing
+        self.sparse_hourly_candidates: int = sparse_hourly_candidates
 
         self._backup: CalculationSetup = None
 
@@ -140,7 +205,8 @@ class CalculationSetup(BaseClass):
         Raises
         ------
         ValueError
-            When there is a problematic value like two sizing methods or a quadrant not in (0, 4)
+            When there is a problematic value like two sizing methods, a quadrant not in (0, 4), an unknown
+            convolution method or an unknown sizing solver
         """
         variables = self.__slots__
         sizing_vars = set(["L2_sizing", "L3_sizing", "L4_sizing"])
@@ -160,6 +226,10 @@ class CalculationSetup(BaseClass):
                 if val is not None:
                     if key == "quadrant_sizing" and val not in (0, 1, 2, 3, 4):
                         raise ValueError(f'The quadrant {val} does not exist!')
+                    if key == "convolution_method" and val not in CalculationSetup.CONVOLUTION_METHODS:
+                        raise ValueError(f'The convolution method {val} does not exist!')
+                    if key == "sizing_solver" and val not in CalculationSetup.SIZING_SOLVERS:
+                        raise ValueError(f'The sizing solver {val} does not exist!')
                     self.__setattr__(key, val)
             elif key != 'self' and key not in sizing_vars:
                 raise ValueError(f'The variable {key} is not a valid options!')
@@ -1,6 +1,5 @@
 import itertools
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 from collections import defaultdict
@@ -374,6 +373,8 @@ def plot_heat_pump_envelope(points, eff, ax=None, label_prefix="T"):
         Axis containing the plot.
     """
 
+    import matplotlib.pyplot as plt
+
     if ax is None:
         fig, ax = plt.subplots()
 
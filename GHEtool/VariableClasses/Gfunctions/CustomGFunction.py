@@ -2,14 +2,19 @@
 This file contains both the CustomGFunction class and all the relevant information w.r.t. custom gfunctions.
 """
 import copy
+import hashlib
+import json
 import math
+import os
 import pickle
+import struct
 import warnings
-from typing import List, Union
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Callable, List, Union
 
 import numpy as np
 import pygfunction as gt
-from scipy import interpolate
 
 
 def _time_values(dt=3600., t_max=100. * 8760 * 3600.) -> np.array:
@@ -39,6 +44,93 @@ def _time_values(dt=3600., t_max=100. * 8760 * 3600.) -> np.array:
     return gt.load_aggregation.ClaessonJaved(dt, t_max).get_times_for_simulation()
 
 
+def _time_weights(time_array: np.ndarray, time_value: np.ndarray, cache: tuple = None) -> tuple:
+    """
+    This function returns the indices in the time array and the interpolation weights for the requested times.
+    When the cache holds the weights for the same time array and times, these are returned without recalculation,
+    so the interpolation is only a weighted sum of two rows when the same times are requested again
+    (e.g. for different borehole lengths during sizing).
+
+    Parameters
+    ----------
+    time_array : np.ndarray
+        Time array of the g-values [s]
+    time_value : np.ndarray
+        Time values [s], within the range of the time array
+    cache : tuple
+        Cache returned by a previous call of this function (or None)
+
+    Returns
+    -------
+    np.ndarray, np.ndarray, tuple
+        Indices of the time array at the left of the requested times, interpolation weights, cache
+    """
+    if cache is not None and cache[0] is time_array and cache[1].shape == time_value.shape \
+            and np.array_equal(cache[1], time_value):
+        return cache[2], cache[3], cache
+
+    indices = np.clip(np.searchsorted(time_array, time_value, side='right') - 1, 0, time_array.size - 2)
+    weights = (time_value - time_array[indices]) / (time_array[indices + 1] - time_array[indices])
+    return indices, weights, (time_array, time_value.copy(), indices, weights)
+
+
+# file format of the custom datasets: magic bytes, version, header length, JSON header and the raw float64 arrays
+FILE_FORMAT_MAGIC: bytes = b'GHEGVAL\x00'
+FILE_FORMAT_VERSION: int = 1
+_FILE_FORMAT_ALIGNMENT: int = 64
+
+
+def geometry_hash(borefield: gt.borefield.Borefield) -> str:
+    """
+    This function returns a hash of the geometry of a borefield, neglecting the borehole length, so it can be used
+    to identify the custom datasets of this borefield.
+
+    Parameters
+    ----------
+    borefield : pygfunction.borefield.Borefield
+        Borefield object
+
+    Returns
+    -------
+    str
+        Hexadecimal hash
+    """
+    geometry = np.array([[borehole.D, borehole.r_b, borehole.x, borehole.y, borehole.tilt, borehole.orientation]
+                         for borehole in borefield], dtype=np.float64)
+    # rounding makes the hash insensitive to floating point noise in the geometry
+    return hashlib.sha256(np.round(geometry, 9).tobytes()).hexdigest()
+
+
+def _calculate_gvalues(borefield: gt.borefield.Borefield, borehole_length: float, alpha: float,
+                       time_array: np.ndarray, options: dict) -> np.ndarray:
+    """
+    This function calculates the g-values of a borefield for a certain borehole length.
+    It is defined at module level so it can be executed in another process.
+
+    Parameters
+    ----------
+    borefield : pygfunction.borefield.Borefield
+        Borefield object for which the g-values should be calculated
+    borehole_length : float
+        Borehole length [m]
+    alpha : float
+        Ground thermal diffusivity [m2/s]
+    time_array : np.ndarray
+        Time values [s] at which the g-values should be calculated
+    options : dict
+        Dictionary with options for the gFunction class of pygfunction
+
+    Returns
+    -------
+    np.ndarray
+        g-values
+    """
+    borefield = copy.deepcopy(borefield)
+    # set borehole length in borefield
+    borefield.H = np.full(borefield.nBoreholes, borehole_length)
+    return gt.gfunction.gFunction(borefield, alpha, time_array, options=options, method=options["method"]).gFunc
+
+
 class CustomGFunction:
     """
     This class contains all the functionalities related to custom gfunctions.
@@ -73,6 +165,11 @@ class CustomGFunction:
 
         self.gvalues_array: np.ndarray = np.zeros((self.borehole_length_array.size, self.time_array.size))
         self.options: dict = {"method": "equivalent", "display": True}
+        # estimated interpolation error of an adaptive dataset, w.r.t. the largest g-value
+        self.interpolation_error: float = None
+        # metadata of the borefield and ground for which the dataset is created
+        self.geometry_hash: str = None
+        self.alpha: np.ndarray = np.array([])  # ground thermal diffusivity at every borehole length [m2/s]
 
         # set values
         if time_array is not None:
@@ -133,15 +230,115 @@ class CustomGFunction:
         if check and not self.within_range(time_value, borehole_length):
             return False
 
-        if not isinstance(time_value, (float, int)):
-            # multiple values are requested
-            g_value = interpolate.interpn((self.borehole_length_array, self.time_array), self.gvalues_array,
-                                          np.array([[borehole_length, t] for t in time_value]))
-        else:
+        # linear interpolation between the g-values of the two enclosing borehole lengths
+        gvalues = self._gvalues_at_length(borehole_length)
+
+        if isinstance(time_value, (float, int)):
             # only one value is requested
-            g_value = interpolate.interpn((self.borehole_length_array, self.time_array), self.gvalues_array,
-                                          np.array([borehole_length, time_value]))
-        return g_value
+            time_value = np.array([time_value])
+        else:
+            # multiple values are requested
+            time_value = np.asarray(time_value, dtype=np.float64)
+            if time_value is self.time_array or np.array_equal(time_value, self.time_array):
+                return gvalues
+
+        indices, weights = self._time_weights(time_value)
+        return gvalues[indices] * (1 - weights) + gvalues[indices + 1] * weights
+
+    def calculate_gfunctions(self, time_value: Union[list, float, np.ndarray],
+                             borehole_lengths: Union[list, np.ndarray]) -> np.ndarray:
+        """
+        This function returns the gfunction values for multiple borehole lengths at once, based on interpolation
+        between precalculated values.
+
+        Parameters
+        ----------
+        time_value : list, float, np.ndarray
+            Time value(s) in seconds at which the gfunctions should be calculated
+        borehole_lengths : list, np.ndarray
+            Borehole lengths [m] at which the gfunctions should be calculated
+
+        Returns
+        -------
+        gvalues : np.ndarray
+            2D array with the requested gvalues for every borehole length (rows) and time value (columns)
+
+        Raises
+        ------
+        ValueError
+            When a borehole length is outside the range of the dataset
+        """
+        borehole_lengths = np.atleast_1d(np.asarray(borehole_lengths, dtype=np.float64))
+        if np.any(borehole_lengths < self.min_borehole_length) or np.any(borehole_lengths > self.max_borehole_length):
+            raise ValueError(f'The borehole lengths of {borehole_lengths}m are out of bounds of the custom dataset.')
+        idx = np.minimum(np.searchsorted(self.borehole_length_array, borehole_lengths, side='right') - 1,
+                         self.borehole_length_array.size - 2)
+        weights = ((borehole_lengths - self.borehole_length_array[idx]) /
+                   (self.borehole_length_array[idx + 1] - self.borehole_length_array[idx]))[:, np.newaxis]
+
+        lower, upper = self.gvalues_array[idx], self.gvalues_array[idx + 1]
+        time_value = np.atleast_1d(np.asarray(time_value, dtype=np.float64))
+        if not np.array_equal(time_value, self.time_array):
+            # interpolate in time first, so only the requested times of the enclosing borehole lengths are blended
+            indices, time_weights = self._time_weights(time_value)
+            lower = lower[:, indices] * (1 - time_weights) + lower[:, indices + 1] * time_weights
+            upper = upper[:, indices] * (1 - time_weights) + upper[:, indices + 1] * time_weights
+        return lower * (1 - weights) + upper * weights
+
+    def _gvalues_at_length(self, borehole_length: float) -> np.ndarray:
+        """
+        This function returns the g-values at all the times of the time array for a certain borehole length,
+        by linear interpolation between the two enclosing borehole lengths of the dataset.
+
+        Parameters
+        ----------
+        borehole_length : float
+            Borehole length [m]
+
+        Returns
+        -------
+        np.ndarray
+            g-values at the time array
+
+        Raises
+        ------
+        ValueError
+            When the borehole length is outside the range of the dataset
+        """
+        if not self.min_borehole_length <= borehole_length <= self.max_borehole_length:
+            raise ValueError(f'The borehole length of {borehole_length}m is out of bounds of the custom dataset.')
+        idx = min(np.searchsorted(self.borehole_length_array, borehole_length, side='right') - 1,
+                  self.borehole_length_array.size - 2)
+        weight = (borehole_length - self.borehole_length_array[idx]) / \
+                 (self.borehole_length_array[idx + 1] - self.borehole_length_array[idx])
+        return self.gvalues_array[idx] * (1 - weight) + self.gvalues_array[idx + 1] * weight
+
+    def _time_weights(self, time_value: np.ndarray) -> tuple:
+        """
+        This function returns the indices in the time array and the interpolation weights for the requested times.
+        These are stored, so the interpolation is only a weighted sum of two rows when the same times are
+        requested again (e.g. for different borehole lengths during sizing).
+
+        Parameters
+        ----------
+        time_value : np.ndarray
+            Time values [s]
+
+        Returns
+        -------
+        np.ndarray, np.ndarray
+            Indices of the time array at the left of the requested times, interpolation weights
+
+        Raises
+        ------
+        ValueError
+            When the time values are outside the range of the dataset
+        """
+        if np.any(time_value < self.min_t) or np.any(time_value > self.max_t):
+            raise ValueError('The requested time values are out of bounds of the custom dataset.')
+        indices, weights, self._interpolation_cache = _time_weights(self.time_array, time_value,
+                                                                    getattr(self, '_interpolation_cache', None))
+        return indices, weights
 
     def within_range(self, time_value: Union[list, float, np.ndarray], borehole_length: float) -> bool:
         """
@@ -195,9 +392,57 @@ class CustomGFunction:
 
         return True
 
-    def create_custom_dataset(self, borefield: gt.borefield.Borefield, alpha: Union[float, callable]) -> None:
+    def create_custom_dataset(self, borefield: gt.borefield.Borefield, alpha: Union[float, callable],
+                              n_workers: int = 1, chunksize: int = 1,
+                              progress: Callable[[int, int, float], None] = None) -> None:
         """
         This function creates the custom dataset.
+        The g-values for the different borehole lengths can be calculated in parallel with a pool of processes.
+        The results are always stored in the order of the borehole length array, so the dataset does not depend on
+        the number of workers.
+
+        Parameters
+        ----------
+        borefield : pygfunction.borefield.Borefield
+            Borefield object for which the custom dataset should be created
+        alpha : float or callable
+            Ground thermal diffusivity [m2/s] or function to calculate it at a certain borehole length
+        n_workers : int
+            Number of processes that calculate the g-values. If 1 (default), everything is calculated in the
+            current process.
+        chunksize : int
+            Number of borehole lengths that are sent to a worker at once
+        progress : callable
+            Function that is called after every calculated borehole length with the number of calculated lengths,
+            the total number of lengths and the borehole length [m] that is finished.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            When the number of workers or the chunksize is smaller than 1
+        """
+        self.gvalues_array = self._calculate_gvalues_array(borefield, alpha, self.borehole_length_array, n_workers,
+                                                           chunksize, progress)
+        self.geometry_hash = geometry_hash(borefield)
+        self.alpha = self._ground_thermal_diffusivities(borefield, alpha, self.borehole_length_array)
+
+    def create_adaptive_custom_dataset(self, borefield: gt.borefield.Borefield, alpha: Union[float, callable],
+                                       rtol: float = 0.01, max_number_of_lengths: int = None, n_workers: int = 1,
+                                       chunksize: int = 1, progress: Callable[[int, int, float], None] = None) -> None:
+        """
+        This function creates the custom dataset with an adaptive borehole length grid between the minimum and
+        maximum of the borehole length array.
+
+        The grid starts with the minimum, middle and maximum borehole length. Every interval is split in two and the
+        g-values at the middle are compared with the linear interpolation between the two neighbours. Only the
+        intervals where this difference exceeds the tolerance are refined further, so the number of g-function
+        calculations depends on how smooth the g-function is w.r.t. the borehole length. The refinement stops when
+        all the intervals are within tolerance or when the maximum number of borehole lengths is reached.
+        The estimated interpolation error is stored in interpolation_error.
 
         Parameters
         ----------
@@ -205,52 +450,214 @@ class CustomGFunction:
             Borefield object for which the custom dataset should be created
         alpha : float or callable
             Ground thermal diffusivity [m2/s] or function to calculate it at a certain borehole length
+        rtol : float
+            Maximum interpolation error of the g-values w.r.t. the largest g-value [-]
+        max_number_of_lengths : int
+            Maximum number of borehole lengths for which the g-values are calculated. If None, the size of the
+            default borehole length array is taken.
+        n_workers : int
+            Number of processes that calculate the g-values. If 1 (default), everything is calculated in the
+            current process.
+        chunksize : int
+            Number of borehole lengths that are sent to a worker at once
+        progress : callable
+            Function that is called after every calculated borehole length with the number of calculated lengths,
+            the number of borehole lengths that are known to be needed and the borehole length [m] that is finished.
 
         Returns
         -------
         None
+
+        Raises
+        ------
+        ValueError
+            When the number of workers or the chunksize is smaller than 1, or when the maximum number of lengths is
+            smaller than 3
         """
+        if max_number_of_lengths is None:
+            max_number_of_lengths = CustomGFunction.DEFAULT_LENGTH_ARRAY.size
+        if max_number_of_lengths < 3:
+            raise ValueError(f'At least 3 borehole lengths are needed, but the maximum is {max_number_of_lengths}.')
+
+        lengths = np.linspace(self.min_borehole_length, self.max_borehole_length, 3)
+        gvalues = list(self._calculate_gvalues_array(borefield, alpha, lengths, n_workers, chunksize, progress))
+        lengths = list(lengths)
+
+        # intervals that still have to be checked, with their estimated interpolation error
+        intervals = [(lengths[0], lengths[1], np.inf), (lengths[1], lengths[2], np.inf)]
+        error = 0.
+        while intervals:
+            # refine the intervals with the largest error first
+            intervals.sort(key=lambda interval: -interval[2])
+            budget = max_number_of_lengths - len(lengths)
+            if budget <= 0:
+                error = max(error, max(interval[2] for interval in intervals))
+                break
+            refine, skipped = intervals[:budget], intervals[budget:]
+            error = max([error] + [interval[2] for interval in skipped])
+
+            middles = np.array([(begin + end) / 2 for begin, end, _ in refine])
+            new_gvalues = self._calculate_gvalues_array(borefield, alpha, middles, n_workers, chunksize, progress,
+                                                        len(lengths), len(lengths) + middles.size)
+            intervals = []
+            for (begin, end, _), middle, gvalue in zip(refine, middles, new_gvalues):
+                interpolated = (gvalues[lengths.index(begin)] + gvalues[lengths.index(end)]) / 2
+                # the interpolation error is quadratic in the interval width, so the error with the middle included
+                # is smaller than half of the difference between the middle and the interpolation of its neighbours
+                interval_error = np.max(np.abs(gvalue - interpolated)) / np.max(np.abs(gvalue)) / 2
+                lengths.append(middle)
+                gvalues.append(gvalue)
+                if interval_error > rtol:
+                    intervals += [(begin, middle, interval_error), (middle, end, interval_error)]
+                else:
+                    error = max(error, interval_error)
+
+        order = np.argsort(lengths)
+        self.borehole_length_array = np.array(lengths)[order]
+        self.gvalues_array = np.array(gvalues)[order]
+        self.interpolation_error = error
+        self.geometry_hash = geometry_hash(borefield)
+        self.alpha = self._ground_thermal_diffusivities(borefield, alpha, self.borehole_length_array)
+
+    def _calculate_gvalues_array(self, borefield: gt.borefield.Borefield, alpha: Union[float, callable],
+                                 borehole_lengths: np.ndarray, n_workers: int = 1, chunksize: int = 1,
+                                 progress: Callable[[int, int, float], None] = None, done: int = 0,
+                                 total: int = None) -> np.ndarray:
+        """
+        This function calculates the g-values for multiple borehole lengths, possibly in parallel.
+        The results are always in the order of the borehole lengths, so they do not depend on the number of workers.
+
+        Parameters
+        ----------
+        borefield : pygfunction.borefield.Borefield
+            Borefield object for which the g-values should be calculated
+        alpha : float or callable
+            Ground thermal diffusivity [m2/s] or function to calculate it at a certain borehole length
+        borehole_lengths : np.ndarray
+            Borehole lengths [m]
+        n_workers : int
+            Number of processes that calculate the g-values
+        chunksize : int
+            Number of borehole lengths that are sent to a worker at once
+        progress : callable
+            Function that is called after every calculated borehole length
+        done : int
+            Number of borehole lengths that were already calculated before, for the progress callback
+        total : int
+            Total number of borehole lengths for the progress callback. If None, the number of borehole lengths is taken.
+
+        Returns
+        -------
+        np.ndarray
+            2D array with the g-values for every borehole length
+
+        Raises
+        ------
+        ValueError
+            When the number of workers or the chunksize is smaller than 1
+        """
+        if n_workers < 1:
+            raise ValueError(f'The number of workers should be at least 1, but {n_workers} is given.')
+        if chunksize < 1:
+            raise ValueError(f'The chunksize should be at least 1, but {chunksize} is given.')
+
         # chek if there is a method in options
         if not "method" in self.options:
             self.options["method"] = "equivalent"
 
-        for idx, borehole_length in enumerate(self.borehole_length_array):
-            print(f'Start length: {borehole_length} m')
-
-            # Calculate the g-function for uniform borehole wall temperature
-            borefield = copy.deepcopy(borefield)
-            # set borehole borehole length in borefield
-            borefield.H = np.full(borefield.nBoreholes, borehole_length)
-
-            # calculate borehole buried depth
-            D = np.average(borefield.D)
-            tilt = np.average(borefield.tilt)
+        alphas = self._ground_thermal_diffusivities(borefield, alpha, borehole_lengths)
+
+        size = len(borehole_lengths)
+        arguments = ([borefield] * size, borehole_lengths, alphas, [self.time_array] * size, [self.options] * size)
+        total = total if total is not None else size
+
+        gvalues_array = np.zeros((size, self.time_array.size))
+        with ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else nullcontext() as executor:
+            # map returns the results in the order of the borehole lengths
+            results = map(_calculate_gvalues, *arguments) if executor is None else \
+                executor.map(_calculate_gvalues, *arguments, chunksize=chunksize)
+            for idx, gvalues in enumerate(results):
+                gvalues_array[idx] = gvalues
+                if progress is not None:
+                    progress(done + idx + 1, total, borehole_lengths[idx])
+        return gvalues_array
+
+    @staticmethod
+    def _ground_thermal_diffusivities(borefield: gt.borefield.Borefield, alpha: Union[float, callable],
+                                      borehole_lengths: np.ndarray) -> np.ndarray:
+        """
+        This function returns the ground thermal diffusivity for every borehole length.
 
-            depth = borehole_length * math.cos(tilt) + D
-            gfunc_uniform_T = gt.gfunction.gFunction(borefield,
-                                                     alpha if isinstance(alpha, float) else alpha(depth, D),
-                                                     self.time_array, options=self.options,
-                                                     method=self.options["method"])
+        Parameters
+        ----------
+        borefield : pygfunction.borefield.Borefield
+            Borefield object
+        alpha : float or callable
+            Ground thermal diffusivity [m2/s] or function to calculate it at a certain borehole length
+        borehole_lengths : np.ndarray
+            Borehole lengths [m]
 
-            self.gvalues_array[idx] = gfunc_uniform_T.gFunc
+        Returns
+        -------
+        np.ndarray
+            Ground thermal diffusivities [m2/s]
+        """
+        D = np.average(borefield.D)
+        tilt = np.average(borefield.tilt)
+        return np.array([alpha if isinstance(alpha, float) else alpha(borehole_length * math.cos(tilt) + D, D)
+                         for borehole_length in borehole_lengths])
 
-    def dump_custom_dataset(self, path: str, name: str) -> None:
+    def dump_custom_dataset(self, path: str, name: str, use_pickle: bool = False) -> None:
         """
         This function dumps the current custom dataset.
 
+        By default, the dataset is stored in a versioned binary format: a JSON header with the metadata (sizes of
+        the grids, geometry hash, ground thermal diffusivity, options and a checksum), followed by the raw time
+        array, borehole length array and g-values. This file can be memory-mapped by load_custom_gfunction.
+        When the options cannot be stored exactly in JSON (e.g. a function or an array as option), the dataset is
+        stored with pickle instead and a warning is given, since these datasets cannot be used in a GFunctionLibrary.
+
         Parameters
         ----------
         path : str
             Location where the dataset should be saved
         name : str
             Name under which the dataset should be saved
+        use_pickle : bool
+            True if the dataset should be stored with pickle, as in previous versions of GHEtool
 
         Returns
         -------
         None
         """
+        if not use_pickle and not _json_compatible(self.options):
+            warnings.warn('The options of the custom gfunction dataset cannot be stored in the binary format, so the '
+                          'dataset is stored with pickle. It cannot be used in a GFunctionLibrary.')
+            use_pickle = True
+        if use_pickle:
+            with open(path + name + '.gvalues', 'wb') as f:
+                pickle.dump(self, f)
+            return
+
+        data = np.concatenate((self.time_array, self.borehole_length_array,
+                               np.asarray(self.gvalues_array).ravel())).astype('<f8')
+        header = {'time_array_size': int(self.time_array.size),
+                  'borehole_length_array_size': int(self.borehole_length_array.size),
+                  'geometry_hash': self.geometry_hash,
+                  'alpha': self.alpha.tolist(),
+                  'options': self.options,
+                  'interpolation_error': self.interpolation_error,
+                  'checksum': hashlib.sha256(data.tobytes()).hexdigest()}
+        header = json.dumps(header).encode()
+        # pad the header so the data is aligned
+        prefix_length = len(FILE_FORMAT_MAGIC) + 8
+        header += b' ' * (-(prefix_length + len(header)) % _FILE_FORMAT_ALIGNMENT)
+
         with open(path + name + '.gvalues', 'wb') as f:
-            pickle.dump(self, f)
+            f.write(FILE_FORMAT_MAGIC)
+            f.write(struct.pack('<II', FILE_FORMAT_VERSION, len(header)))
+            f.write(header)
+            f.write(data.tobytes())
 
     def set_options_gfunction_calculation(self, options: dict) -> None:
         """
@@ -279,10 +686,25 @@ class CustomGFunction:
         """
         self.gvalues_array = np.array([])
 
+    def __getstate__(self):
+        # the interpolation cache is not stored when the dataset is dumped
+        state = self.__dict__.copy()
+        state.pop('_interpolation_cache', None)
+        return state
+
+    def __setstate__(self, state):
+        # datasets of previous versions do not have all the attributes
+        self.interpolation_error = None
+        self.geometry_hash = None
+        self.alpha = np.array([])
+        self.__dict__.update(state)
+
     def __eq__(self, other):
         if not isinstance(other, CustomGFunction):
             return False
         for i in iter(self.__dict__):
+            if i == '_interpolation_cache':
+                continue
             if isinstance(getattr(self, i), np.ndarray) or isinstance(getattr(self, i), list):
                 if not np.array_equal(getattr(self, i), getattr(other, i)):
                     return False
@@ -292,18 +714,104 @@ class CustomGFunction:
         return True
 
 
-def load_custom_gfunction(path: str) -> CustomGFunction:
+def _json_compatible(value) -> bool:
+    """
+    This function checks if a value is the same after it is stored in JSON and read again.
+
+    Parameters
+    ----------
+    value
+        Value to be checked
+
+    Returns
+    -------
+    bool
+        True if the value can be stored exactly in JSON
+    """
+    try:
+        return json.loads(json.dumps(value)) == value
+    except (TypeError, ValueError):
+        return False
+
+
+def read_custom_gfunction_header(path: str) -> dict:
+    """
+    This function reads the metadata of a custom gfunction dataset without reading the g-values.
+
+    Parameters
+    ----------
+    path : str
+        Location of the dataset
+
+    Returns
+    -------
+    dict
+        Metadata of the dataset, with the offset of the data in the file. None if the dataset is stored with pickle.
+
+    Raises
+    ------
+    ValueError
+        When the file format version is not supported
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(FILE_FORMAT_MAGIC)) != FILE_FORMAT_MAGIC:
+            return None
+        version, header_length = struct.unpack('<II', f.read(8))
+        if version > FILE_FORMAT_VERSION:
+            raise ValueError(f'The file format version {version} of {path} is not supported. '
+                             f'Please update GHEtool.')
+        header = json.loads(f.read(header_length))
+    header['version'] = version
+    header['offset'] = len(FILE_FORMAT_MAGIC) + 8 + header_length
+    return header
+
+
+def load_custom_gfunction(path: str, mmap: bool = True, validate: bool = False) -> CustomGFunction:
     """
     This function loads a custom gfunction dataset.
+    Datasets in the binary format are memory-mapped read-only by default, so the g-values are only read from disk
+    when they are needed and the pages can be shared between processes. Datasets that are stored with pickle
+    are still supported.
 
     Parameters
     ----------
     path : str
         Location of the dataset
+    mmap : bool
+        True if the g-values should be memory-mapped, False if they should be read in memory
+    validate : bool
+        True if the checksum of the data should be checked. This requires reading the whole file.
 
     Returns
     -------
     CustomGFunction
         Dataset with the custom gfunction data
+
+    Raises
+    ------
+    ValueError
+        When the file is truncated, the version is not supported or the checksum does not match
     """
-    return pickle.load(open(path, 'rb'))
+    header = read_custom_gfunction_header(path)
+    if header is None:
+        # dataset of a previous version of GHEtool
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    n_t, n_H = header['time_array_size'], header['borehole_length_array_size']
+    size = n_t + n_H + n_t * n_H
+    if os.path.getsize(path) < header['offset'] + size * 8:
+        raise ValueError(f'The custom gfunction dataset {path} is truncated.')
+    if mmap:
+        data = np.memmap(path, dtype='<f8', mode='r', offset=header['offset'], shape=(size,))
+    else:
+        data = np.fromfile(path, dtype='<f8', count=size, offset=header['offset'])
+    if validate and hashlib.sha256(data.tobytes()).hexdigest() != header['checksum']:
+        raise ValueError(f'The checksum of the custom gfunction dataset {path} does not match.')
+
+    custom_gfunction = CustomGFunction(np.array(data[:n_t]), np.array(data[n_t:n_t + n_H]), header['options'])
+    custom_gfunction.gvalues_array = data[n_t + n_H:].reshape(n_H, n_t)
+    custom_gfunction.geometry_hash = header['geometry_hash']
+    custom_gfunction.alpha = np.array(header['alpha'], dtype=np.float64)
+    custom_gfunction.interpolation_error = header['interpolation_error']
+    return custom_gfunction
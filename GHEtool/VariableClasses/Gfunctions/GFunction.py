@@ -1,17 +1,19 @@
 from __future__ import annotations
 
+import os
 import warnings
+from collections import OrderedDict
 from typing import List, Tuple, Union
 
 import numpy as np
-import pandas as pd
 import pygfunction as gt
 import scipy as sc
 from numpy._typing import NDArray
-from scipy import interpolate
+from numpy.typing import ArrayLike
 
 from GHEtool.VariableClasses.Cylindrical_correction import update_pygfunction
-from .CustomGFunction import _time_values
+from .CustomGFunction import _time_values, _time_weights
+from .GFunctionDiskCache import GFunctionDiskCache
 
 # add cylindrical correction to pygfunction
 update_pygfunction()
@@ -90,6 +92,8 @@ class GFunction:
     DEFAULT_TIMESTEPS: np.ndarray = _time_values()
     DEFAULT_NUMBER_OF_TIMESTEPS: int = DEFAULT_TIMESTEPS.size
     DEFAULT_STORE_PREVIOUS_VALUES: bool = True
+    DEFAULT_MAX_CACHE_ENTRIES: int = 16
+    DEFAULT_MAX_CACHE_MEMORY: float = 50.  # MB
 
     def __init__(self):
         self._store_previous_values: bool = GFunction.DEFAULT_STORE_PREVIOUS_VALUES
@@ -97,9 +101,13 @@ class GFunction:
         self.options: dict = {"method": "equivalent"}
         self.alpha: float = 0.0
         self.borefield: gt.borefield.Borefield = None
-        self.borehole_length_array: np.ndarray = np.array([])
+        # the previously calculated g-values are stored in sorted buffers with spare capacity
+        self._size: int = 0
+        self._borehole_length_buffer: np.ndarray = np.array([])
+        self._gvalues_buffer: np.ndarray = np.zeros((0, 0))
+        # time array, requested time values, indices and weights for the interpolation in time
+        self._interpolation_cache: tuple = None
         self.time_array: np.ndarray = np.array([])
-        self.previous_gfunctions: np.ndarray = np.array([])
         self.previous_borehole_length: float = 0.0
         self.use_cyl_correction_when_negative: bool = True
         self.use_neural_network: bool = False
@@ -108,26 +116,87 @@ class GFunction:
         self.threshold_borehole_length_interpolation: float = 0.25  # %
 
         self.fifo_list: FIFO = FIFO(8)
+        self.disk_cache: GFunctionDiskCache = None
 
-        # initiate ANN
+        # previously calculated data of other borefields and/or ground thermal diffusivities
+        self._cache: OrderedDict = OrderedDict()
+        self.max_cache_entries: int = GFunction.DEFAULT_MAX_CACHE_ENTRIES
+        self.max_cache_memory: float = GFunction.DEFAULT_MAX_CACHE_MEMORY
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+
+        # the ANN weights are loaded on first use and shared between all GFunction objects
         self.normalize_vec = np.array((1 / 20, 1 / 20, 1 / 9, 1 / 9, 1 / 1000, 1 / 100, 1 / 0.4, 1 / (10 ** -6)))
-        from GHEtool import FOLDER
-        self.model_weights: dict[int, list[NDArray[np.float64]]] = {
-            i: [
-                pd.read_csv(
-                    FOLDER.joinpath(f"VariableClasses/Gfunctions/ANN_layers/ai_model_shape_{i}_weight_{j}.csv"),
-                    sep=","
-                ).to_numpy()
-                for j in range(6)
-            ]
-            for i in range(5)
-        }
-        # load short term corrections
-        self._g_store = np.load(FOLDER.joinpath(f"VariableClasses/Gfunctions/short_term_ANN_corrections/g_store.npy"))
-        self._depth = np.load(FOLDER.joinpath(f"VariableClasses/Gfunctions/short_term_ANN_corrections/depth.npy"))
-        self._burials = np.load(FOLDER.joinpath(f"VariableClasses/Gfunctions/short_term_ANN_corrections/burials.npy"))
-        self._alpha = np.load(FOLDER.joinpath(f"VariableClasses/Gfunctions/short_term_ANN_corrections/alpha.npy"))
-        self._radii = np.load(FOLDER.joinpath(f"VariableClasses/Gfunctions/short_term_ANN_corrections/radii.npy"))
+
+    @property
+    def model_weights(self) -> dict[int, list[NDArray[np.float64]]]:
+        """
+        This function returns the (read-only) weights of the ANN for every borefield shape.
+
+        Returns
+        -------
+        dict
+            Dictionary with the borefield shape as key and a list with the weights and biases of the layers as value
+        """
+        return _load_ann_model()['model_weights']
+
+    @property
+    def short_term_ann_correction(self) -> dict[str, NDArray[np.float64]]:
+        """
+        This function returns the (read-only) data for the short-term correction of the ANN.
+
+        Returns
+        -------
+        dict
+            Dictionary with the interpolation grid (depth, burials, alpha and radii) and the g-values (g_store)
+        """
+        return _load_ann_model()['short_term_ann_correction']
+
+    @property
+    def borehole_length_array(self) -> np.ndarray:
+        """
+        This function returns the sorted borehole lengths of the previously calculated g-values.
+
+        Returns
+        -------
+        np.ndarray
+            Borehole lengths [m]
+        """
+        return self._borehole_length_buffer[:self._size]
+
+    @borehole_length_array.setter
+    def borehole_length_array(self, borehole_length_array: ArrayLike) -> None:
+        self._borehole_length_buffer = np.array(borehole_length_array, dtype=np.float64).ravel()
+        self._size = self._borehole_length_buffer.size
+        self._interpolation_cache = None
+
+    @property
+    def previous_gfunctions(self) -> np.ndarray:
+        """
+        This function returns the previously calculated g-values. This is a 1D-array when there is only one borehole
+        length and a 2D-array (borehole length, time) otherwise.
+
+        Returns
+        -------
+        np.ndarray
+            Previously calculated g-values
+        """
+        gvalues = self._gvalues_buffer[:self._size]
+        if gvalues.shape[0] == 0:
+            return np.array([])
+        if gvalues.shape[0] == 1:
+            return gvalues[0]
+        return gvalues
+
+    @previous_gfunctions.setter
+    def previous_gfunctions(self, previous_gfunctions: ArrayLike) -> None:
+        previous_gfunctions = np.array(previous_gfunctions, dtype=np.float64)
+        if previous_gfunctions.size == 0:
+            previous_gfunctions = np.zeros((0, 0))
+        elif previous_gfunctions.ndim == 1:
+            previous_gfunctions = previous_gfunctions.reshape(1, -1)
+        self._gvalues_buffer = previous_gfunctions
+        self._interpolation_cache = None
 
     @property
     def store_previous_values(self) -> bool:
@@ -225,40 +294,9 @@ class GFunction:
             n_y = borefield_description["N_2"]
             b_x = borefield_description["B_1"]
             b_y = borefield_description["B_2"]
-            if not (50 <= H <= 400):
-                warnings.warn("Depth outside ANN limits!")
-            if not (0 <= D <= 4):
-                warnings.warn("Burial depth outside ANN limits!")
-            if not (1 <= n_x <= 30):
-                warnings.warn("N_1 outside ANN limits!")
-            if not (1 <= n_y <= 30):
-                warnings.warn("N_2 outside ANN limits!")
-            if not (2 <= b_x <= 10):
-                warnings.warn("B_1 outside ANN limits!")
-            if not (2 <= b_y <= 10):
-                warnings.warn("B_2 outside ANN limits!")
-            if not (0.05 <= r_b <= 0.15):
-                warnings.warn("r_b outside ANN limits!")
-            if not (0.25 / 1e6 < alpha < 2.67 / 1e6):
-                warnings.warn("alpha outside ANN limits!")
-            if not (0 <= borefield_description["type"] <= 5):
-                raise ValueError("type outside ANN limits!")
             input_data = np.array([n_x, n_y, b_x, b_y, H, D, r_b, alpha])
-            res = calc_network_using_numpy(input_data, self.model_weights[borefield_description["type"]],
-                                           self.normalize_vec)
-
-            # correct the first 24 hours with general interpolation, since the ANN model overestimates this
-            # for the parameter set of the ANN, there is no interference between neighbouring boreholes in the
-            # borefield at this short timescale.
-            try:
-                short_term_ann_correction = sc.interpolate.interpn(
-                    (self._depth, self._burials, self._alpha, self._radii),
-                    self._g_store, [[H, D, alpha, r_b]])
-
-                res[:12] = short_term_ann_correction[0]
-            except:
-                pass
-            return res
+            return self.calculate_with_neural_network_batch(input_data.reshape(1, 8),
+                                                            borefield_description["type"])[0]
 
         def gvalues(
                 time_values: np.ndarray,
@@ -310,8 +348,7 @@ class GFunction:
                 # chances are we are stuck in a loop, so calculate the gfunction and do not iterate
 
                 # calculate the g-values for uniform borehole wall temperature
-                gfunc_calculated = gt.gfunction.gFunction(borefield, alpha, time_values, options=self.options,
-                                                          method=self.options["method"]).gFunc
+                gfunc_calculated = self._calculate_with_pygfunction(time_values, borefield, alpha)
 
                 # store the calculated g-values
                 self.set_new_calculated_data(time_values, borehole_length, gfunc_calculated, borefield, alpha)
@@ -323,6 +360,9 @@ class GFunction:
             # store in fifo_list to make sure we are not stuck in iterations
             self.fifo_list.add(borehole_length)
 
+            # restore the previously calculated data of this borefield and alpha, if any
+            self._activate_cached_data(borefield, alpha)
+
             # check if previous borehole_length is close to current one
             # if so, returns previous gfunction data to speed up sizing convergence
             if np.abs(self.previous_borehole_length - borehole_length) < 1:
@@ -336,11 +376,13 @@ class GFunction:
 
             # if there are g-values calculated, return them
             if np.any(gfunc_interpolated):
+                self.cache_hits += 1
                 return gfunc_interpolated
+            if interpolate:
+                self.cache_misses += 1
 
             # calculate the g-values for uniform borehole wall temperature
-            gfunc_calculated = gt.gfunction.gFunction(borefield, alpha, time_values, options=self.options,
-                                                      method=self.options["method"]).gFunc
+            gfunc_calculated = self._calculate_with_pygfunction(time_values, borefield, alpha)
             if np.any(gfunc_calculated < 0):
                 warnings.warn("There are negative g-values. This can be caused by a large borehole radius.")
                 if self.use_cyl_correction_when_negative:
@@ -354,8 +396,7 @@ class GFunction:
                     backup = self.options.get("Cylindrical_correction")
 
                     self.options["cylindrical_correction"] = True
-                    gfunc_calculated = gt.gfunction.gFunction(borefield, alpha, time_values, options=self.options,
-                                                              method=self.options["method"]).gFunc
+                    gfunc_calculated = self._calculate_with_pygfunction(time_values, borefield, alpha)
                     self.options["cylindrical_correction"] = backup
 
             # store the calculated g-values
@@ -399,6 +440,132 @@ class GFunction:
 
         return gfunc_uniform_T
 
+    def calculate_with_neural_network_batch(self, configurations: ArrayLike,
+                                            shapes: Union[int, ArrayLike]) -> np.ndarray:
+        """
+        This function calculates the gfunctions of multiple borefield configurations at once using the trained ANN
+        (Blanke et al. ([#BlankeEtAl]_)). All the configurations with the same shape are evaluated in a single chain of
+        matrix multiplications and the short-term correction of the first 12 timesteps is interpolated for all
+        configurations in one go.
+
+        Parameters
+        ----------
+        configurations : ArrayLike
+            (N, 8) array with on every row N_1, N_2, B_1, B_2, H, D, r_b and alpha of a borefield configuration
+        shapes : int or ArrayLike
+            Shape of the borefields (either one shape for all the configurations or an array of length N),
+            where type 0: L, type 1: U, type 2: box, type 3: rectangle, type 4: staggered
+
+        Returns
+        -------
+        gvalues : np.ndarray
+            (N, 87) array with the gvalues for the default timesteps
+
+        Raises
+        ------
+        ValueError
+            When the configurations are not an (N, 8) array or when a shape is outside the ANN limits
+        """
+        configurations = np.atleast_2d(np.asarray(configurations, dtype=np.float64))
+        if configurations.ndim != 2 or configurations.shape[1] != 8:
+            raise ValueError("The configurations should be an (N, 8) array.")
+        shapes = np.broadcast_to(np.asarray(shapes), (configurations.shape[0],))
+        n_x, n_y, b_x, b_y, H, D, r_b, alpha = configurations.T
+
+        if np.any((H < 50) | (H > 400)):
+            warnings.warn("Depth outside ANN limits!")
+        if np.any((D < 0) | (D > 4)):
+            warnings.warn("Burial depth outside ANN limits!")
+        if np.any((n_x < 1) | (n_x > 30)):
+            warnings.warn("N_1 outside ANN limits!")
+        if np.any((n_y < 1) | (n_y > 30)):
+            warnings.warn("N_2 outside ANN limits!")
+        if np.any((b_x < 2) | (b_x > 10)):
+            warnings.warn("B_1 outside ANN limits!")
+        if np.any((b_y < 2) | (b_y > 10)):
+            warnings.warn("B_2 outside ANN limits!")
+        if np.any((r_b < 0.05) | (r_b > 0.15)):
+            warnings.warn("r_b outside ANN limits!")
+        if np.any((alpha <= 0.25 / 1e6) | (alpha >= 2.67 / 1e6)):
+            warnings.warn("alpha outside ANN limits!")
+        if np.any((shapes < 0) | (shapes > 5)):
+            raise ValueError("type outside ANN limits!")
+
+        res = np.empty((configurations.shape[0], GFunction.DEFAULT_NUMBER_OF_TIMESTEPS))
+        for shape in np.unique(shapes):
+            mask = shapes == shape
+            res[mask] = calc_network_using_numpy_batch(configurations[mask], self.model_weights[int(shape)],
+                                                       self.normalize_vec)
+
+        # correct the first 12 timesteps with general interpolation, since the ANN model overestimates this
+        # for the parameter set of the ANN, there is no interference between neighbouring boreholes in the
+        # borefield at this short timescale.
+        # configurations outside the interpolation grid are not corrected
+        correction_data = self.short_term_ann_correction
+        short_term_ann_correction = sc.interpolate.interpn(
+            (correction_data['depth'], correction_data['burials'], correction_data['alpha'], correction_data['radii']),
+            correction_data['g_store'], np.column_stack((H, D, alpha, r_b)), bounds_error=False, fill_value=np.nan)
+        within_grid = ~np.any(np.isnan(short_term_ann_correction), axis=1)
+        res[within_grid, :12] = short_term_ann_correction[within_grid]
+        return res
+
+    def _calculate_with_pygfunction(self, time_values: np.ndarray, borefield: gt.borefield.Borefield,
+                                    alpha: float) -> np.ndarray:
+        """
+        This function calculates the gvalues with pygfunction. When a disk cache is set, the gvalues are first looked
+        up in this cache and newly calculated gvalues are stored in it.
+
+        Parameters
+        ----------
+        time_values : np.ndarray
+            Array with all the time values [s] for which gvalues should be calculated
+        borefield : pygfunction.borefield.Borefield
+            Borefield model for which the gvalues should be calculated
+        alpha : float
+            Thermal diffusivity of the ground [m2/s]
+
+        Returns
+        -------
+        gvalues : np.ndarray
+            1D array with all the requested gvalues
+        """
+        if self.disk_cache is None:
+            return gt.gfunction.gFunction(borefield, alpha, time_values, options=self.options,
+                                          method=self.options["method"]).gFunc
+
+        key = GFunctionDiskCache.key(borefield, alpha, time_values, self.options)
+        gvalues = self.disk_cache.get(key)
+        if gvalues is None:
+            gvalues = gt.gfunction.gFunction(borefield, alpha, time_values, options=self.options,
+                                             method=self.options["method"]).gFunc
+            self.disk_cache.put(key, gvalues)
+        return gvalues
+
+    def set_disk_cache(self, directory: str = None, max_size: float = None) -> None:
+        """
+        This function sets the persistent disk cache for the g-values calculated with pygfunction.
+        The cache is only recreated when the directory or the maximum size changes.
+
+        Parameters
+        ----------
+        directory : str
+            Directory of the cache. If None, no disk cache is used.
+        max_size : float
+            Maximum size of the cache [MB]. If None, the default size is taken.
+
+        Returns
+        -------
+        None
+        """
+        if directory is None:
+            self.disk_cache = None
+            return
+        max_size = max_size if max_size is not None else GFunctionDiskCache.DEFAULT_MAX_SIZE
+        if self.disk_cache is not None and self.disk_cache.directory == os.fspath(directory) and \
+                self.disk_cache.max_size == max_size:
+            return
+        self.disk_cache = GFunctionDiskCache(directory, max_size)
+
     def interpolate_gfunctions(self, time_value: Union[list, float, np.ndarray], borehole_length: float,
                                alpha: float, borefield: List[gt.boreholes.Borehole]) -> np.ndarray:
         """
@@ -421,6 +588,7 @@ class GFunction:
         gvalues : np.ndarray
             1D array with all the requested gvalues
         """
+        time_value = np.atleast_1d(np.asarray(time_value, dtype=np.float64))
         gvalues: np.ndarray = np.zeros(len(time_value))
 
         # check if interpolation is possible:
@@ -440,16 +608,22 @@ class GFunction:
             if idx_prev is None or idx_next is None:
                 return gvalues
 
-            # do interpolation
-            if self.borehole_length_array.size == 1:
-                gvalues = interpolate.interpn([self.time_array], self.previous_gfunctions, time_value)
+            # linear interpolation between the g-values of the two enclosing borehole lengths
+            if idx_prev == idx_next:
+                # copy, since the rows of the buffer are shifted when new borehole lengths are stored
+                gvalues_length = self._gvalues_buffer[idx_prev].copy()
             else:
-                gvalues = interpolate.interpn(
-                    (self.borehole_length_array, self.time_array), self.previous_gfunctions,
-                    np.array([[borehole_length, t] for t in time_value])
-                )
-
-            return gvalues
+                weight = (borehole_length - self.borehole_length_array[idx_prev]) / \
+                         (self.borehole_length_array[idx_next] - self.borehole_length_array[idx_prev])
+                gvalues_length = self._gvalues_buffer[idx_prev] * (1 - weight) + \
+                                 self._gvalues_buffer[idx_next] * weight
+
+            # linear interpolation in time
+            if time_value is self.time_array or np.array_equal(time_value, self.time_array):
+                return gvalues_length
+            indices, weights, self._interpolation_cache = _time_weights(self.time_array, time_value,
+                                                                        self._interpolation_cache)
+            return gvalues_length[indices] * (1 - weights) + gvalues_length[indices + 1] * weights
 
         # when extrapolation is permitted
         # not yet implemented
@@ -458,12 +632,12 @@ class GFunction:
     @staticmethod
     def _nearest_value(array: np.ndarray, value: float) -> Tuple[int, int]:
         """
-        This function searches the nearest value and index in an array.
+        This function searches the nearest value and index in a sorted array.
 
         Parameters
         ----------
         array : np.ndarray
-            Array in which the value should be searched
+            Sorted array in which the value should be searched
         value : float
             Value to be searched for
 
@@ -473,7 +647,10 @@ class GFunction:
         """
         if not np.any(array):
             return False
-        idx = (np.abs(array - value)).argmin()
+        idx = np.searchsorted(array, value)
+        # the nearest value is either the one at the left or at the right of the insertion point
+        if idx == array.size or (idx > 0 and value - array[idx - 1] <= array[idx] - value):
+            idx -= 1
         return array[idx], idx
 
     def _get_nearest_borehole_length_index(self, borehole_length: float) -> Tuple[int, int]:
@@ -597,6 +774,117 @@ class GFunction:
         # replace options
         self.options = options
 
+    def _cache_key(self, borefield: gt.borefield.Borefield, alpha: float) -> tuple:
+        """
+        This function returns the key under which the previously calculated data of a borefield is cached.
+        Just like in _check_borefield, the borehole length is neglected.
+
+        Parameters
+        ----------
+        borefield : pygfunction.borefield.Borefield
+            Borefield model
+        alpha : float
+            Thermal diffusivity of the ground [m2/s]
+
+        Returns
+        -------
+        tuple
+            Key of the cache
+        """
+        geometry = np.array([[borehole.D, borehole.r_b, borehole.x, borehole.y, borehole.tilt, borehole.orientation]
+                             for borehole in borefield], dtype=np.float64)
+        return geometry.tobytes(), float(alpha), repr(sorted(self.options.items()))
+
+    @staticmethod
+    def _cache_entry_size(entry: tuple) -> int:
+        """
+        This function returns the memory size of a cache entry.
+
+        Parameters
+        ----------
+        entry : tuple
+            Cache entry (borehole_length_array, time_array, previous_gfunctions, borefield, alpha)
+
+        Returns
+        -------
+        int
+            Size [bytes]
+        """
+        return entry[0].nbytes + entry[1].nbytes + entry[2].nbytes
+
+    def _store_in_cache(self) -> None:
+        """
+        This function moves the current previously calculated data to the cache, so it can be restored when the
+        same borefield and alpha are used again. When the cache exceeds its maximum number of entries or its
+        memory budget, the least recently used entries are removed.
+
+        Returns
+        -------
+        None
+        """
+        if self.previous_gfunctions.size == 0 or not self.borefield or self.alpha == 0:
+            return
+        key = self._cache_key(self.borefield, self.alpha)
+        # copies without the spare capacity of the buffers
+        self._cache[key] = (self.borehole_length_array.copy(), self.time_array, self.previous_gfunctions.copy(),
+                            self.borefield, self.alpha)
+        self._cache.move_to_end(key)
+
+        while len(self._cache) > self.max_cache_entries or \
+                sum(map(self._cache_entry_size, self._cache.values())) > self.max_cache_memory * 1e6:
+            self._cache.popitem(last=False)
+
+    def _activate_cached_data(self, borefield: gt.borefield.Borefield, alpha: float) -> None:
+        """
+        This function restores the cached data of a borefield and alpha, when this is not the current data.
+
+        Parameters
+        ----------
+        borefield : pygfunction.borefield.Borefield
+            Borefield model
+        alpha : float
+            Thermal diffusivity of the ground [m2/s]
+
+        Returns
+        -------
+        None
+        """
+        if self._check_alpha(alpha) and self._check_borefield(borefield):
+            return
+        key = self._cache_key(borefield, alpha)
+        if key not in self._cache:
+            return
+        self.cache_previous_data()
+        self.borehole_length_array, self.time_array, self.previous_gfunctions, self.borefield, self.alpha = \
+            self._cache.pop(key)
+
+    def cache_previous_data(self) -> None:
+        """
+        This function moves the previously calculated data to the cache and removes it as the current data.
+        This should be used instead of remove_previous_data when the borefield or alpha changes, but the data can still
+        be reused later on.
+
+        Returns
+        -------
+        None
+        """
+        self._store_in_cache()
+        self.remove_previous_data()
+
+    def clear_cache(self) -> None:
+        """
+        This function removes all the previously calculated data, including the cached data of other borefields,
+        and resets the hit and miss counters.
+
+        Returns
+        -------
+        None
+        """
+        self.remove_previous_data()
+        self._cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
     def remove_previous_data(self) -> None:
         """
         This function removes the previous calculated data by setting the borehole_length_array, time_array and
@@ -691,32 +979,52 @@ class GFunction:
 
         # check if the previous stored data should be removed
         if check_if_data_should_removed():
-            self.remove_previous_data()
-
-        nearest_idx = 0
-
-        if np.any(self.previous_gfunctions):
-            nearest_val, nearest_idx = self._nearest_value(self.borehole_length_array, borehole_length)
-            if self.borehole_length_array[nearest_idx] < borehole_length:
-                nearest_idx += 1
-
-        # insert data in stored data
-        if self.borehole_length_array.size == 1:
-            # self.previous_gfunctions should be converted to a 2D-array
-            if self.borehole_length_array[0] > borehole_length:
-                self.previous_gfunctions = np.vstack((gvalues, self.previous_gfunctions))
-            else:
-                self.previous_gfunctions = np.vstack((self.previous_gfunctions, gvalues))
-        else:
-            self.previous_gfunctions = np.insert(self.previous_gfunctions, nearest_idx, gvalues, 0)
+            self.cache_previous_data()
 
-        self.borehole_length_array = np.insert(self.borehole_length_array, nearest_idx, borehole_length)
+        self._insert(borehole_length, gvalues)
         self.time_array = time_values
         self.borefield = borefield
         self.alpha = alpha
 
         return True
 
+    def _insert(self, borehole_length: float, gvalues: np.ndarray) -> None:
+        """
+        This function inserts g-values in the sorted buffers of previously calculated data.
+        When the buffers are full, their capacity is doubled, so the data is not copied on every insert.
+
+        Parameters
+        ----------
+        borehole_length : float
+            Borehole length [m]
+        gvalues : np.ndarray
+            g-values for this borehole length
+
+        Returns
+        -------
+        None
+        """
+        size = self._size
+        if size == 0 or self._gvalues_buffer.shape[1] != gvalues.size:
+            # start from empty buffers
+            size = 0
+            self._borehole_length_buffer, self._gvalues_buffer = np.empty(4), np.empty((4, gvalues.size))
+        elif size >= self._borehole_length_buffer.size or size >= self._gvalues_buffer.shape[0]:
+            borehole_length_buffer = np.empty(2 * size)
+            borehole_length_buffer[:size] = self._borehole_length_buffer[:size]
+            gvalues_buffer = np.empty((2 * size, gvalues.size))
+            gvalues_buffer[:size] = self._gvalues_buffer[:size]
+            self._borehole_length_buffer, self._gvalues_buffer = borehole_length_buffer, gvalues_buffer
+
+        idx = np.searchsorted(self._borehole_length_buffer[:size], borehole_length)
+        # shift the larger borehole lengths one place to make room
+        self._borehole_length_buffer[idx + 1:size + 1] = self._borehole_length_buffer[idx:size]
+        self._gvalues_buffer[idx + 1:size + 1] = self._gvalues_buffer[idx:size]
+        self._borehole_length_buffer[idx] = borehole_length
+        self._gvalues_buffer[idx] = gvalues
+        self._size = size + 1
+        self._interpolation_cache = None
+
     def _check_borefield(self, borefield: gt.borefield.Borefield) -> bool:
         """
         This function checks whether the new borefield object is equal to the previous one.
@@ -734,6 +1042,8 @@ class GFunction:
         True
             True if the borefields are the same, False otherwise
         """
+        if self.borefield is None:
+            return False
         # borefields are unequal if they have different number of boreholes
         if len(borefield) != len(self.borefield):
             return False
@@ -772,10 +1082,43 @@ class GFunction:
         return True
 
 
+_ANN_MODEL: dict = None
+
+
+def _load_ann_model() -> dict:
+    """
+    This function loads the weights of the ANN and the data for the short-term correction from the ann_model.npz
+    bundle. The data is only loaded once per process and the arrays are read-only, so they can be shared between
+    all the GFunction objects (and their copies).
+
+    Returns
+    -------
+    dict
+        Dictionary with the model_weights and the short_term_ann_correction
+    """
+    global _ANN_MODEL
+    if _ANN_MODEL is None:
+        from GHEtool import FOLDER
+        with np.load(FOLDER.joinpath("VariableClasses/Gfunctions/ANN_layers/ann_model.npz")) as data:
+            arrays = {key: data[key] for key in data.files}
+        for array in arrays.values():
+            array.flags.writeable = False
+        _ANN_MODEL = {
+            'model_weights': {i: [arrays[f'shape_{i}_weight_{j}'] for j in range(6)] for i in range(5)},
+            'short_term_ann_correction': {key: arrays[key] for key in ('g_store', 'depth', 'burials', 'alpha', 'radii')}
+        }
+    return _ANN_MODEL
+
+
 def calc_network_using_numpy(input_data: NDArray[np.float64], model_weights: list[NDArray[np.float64]],
                              normalize_vec: NDArray[np.float64]) -> NDArray[np.float64]:
-    input_data = (input_data * normalize_vec).reshape(8, 1)
-    res = np.maximum(0, model_weights[0].T.dot(input_data) + model_weights[1])
-    res = np.maximum(0, model_weights[2].T.dot(res) + model_weights[3])
-    res = np.maximum(0, model_weights[4].T.dot(res) + model_weights[5])
-    return np.cumsum(res, axis=0).reshape(87)
+    return calc_network_using_numpy_batch(input_data.reshape(1, 8), model_weights, normalize_vec)[0]
+
+
+def calc_network_using_numpy_batch(input_data: NDArray[np.float64], model_weights: list[NDArray[np.float64]],
+                                   normalize_vec: NDArray[np.float64]) -> NDArray[np.float64]:
+    res = input_data * normalize_vec
+    res = np.maximum(0, res.dot(model_weights[0]) + model_weights[1].T)
+    res = np.maximum(0, res.dot(model_weights[2]) + model_weights[3].T)
+    res = np.maximum(0, res.dot(model_weights[4]) + model_weights[5].T)
+    return np.cumsum(res, axis=1)
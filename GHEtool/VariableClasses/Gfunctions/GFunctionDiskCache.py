@@ -0,0 +1,176 @@
+"""
+This document contains the GFunctionDiskCache class.
+This class stores calculated g-values on disk, so they can be reused between different processes and sessions.
+"""
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+import pygfunction as gt
+
+
+class GFunctionDiskCache:
+    """
+    This class is a persistent, content-addressed cache for g-values calculated with pygfunction.
+    Every entry is stored as a separate .npy file of which the name is the hash of the borefield geometry,
+    the ground thermal diffusivity, the pygfunction options and the time values.
+
+    Entries are written to a temporary file that is renamed afterwards, so concurrent readers never see a partially
+    written file. When the total size of the cache exceeds the maximum size, the least recently used entries
+    (based on the modification time, which is updated on every hit) are removed.
+    """
+
+    DEFAULT_MAX_SIZE: float = 100.  # MB
+    EXTENSION: str = '.npy'
+
+    def __init__(self, directory: str, max_size: float = None):
+        """
+
+        Parameters
+        ----------
+        directory : str
+            Directory in which the g-values are stored. It is created if it does not exist yet.
+        max_size : float
+            Maximum size of the cache [MB]
+        """
+        self.directory: str = os.fspath(directory)
+        self.max_size: float = max_size if max_size is not None else GFunctionDiskCache.DEFAULT_MAX_SIZE
+        self.hits: int = 0
+        self.misses: int = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(borefield: gt.borefield.Borefield, alpha: float, time_values: np.ndarray, options: dict) -> str:
+        """
+        This function returns a canonical hash for a g-function calculation.
+
+        Parameters
+        ----------
+        borefield : pygfunction.borefield.Borefield
+            Borefield model for which the gvalues are calculated
+        alpha : float
+            Thermal diffusivity of the ground [m2/s]
+        time_values : np.ndarray
+            Array with all the time values [s] for which gvalues are calculated
+        options : dict
+            Options for the gFunction class of pygfunction (including the method)
+
+        Returns
+        -------
+        str
+            Hexadecimal hash
+        """
+        geometry = np.array([[borehole.H, borehole.D, borehole.r_b, borehole.x, borehole.y, borehole.tilt,
+                              borehole.orientation] for borehole in borefield], dtype=np.float64)
+        sha = hashlib.sha256()
+        # rounding makes the hash insensitive to floating point noise in the geometry
+        sha.update(np.round(geometry, 9).tobytes())
+        sha.update(np.float64(alpha).tobytes())
+        sha.update(np.round(np.asarray(time_values, dtype=np.float64), 6).tobytes())
+        sha.update(repr(sorted((str(key), repr(value)) for key, value in options.items())).encode())
+        return sha.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + GFunctionDiskCache.EXTENSION)
+
+    def get(self, key: str) -> np.ndarray:
+        """
+        This function returns the stored g-values for a certain key.
+
+        Parameters
+        ----------
+        key : str
+            Hash of the g-function calculation
+
+        Returns
+        -------
+        np.ndarray
+            Stored g-values, or None if there is no entry for this key
+        """
+        path = self._path(key)
+        try:
+            gvalues = np.load(path, allow_pickle=False)
+            # mark as recently used
+            os.utime(path)
+        except (OSError, ValueError, EOFError):
+            # the entry does not exist, or has been removed by another process in the meantime
+            self.misses += 1
+            return None
+        self.hits += 1
+        return gvalues
+
+    def put(self, key: str, gvalues: np.ndarray) -> None:
+        """
+        This function stores g-values under a certain key and removes the least recently used entries when the
+        cache is too large.
+
+        Parameters
+        ----------
+        key : str
+            Hash of the g-function calculation
+        gvalues : np.ndarray
+            Calculated g-values
+
+        Returns
+        -------
+        None
+        """
+        file, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(file, 'wb') as f:
+                np.save(f, np.asarray(gvalues, dtype=np.float64))
+            # the rename is atomic, so readers see either the complete file or no file
+            os.replace(temp_path, self._path(key))
+        except OSError:  # pragma: no cover
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        This function removes the least recently used entries until the cache is smaller than its maximum size.
+
+        Returns
+        -------
+        None
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(GFunctionDiskCache.EXTENSION):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:  # pragma: no cover
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size * 1e6:
+                break
+            try:
+                os.remove(path)
+            except OSError:  # pragma: no cover
+                # already removed by another process
+                pass
+            total_size -= size
+
+    def clear(self) -> None:
+        """
+        This function removes all the entries of the cache.
+
+        Returns
+        -------
+        None
+        """
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(GFunctionDiskCache.EXTENSION):
+                try:
+                    os.remove(entry.path)
+                except OSError:  # pragma: no cover
+                    pass
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,178 @@
+"""
+This document contains the GFunctionLibrary class.
+This class indexes a directory with precalculated custom g-function datasets, so the dataset that matches a certain
+borefield can be found and used automatically.
+"""
+import json
+import os
+from typing import Union
+
+import numpy as np
+import pygfunction as gt
+
+from .CustomGFunction import CustomGFunction, geometry_hash, load_custom_gfunction, read_custom_gfunction_header
+
+
+class GFunctionLibrary:
+    """
+    This class is an index of a directory with custom g-function datasets in the binary format of
+    CustomGFunction.dump_custom_dataset. Only the headers and grids of the datasets are read to build the index.
+    The g-values themselves are memory-mapped when a dataset is used for the first time.
+
+    A dataset matches a request when it is created for the same borefield geometry (neglecting the borehole length)
+    and the same options, when its grids cover the requested borehole length and time values, and when its ground
+    thermal diffusivity is within a relative tolerance of the requested one. When multiple datasets match, the one
+    with the nearest ground thermal diffusivity is used.
+    The index is rebuilt automatically when the content of the directory changes.
+    """
+
+    DEFAULT_ALPHA_RTOL: float = 0.001
+    EXTENSION: str = '.gvalues'
+    # options of pygfunction that do not influence the g-values
+    IGNORED_OPTIONS: tuple = ('display', 'disp')
+
+    def __init__(self, directory: str, alpha_rtol: float = None):
+        """
+
+        Parameters
+        ----------
+        directory : str
+            Directory with the custom g-function datasets
+        alpha_rtol : float
+            Maximum relative difference between the requested ground thermal diffusivity and the one of the dataset
+        """
+        self.directory: str = os.fspath(directory)
+        self.alpha_rtol: float = alpha_rtol if alpha_rtol is not None else GFunctionLibrary.DEFAULT_ALPHA_RTOL
+        self.hits: int = 0
+        self.misses: int = 0
+
+        # geometry hash: list of headers of the datasets
+        self._index: dict = {}
+        # path: loaded dataset
+        self._datasets: dict = {}
+        self._directory_mtime: float = None
+
+    @staticmethod
+    def _normalise_options(options: dict) -> dict:
+        """
+        This function returns the options in the form in which they are stored in the header of a dataset,
+        without the options that do not influence the g-values.
+
+        Parameters
+        ----------
+        options : dict
+            Options for the gFunction class of pygfunction
+
+        Returns
+        -------
+        dict
+            Normalised options
+        """
+        options = json.loads(json.dumps(options, default=repr))
+        options.setdefault('method', 'equivalent')
+        for key in GFunctionLibrary.IGNORED_OPTIONS:
+            options.pop(key, None)
+        return options
+
+    def refresh(self) -> None:
+        """
+        This function rebuilds the index of the datasets in the directory.
+        Files that are not in the binary format or that cannot be read are skipped.
+
+        Returns
+        -------
+        None
+        """
+        self._index = {}
+        self._datasets = {}
+        try:
+            self._directory_mtime = os.stat(self.directory).st_mtime_ns
+            entries = sorted(os.scandir(self.directory), key=lambda entry: entry.name)
+        except OSError:
+            return
+
+        for entry in entries:
+            if not entry.name.endswith(GFunctionLibrary.EXTENSION):
+                continue
+            try:
+                header = read_custom_gfunction_header(entry.path)
+                if header is None or header.get('geometry_hash') is None:
+                    # datasets stored with pickle do not have a header
+                    continue
+                n_t, n_H = header['time_array_size'], header['borehole_length_array_size']
+                grids = np.fromfile(entry.path, dtype='<f8', count=n_t + n_H, offset=header['offset'])
+            except (OSError, ValueError, KeyError):
+                continue
+            header['path'] = entry.path
+            header['time_array'] = grids[:n_t]
+            header['borehole_length_array'] = grids[n_t:]
+            header['alpha'] = np.array(header['alpha'], dtype=np.float64)
+            header['options'] = self._normalise_options(header['options'])
+            self._index.setdefault(header['geometry_hash'], []).append(header)
+
+    def _check_directory(self) -> None:
+        """
+        This function rebuilds the index when the content of the directory has changed.
+
+        Returns
+        -------
+        None
+        """
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._directory_mtime is None or mtime != self._directory_mtime:
+            self.refresh()
+
+    def find(self, borefield: gt.borefield.Borefield, alpha: Union[float, callable], options: dict,
+             time_value: Union[list, float, np.ndarray],
+             borehole_length: Union[float, np.ndarray]) -> CustomGFunction:
+        """
+        This function returns the dataset that can be used for a certain borefield, ground thermal diffusivity,
+        options, time values and borehole length.
+
+        Parameters
+        ----------
+        borefield : pygfunction.borefield.Borefield
+            Borefield object
+        alpha : float or callable
+            Ground thermal diffusivity [m2/s] or function to calculate it at a certain borehole length
+        options : dict
+            Options for the gFunction class of pygfunction
+        time_value : list, float, np.ndarray
+            Time value(s) in seconds at which the gfunctions should be calculated
+        borehole_length : float or np.ndarray
+            Borehole length(s) [m] at which the gfunctions should be calculated
+
+        Returns
+        -------
+        CustomGFunction
+            Matching dataset, or None when there is no matching dataset
+        """
+        self._check_directory()
+        entries = self._index.get(geometry_hash(borefield), [])
+        options = self._normalise_options(options)
+        min_time, max_time = np.min(time_value), np.max(time_value)
+        min_length, max_length = np.min(borehole_length), np.max(borehole_length)
+
+        best, best_deviation = None, np.inf
+        for entry in entries:
+            lengths, times = entry['borehole_length_array'], entry['time_array']
+            if lengths.size < 2 or entry['alpha'].size != lengths.size or entry['options'] != options:
+                continue
+            if not (lengths[0] <= min_length and max_length <= lengths[-1] and
+                    times[0] <= min_time and max_time <= times[-1]):
+                continue
+            requested = CustomGFunction._ground_thermal_diffusivities(borefield, alpha, lengths)
+            deviation = np.max(np.abs(entry['alpha'] - requested) / requested)
+            if deviation <= self.alpha_rtol and deviation < best_deviation:
+                best, best_deviation = entry, deviation
+
+        if best is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if best['path'] not in self._datasets:
+            self._datasets[best['path']] = load_custom_gfunction(best['path'])
+        return self._datasets[best['path']]
@@ -1,2 +1,3 @@
 from .GFunction import *
 from .CustomGFunction import *
+from .GFunctionLibrary import GFunctionLibrary
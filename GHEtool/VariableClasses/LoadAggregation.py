@@ -0,0 +1,109 @@
+"""
+This document contains the LoadAggregation class.
+This class is used to calculate the hourly (L4) temperature profile with the load aggregation scheme of
+Claesson and Javed, so that long simulation periods do not require a g-value for every single hour.
+"""
+import numpy as np
+import pygfunction as gt
+from scipy.signal import lfilter
+
+
+class LoadAggregation:
+    """
+    This class convolves an hourly load with the step response of the borefield using the load aggregation
+    algorithm of Claesson and Javed [#ClaessonJaved2012]_.
+
+    The past loads are aggregated in cells of which the width doubles every cells_per_level cells. Shifting the
+    aggregated loads by one time step is a first-order recursive filter for every cell, with the (aggregated) load of
+    the previous cell as input. The whole simulation period is therefore calculated one cell at a time, which results
+    in a computational cost of O(n * number of cells) and only requires the g-values at the (few) aggregation times.
+
+    References
+    ----------
+    .. [#ClaessonJaved2012] Claesson, J., & Javed, S. (2012). A
+       load-aggregation method to calculate extraction temperatures of
+       borehole heat exchangers. ASHRAE Transactions, 118 (1): 530–539.
+    """
+
+    DEFAULT_CELLS_PER_LEVEL: int = 5
+
+    def __init__(self, cells_per_level: int = None, dt: float = 3600.):
+        """
+
+        Parameters
+        ----------
+        cells_per_level : int
+            Number of aggregation cells per level. The cell widths double every cells_per_level cells.
+        dt : float
+            Time step of the load [s]
+        """
+        self.cells_per_level: int = cells_per_level if cells_per_level is not None else \
+            LoadAggregation.DEFAULT_CELLS_PER_LEVEL
+        self.dt: float = dt
+
+        self._number_of_timesteps: int = 0
+        self._times: np.ndarray = np.array([])
+        self._widths: np.ndarray = np.array([])
+
+    def get_times(self, number_of_timesteps: int) -> np.ndarray:
+        """
+        This function returns the times at which the g-values are needed for a load with a certain number of
+        time steps.
+
+        Parameters
+        ----------
+        number_of_timesteps : int
+            Number of time steps in the load
+
+        Returns
+        -------
+        np.ndarray
+            Aggregation times [s]
+        """
+        if number_of_timesteps != self._number_of_timesteps:
+            self._times = gt.load_aggregation.ClaessonJaved(
+                self.dt, number_of_timesteps * self.dt,
+                cells_per_level=self.cells_per_level).get_times_for_simulation()
+            self._widths = np.hstack((1, np.diff(self._times) / self.dt))
+            self._number_of_timesteps = number_of_timesteps
+        return self._times
+
+    def convolve(self, load: np.ndarray, g_values: np.ndarray, number_of_timesteps: int = None) -> np.ndarray:
+        """
+        This function returns the temporal superposition of the load with the g-values.
+        This is an approximation of the convolution of the load with the hourly g-value differences.
+
+        Parameters
+        ----------
+        load : np.ndarray
+            Load array [W]
+        g_values : np.ndarray
+            g-values at the aggregation times of get_times(number_of_timesteps)
+        number_of_timesteps : int
+            Number of time steps for which the aggregation times are determined. If None, the length of the load is
+            taken. Since the response at a certain time step only depends on the past loads, a load that is shorter than
+            number_of_timesteps gives the first values of the response to the longer load.
+
+        Returns
+        -------
+        np.ndarray
+            Convolved response, with the same length as the load
+
+        Raises
+        ------
+        ValueError
+            When the number of g-values does not match the number of aggregation times
+        """
+        times = self.get_times(number_of_timesteps if number_of_timesteps is not None else len(load))
+        if len(g_values) != len(times):
+            raise ValueError(f'{len(times)} g-values are needed for the load aggregation, '
+                             f'but {len(g_values)} are given.')
+        g_value_differences = np.diff(g_values, prepend=0)
+
+        aggregated_load = np.asarray(load, dtype=float)
+        result = g_value_differences[0] * aggregated_load
+        for width, g_value_difference in zip(self._widths[1:], g_value_differences[1:]):
+            # q_k(t) = (1 - 1 / w_k) q_k(t - 1) + q_k-1(t - 1) / w_k
+            aggregated_load = lfilter([0, 1 / width], [1, 1 / width - 1], aggregated_load)
+            result += g_value_difference * aggregated_load
+        return result
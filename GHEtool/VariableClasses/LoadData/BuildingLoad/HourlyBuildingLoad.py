@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
@@ -12,6 +11,7 @@ from GHEtool.VariableClasses.Efficiency import *
 from GHEtool.VariableClasses.LoadData.Baseclasses import _SingleYear, _HourlyDataBuilding
 
 if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
     from numpy.typing import ArrayLike
 
 
@@ -361,6 +361,8 @@ class HourlyBuildingLoad(_SingleYear, _HourlyDataBuilding):
         cooling = self.hourly_cooling_load.copy()
         cooling[::-1].sort()
         cooling = cooling * (-1)
+        import matplotlib.pyplot as plt
+
         # create new figure and axes if it not already exits otherwise clear it.
         fig = plt.figure()
         ax = fig.add_subplot(111)
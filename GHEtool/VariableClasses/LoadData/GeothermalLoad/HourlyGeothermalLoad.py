@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
@@ -11,6 +10,7 @@ from typing import Tuple, TYPE_CHECKING
 from GHEtool.VariableClasses.LoadData.Baseclasses import _SingleYear, _HourlyData
 
 if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
     from numpy.typing import ArrayLike
 
 
@@ -320,6 +320,8 @@ class HourlyGeothermalLoad(_SingleYear, _HourlyData):
         injection = self.hourly_injection_load.copy()
         injection[::-1].sort()
         injection = injection * (-1)
+        import matplotlib.pyplot as plt
+
         # create new figure and axes if it not already exits otherwise clear it.
         fig = plt.figure()
         ax = fig.add_subplot(111)
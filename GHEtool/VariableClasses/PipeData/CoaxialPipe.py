@@ -1,7 +1,7 @@
 import numpy as np
 import pygfunction as gt
-import matplotlib.pyplot as plt
 from math import pi
+from typing import Union
 
 from GHEtool.utils.calculate_friction_factor import *
 from GHEtool.VariableClasses.PipeData._PipeData import _PipeData
@@ -190,35 +190,46 @@ class CoaxialPipe(_PipeData):
         # Coaxial GHE in borehole
         self.R_fp = R_p_out + Rfout
 
-    def explicit_model_borehole_resistance(self, fluid_data: _FluidData, flow_rate_data: _FlowData, k_s: float,
-                                           borehole: gt.boreholes.Borehole, R_p: float = None,
-                                           **kwargs) -> float:
+    def explicit_model_borehole_resistance(self, fluid_data: _FluidData, flow_rate_data: _FlowData,
+                                           k_s: Union[float, np.ndarray], borehole: gt.boreholes.Borehole = None,
+                                           R_p: float = None, r_b: Union[float, np.ndarray] = None,
+                                           borehole_length: Union[float, np.ndarray] = None,
+                                           **kwargs) -> Union[float, np.ndarray]:
         """
         This function calculates the borehole thermal resistance for a coaxial pipe using a simplified 1D
         resistance network model [#Grundmann]_.
 
+        All the inputs (the flow rate and temperature in the kwargs, the ground thermal conductivity, the borehole
+        radius and the borehole length) can be arrays, which are broadcast against each other.
+
         Parameters
         ----------
         fluid_data : FluidData
             Fluid data
         flow_rate_data : FlowData
             Flow rate data
-        k_s : float
+        k_s : float or np.ndarray
             Ground thermal conductivity
         borehole : Borehole
-            Borehole object
+            Borehole object (only needed when r_b or borehole_length is not given)
         R_p : float
             Pipe thermal resistance [mK/W], when this is not given, it is calculated explicitly.
+        r_b : float or np.ndarray
+            Borehole radius [m], when this is not given, the radius of the borehole object is used.
+        borehole_length : float or np.ndarray
+            Borehole length [m], when this is not given, the length of the borehole object is used.
 
         Returns
         -------
-        float
+        float or np.ndarray
             Effective borehole thermal resistance [mK/W]
 
         References
         ----------
         .. [#Grundmann] Grundmann, Rachel Marie. "Improved design methods for ground heat exchangers." Master's thesis, Oklahoma State University, 2016.
         """
+        radius = borehole.r_b if r_b is None else np.asarray(r_b, dtype=np.float64)
+        borehole_length = borehole.H if borehole_length is None else np.asarray(borehole_length, dtype=np.float64)
 
         # Pipe thermal resistances [m.K/W]
         # Inner pipe
@@ -230,14 +241,17 @@ class CoaxialPipe(_PipeData):
 
         R_conv_inner, R_conv_outer = self.calculate_convective_resistance(flow_rate_data, fluid_data, **kwargs)
 
-        R_cond_grout = np.log(borehole.r_b / self.r_out_out) / (2 * pi * self.k_g)
+        R_cond_grout = np.log(radius / self.r_out_out) / (2 * pi * self.k_g)
 
         r_a = R_conv_inner + R_p_in
         r_b = R_conv_outer + R_p_out + R_cond_grout
 
-        rv = borehole.H / (flow_rate_data.mfr_borehole(**kwargs, fluid_data=fluid_data) * fluid_data.cp(**kwargs))
+        rv = borehole_length / (
+                flow_rate_data.mfr_borehole(**kwargs, fluid_data=fluid_data) * fluid_data.cp(**kwargs))
         n = rv / (2 * r_b) * (1 + 4 * r_b / r_a) ** (1 / 2)
-        return r_b * n * np.cosh(n) / np.sinh(n)
+        # the resistance network does not depend on the ground thermal conductivity, but the result has its shape
+        result = np.broadcast_to(r_b * n * np.cosh(n) / np.sinh(n), np.broadcast_shapes(np.shape(n), np.shape(k_s)))
+        return np.array(result) if np.ndim(result) else float(result)
 
     def pipe_model(self, k_s: float, borehole: gt.boreholes.Borehole) -> gt.pipes._BasePipe:
         """
@@ -344,6 +358,8 @@ class CoaxialPipe(_PipeData):
         -------
         None
         """
+        import matplotlib.pyplot as plt
+
         # borehole
         borehole = gt.boreholes.Borehole(100, 1, r_b, 0, 0)
         if self.R_ff == 0:
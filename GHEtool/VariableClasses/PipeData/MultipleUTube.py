@@ -3,9 +3,9 @@ import math
 
 import numpy as np
 import pygfunction as gt
-import matplotlib.pyplot as plt
 
 from math import pi
+from typing import Union
 
 from GHEtool.utils.calculate_friction_factor import *
 from GHEtool.VariableClasses.PipeData._PipeData import _PipeData
@@ -202,6 +202,7 @@ class MultipleUTube(_PipeData):
         -------
         None
         """
+        import matplotlib.pyplot as plt
 
         # borehole
         borehole = gt.boreholes.Borehole(100, 1, r_b, 0, 0)
@@ -255,33 +256,43 @@ class MultipleUTube(_PipeData):
         """
         return gt.pipes.conduction_thermal_resistance_circular_pipe(self.r_in, self.r_out, self.k_p)
 
-    def explicit_model_borehole_resistance(self, fluid_data: _FluidData, flow_rate_data: _FlowData, k_s: float,
-                                           borehole: gt.boreholes.Borehole, order: int = 1, R_p: float = None,
-                                           **kwargs) -> float:
+    def explicit_model_borehole_resistance(self, fluid_data: _FluidData, flow_rate_data: _FlowData,
+                                           k_s: Union[float, np.ndarray], borehole: gt.boreholes.Borehole = None,
+                                           order: int = 1, R_p: Union[float, np.ndarray] = None,
+                                           r_b: Union[float, np.ndarray] = None,
+                                           borehole_length: Union[float, np.ndarray] = None,
+                                           **kwargs) -> Union[float, np.ndarray]:
         """
         This function calculates the conductive and convective resistances, which are constant.
         For the single U case, the formulas from (Claesson & Javed, 2018) are taken [#CJ2018]_.
         For double U probes, this is based on (Claesson & Javed, 2019) [#CJ2019]_.
 
+        All the inputs (the flow rate and temperature in the kwargs, the ground thermal conductivity, the borehole
+        radius and the borehole length) can be arrays, which are broadcast against each other.
+
         Parameters
         ----------
         fluid_data : FluidData
             Fluid data
         flow_rate_data : FlowData
             Flow rate data
-        k_s : float
+        k_s : float or np.ndarray
             Ground thermal conductivity
         borehole : Borehole
-            Borehole object
+            Borehole object (only needed when r_b or borehole_length is not given)
         order : int
             Order of the model. For the single U, a zeroth, first and second order explicit model is implemented,
             for the double U, only a zeroth and first order.
-        R_p : float
+        R_p : float or np.ndarray
             Pipe thermal resistance [mK/W], when this is not given, it is calculated explicitly.
+        r_b : float or np.ndarray
+            Borehole radius [m], when this is not given, the radius of the borehole object is used.
+        borehole_length : float or np.ndarray
+            Borehole length [m], when this is not given, the length of the borehole object is used.
 
         Returns
         -------
-        float
+        float or np.ndarray
             Effective borehole thermal resistance [mK/W]
 
         References
@@ -292,10 +303,15 @@ class MultipleUTube(_PipeData):
         if self.number_of_pipes > 2:
             raise NotImplementedError('Explicit models are only implemented for the single and double probes.')
 
+        r_b = borehole.r_b if r_b is None else np.asarray(r_b, dtype=np.float64)
+        borehole_length = borehole.H if borehole_length is None else np.asarray(borehole_length, dtype=np.float64)
+        k_s = np.asarray(k_s, dtype=np.float64)
+
         # Pipe resistance [m.K/W]
         if R_p is None:
-            R_p_cond = self.calculate_conductive_resistance(**kwargs)
-            R_p_conv = self.calculate_convective_resistance(flow_rate_data, fluid_data, **kwargs)
+            R_p_cond = self.calculate_conductive_resistance(borehole_length=borehole_length, **kwargs)
+            R_p_conv = self.calculate_convective_resistance(flow_rate_data, fluid_data,
+                                                            borehole_length=borehole_length, **kwargs)
 
             R_p = R_p_cond + R_p_conv
 
@@ -305,10 +321,10 @@ class MultipleUTube(_PipeData):
             # use solution from (Claesson & Javed, 2018)
             # calculate zeroth order
             R_plus = R_p + 1 / (2 * np.pi * self.k_g) * (
-                    np.log(borehole.r_b ** 2 / (2 * self.r_out * self.D_s)) + sigma * np.log(
-                borehole.r_b ** 4 / (borehole.r_b ** 4 - self.D_s ** 4)))
+                    np.log(r_b ** 2 / (2 * self.r_out * self.D_s)) + sigma * np.log(
+                r_b ** 4 / (r_b ** 4 - self.D_s ** 4)))
             R_min = R_p + 1 / (2 * np.pi * self.k_g) * (np.log(2 * self.D_s / (self.r_out)) + sigma * np.log(
-                (borehole.r_b ** 2 + self.D_s ** 2) / (borehole.r_b ** 2 - self.D_s ** 2)))
+                (r_b ** 2 + self.D_s ** 2) / (r_b ** 2 - self.D_s ** 2)))
             if order == 0:
                 # calculate internal resistance and local borehole resistance
                 R_a = 2 * R_min
@@ -316,8 +332,8 @@ class MultipleUTube(_PipeData):
             elif order == 1:
                 beta = R_p * 2 * np.pi * self.k_g
                 p0 = self.r_out / (2 * self.D_s)
-                p1 = self.r_out * self.D_s / (borehole.r_b ** 2 - self.D_s ** 2)
-                p2 = self.r_out * self.D_s / (borehole.r_b ** 2 + self.D_s ** 2)
+                p1 = self.r_out * self.D_s / (r_b ** 2 - self.D_s ** 2)
+                p2 = self.r_out * self.D_s / (r_b ** 2 + self.D_s ** 2)
                 b1 = (1 - beta) / (1 + beta)
 
                 B1_plus = 1 / (2 * np.pi * self.k_g) * ((b1 * (-p0 + sigma * p1 - sigma * p2) ** 2) / (
@@ -331,8 +347,8 @@ class MultipleUTube(_PipeData):
             elif order == 2:
                 beta = R_p * 2 * np.pi * self.k_g
                 p0 = self.r_out / (2 * self.D_s)
-                p1 = self.r_out * self.D_s / (borehole.r_b ** 2 - self.D_s ** 2)
-                p2 = self.r_out * self.D_s / (borehole.r_b ** 2 + self.D_s ** 2)
+                p1 = self.r_out * self.D_s / (r_b ** 2 - self.D_s ** 2)
+                p2 = self.r_out * self.D_s / (r_b ** 2 + self.D_s ** 2)
                 b1 = (1 - beta) / (1 + beta)
                 b2 = (1 - 2 * beta) / (1 + 2 * beta)
 
@@ -369,17 +385,17 @@ class MultipleUTube(_PipeData):
         else:
             # use solution from (Claesson & Javed, 2019)
             R_plus = R_p / 2 + 1 / (4 * np.pi * self.k_g) * (
-                    np.log(borehole.r_b ** 4 / (4 * self.r_out * self.D_s ** 3)) + sigma * np.log(
-                borehole.r_b ** 8 / (borehole.r_b ** 8 - self.D_s ** 8)))
+                    np.log(r_b ** 4 / (4 * self.r_out * self.D_s ** 3)) + sigma * np.log(
+                r_b ** 8 / (r_b ** 8 - self.D_s ** 8)))
 
             if self.config == 'diagonal':
                 # FOR DIAGONAL
                 R_min = R_p + 1 / (2 * np.pi * self.k_g) * (np.log(self.D_s / (self.r_out)) + sigma * np.log(
-                    (borehole.r_b ** 4 + self.D_s ** 4) / (borehole.r_b ** 4 - self.D_s ** 4)))
+                    (r_b ** 4 + self.D_s ** 4) / (r_b ** 4 - self.D_s ** 4)))
             else:
                 # FOR ADJACENT
                 R_min = R_p + 1 / (2 * np.pi * self.k_g) * (np.log(2 * self.D_s / (self.r_out)) + sigma * np.log(
-                    (borehole.r_b ** 2 + self.D_s ** 2) / (borehole.r_b ** 2 - self.D_s ** 2)))
+                    (r_b ** 2 + self.D_s ** 2) / (r_b ** 2 - self.D_s ** 2)))
 
             if order == 0:
                 # calculate internal resistance and local borehole resistance
@@ -388,8 +404,8 @@ class MultipleUTube(_PipeData):
             elif order == 1:
                 beta = R_p * 2 * np.pi * self.k_g
                 ppc = self.r_out ** 2 / (4 * self.D_s ** 2)
-                pc = self.D_s ** 2 / ((borehole.r_b ** 8 - self.D_s ** 8) ** (1 / 4))
-                pb = borehole.r_b ** 2 / ((borehole.r_b ** 8 - self.D_s ** 8) ** (1 / 4))
+                pc = self.D_s ** 2 / ((r_b ** 8 - self.D_s ** 8) ** (1 / 4))
+                pb = r_b ** 2 / ((r_b ** 8 - self.D_s ** 8) ** (1 / 4))
                 b1 = (1 - beta) / (1 + beta)
 
                 B1_plus = 1 / (4 * np.pi * self.k_g) * (b1 * ppc * (3 - 8 * sigma * pc ** 4) ** 2) / (
@@ -416,10 +432,11 @@ class MultipleUTube(_PipeData):
             else:
                 raise NotImplementedError(
                     'Explicit models are only implemented for double U probes are only implemented for orders 0 an 1.')
-        r_v = borehole.H / (flow_rate_data.mfr_borehole(**kwargs, fluid_data=fluid_data) * fluid_data.cp(
+        r_v = borehole_length / (flow_rate_data.mfr_borehole(**kwargs, fluid_data=fluid_data) * fluid_data.cp(
             **kwargs) / self.number_of_pipes)
         n = r_v / (self.number_of_pipes * R_b * R_a) ** 0.5
-        return R_b * n * np.cosh(n) / np.sinh(n)
+        result = R_b * n * np.cosh(n) / np.sinh(n)
+        return result if np.ndim(result) else float(result)
 
     def __export__(self):
         return {'type': 'U',
@@ -1,10 +1,4 @@
-import joblib
-import torch
-import torch.nn as nn
-
 import pygfunction as gt
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 
 from GHEtool.utils.calculate_friction_factor import *
 from GHEtool.VariableClasses.PipeData.SingleUTube import SingleUTube
@@ -12,32 +6,30 @@ from GHEtool.VariableClasses.FluidData import _FluidData
 from GHEtool.VariableClasses.FlowData import _FlowData
 
 
-class EllipseANN(nn.Module):
+def _ellipse_ann(X: np.ndarray, model: dict) -> np.ndarray:
     """
-    Small MLP for 5-input, 2-output regression.
-
-    Inputs:
-        r_b, spacing, R_fp, k_b, k_s
-
-    Outputs:
-        R_b, R_a
+    This function evaluates the artificial neural network of the MuoviELLIPSE.
+    This is a small MLP with three hidden layers (64, 64 and 32 neurons) with a tanh activation function.
+    The inputs are r_b, spacing, R_fp, k_b and k_s and the outputs are R_b and R_a.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        Input matrix (N, 5)
+    model : dict
+        Weights, biases and scaler parameters of the network
+
+    Returns
+    -------
+    np.ndarray
+        Output matrix (N, 2)
     """
-
-    def __init__(self, n_inputs: int = 5, n_outputs: int = 2):
-        super().__init__()
-
-        self.net = nn.Sequential(
-            nn.Linear(n_inputs, 64),
-            nn.Tanh(),
-            nn.Linear(64, 64),
-            nn.Tanh(),
-            nn.Linear(64, 32),
-            nn.Tanh(),
-            nn.Linear(32, n_outputs),
-        )
-
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
-        return self.net(x)
+    # the network is trained in single precision
+    y = ((X - model['x_mean']) / model['x_scale']).astype(np.float32)
+    for i in range(3):
+        y = np.tanh(y @ model[f'weight_{i}'] + model[f'bias_{i}'])
+    y = y @ model['weight_3'] + model['bias_3']
+    return y * model['y_scale'] + model['y_mean']
 
 
 class MuoviEllipse(SingleUTube):
@@ -48,6 +40,16 @@ class MuoviEllipse(SingleUTube):
     More information on this technology and its advantages can be found here: https://www.muovitech.com/group/?page=MuoviELLIPSE.
     """
 
+    # (a, b): name of the product
+    PRODUCTS: dict = {(37e-3, 26e-3): 'MuoviELLIPSE32',
+                      (46e-3, 33e-3): 'MuoviELLIPSE40',
+                      (51e-3, 37e-3): 'MuoviELLIPSE45',
+                      (58e-3, 41e-3): 'MuoviELLIPSE50',
+                      (64e-3, 45e-3): 'MuoviELLIPSE55',
+                      (73e-3, 52e-3): 'MuoviELLIPSE63'}
+    # name of the product: weights of the ANN model
+    _models: dict = {}
+
     def __init__(self, k_g: float, a: float, b: float, wall_thickness: float, D_s: float = None):
         """
 
@@ -92,7 +94,8 @@ class MuoviEllipse(SingleUTube):
 
     def _load_model(self, a, b) -> None:
         """
-        This function loads the trained ANN models for the MuoviELLIPSE.
+        This function loads the trained ANN model for the MuoviELLIPSE. The model of every product is only read once
+        and shared between all the MuoviEllipse objects.
 
         Returns
         -------
@@ -105,42 +108,20 @@ class MuoviEllipse(SingleUTube):
         """
         from GHEtool import FOLDER
 
-        if np.isclose(a, 37e-3) and np.isclose(b, 26e-3):
-            self._model_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE32/borehole_ann.pt")
-            self._x_scaler_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE32/X_scaler.joblib")
-            self._y_scaler_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE32/y_scaler.joblib")
-
-        elif np.isclose(a, 46e-3) and np.isclose(b, 33e-3):
-            self._model_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE40/borehole_ann.pt")
-            self._x_scaler_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE40/X_scaler.joblib")
-            self._y_scaler_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE40/y_scaler.joblib")
-
-        elif np.isclose(a, 51e-3) and np.isclose(b, 37e-3):
-            self._model_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE45/borehole_ann.pt")
-            self._x_scaler_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE45/X_scaler.joblib")
-            self._y_scaler_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE45/y_scaler.joblib")
-
-        elif np.isclose(a, 58e-3) and np.isclose(b, 41e-3):
-            self._model_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE50/borehole_ann.pt")
-            self._x_scaler_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE50/X_scaler.joblib")
-            self._y_scaler_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE50/y_scaler.joblib")
-
-        elif np.isclose(a, 64e-3) and np.isclose(b, 45e-3):
-            self._model_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE55/borehole_ann.pt")
-            self._x_scaler_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE55/X_scaler.joblib")
-            self._y_scaler_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE55/y_scaler.joblib")
-
-        elif np.isclose(a, 73e-3) and np.isclose(b, 52e-3):
-            self._model_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE63/borehole_ann.pt")
-            self._x_scaler_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE63/X_scaler.joblib")
-            self._y_scaler_path = FOLDER.joinpath("VariableClasses/PipeData/ANN/MuoviELLIPSE63/y_scaler.joblib")
-
+        for (a_product, b_product), name in MuoviEllipse.PRODUCTS.items():
+            if np.isclose(a, a_product) and np.isclose(b, b_product):
+                break
         else:
             raise ValueError(
                 f"No ANN model available for ellipse dimensions a={a * 1000:.1f} mm, "
                 f"b={b * 1000:.1f} mm."
             )
 
+        if name not in MuoviEllipse._models:
+            with np.load(FOLDER.joinpath(f"VariableClasses/PipeData/ANN/{name}/borehole_ann.npz")) as data:
+                MuoviEllipse._models[name] = {key: data[key] for key in data.files}
+        self._model = MuoviEllipse._models[name]
+
     def pipe_model(self, k_s: float, borehole: gt.boreholes.Borehole) -> gt.pipes._BasePipe:
         """
         This function returns the BasePipe model.
@@ -293,13 +274,6 @@ class MuoviEllipse(SingleUTube):
         R_b, R_a : np.ndarray
             Same shape as broadcasted inputs.
         """
-        model = EllipseANN()
-        model.load_state_dict(torch.load(self._model_path, map_location="cpu"))
-        model.eval()
-
-        X_scaler = joblib.load(self._x_scaler_path)
-        y_scaler = joblib.load(self._y_scaler_path)
-
         # Convert to arrays
         r_b = np.asarray(r_b)
         spacing = np.asarray(spacing)
@@ -325,14 +299,7 @@ class MuoviEllipse(SingleUTube):
             ]
         )
 
-        # Scale inputs
-        X_s = X_scaler.transform(X)
-
-        # Predict
-        with torch.no_grad():
-            y_s = model(torch.tensor(X_s, dtype=torch.float32)).numpy()
-
-        y = y_scaler.inverse_transform(y_s)
+        y = _ellipse_ann(X, self._model)
 
         # Restore original shape
         R_b = y[:, 0].reshape(shape)
@@ -447,6 +414,8 @@ class MuoviEllipse(SingleUTube):
         -------
         None
         """
+        import matplotlib.pyplot as plt
+        import matplotlib.patches as patches
 
         COLOR_SECONDARY = '#2196F3'  # left inner ellipse (flow in)
         COLOR_RED = '#E53935'  # right inner ellipse (flow out)
@@ -0,0 +1,174 @@
+"""
+This document contains the SpectralConvolution class.
+This class is used to speed up the hourly (L4) temperature calculation when the same load is convolved with the
+step response of the borefield for many different borehole lengths, as is the case during sizing.
+"""
+import math
+from typing import Callable
+
+import numpy as np
+from scipy import fft
+
+
+class SpectralConvolution:
+    """
+    This class convolves an (hourly) load with the g-value differences of the borefield using FFTs.
+    The spectrum of the load is calculated only once and reused for every borehole length.
+
+    Furthermore, the convolution is linear in the g-values. The responses are therefore only calculated at anchor
+    lengths on a geometric grid, and the response at a certain borehole length is found by linear interpolation
+    between the two enclosing anchors. In this way, most sizing iterations only require a weighted sum of two
+    precalculated arrays, without any new g-function evaluation or convolution.
+    """
+
+    DEFAULT_ANCHOR_SPACING: float = 0.05  # relative spacing between two anchor lengths [-]
+    DEFAULT_MAX_NUMBER_OF_ANCHORS: int = 10
+
+    def __init__(self, anchor_spacing: float = None, max_number_of_anchors: int = None):
+        """
+
+        Parameters
+        ----------
+        anchor_spacing : float
+            Relative spacing between two consecutive anchor lengths [-]
+        max_number_of_anchors : int
+            Maximum number of anchor lengths that are stored. When this number is exceeded, the least recently used
+            anchor is removed.
+        """
+        self.anchor_spacing: float = anchor_spacing if anchor_spacing is not None else \
+            SpectralConvolution.DEFAULT_ANCHOR_SPACING
+        self.max_number_of_anchors: int = max_number_of_anchors if max_number_of_anchors is not None else \
+            SpectralConvolution.DEFAULT_MAX_NUMBER_OF_ANCHORS
+
+        self._load: np.ndarray = np.array([])
+        self._load_spectrum: np.ndarray = np.array([])
+        self._n_fft: int = 0
+        # index of the anchor on the geometric grid: convolved response
+        self._anchors: dict = {}
+
+    @property
+    def anchor_lengths(self) -> np.ndarray:
+        """
+        This function returns the sorted borehole lengths for which a response is stored.
+
+        Returns
+        -------
+        np.ndarray
+            Anchor lengths [m]
+        """
+        return np.array([self._anchor_length(idx) for idx in sorted(self._anchors)])
+
+    def _anchor_length(self, idx: int) -> float:
+        """
+        This function returns the borehole length of the anchor with a certain index.
+
+        Parameters
+        ----------
+        idx : int
+            Index of the anchor on the geometric grid
+
+        Returns
+        -------
+        float
+            Anchor length [m]
+        """
+        return (1 + self.anchor_spacing) ** idx
+
+    def reset(self) -> None:
+        """
+        This function removes the stored load spectrum and all the anchor responses.
+
+        Returns
+        -------
+        None
+        """
+        self._load = np.array([])
+        self._load_spectrum = np.array([])
+        self._n_fft = 0
+        self._anchors = {}
+
+    def set_load(self, load: np.ndarray) -> None:
+        """
+        This function sets the load that has to be convolved. The spectrum is only recalculated (and the anchors
+        are only removed) when the load differs from the stored one.
+
+        Parameters
+        ----------
+        load : np.ndarray
+            Load array [W]
+
+        Returns
+        -------
+        None
+        """
+        if self._load.shape == load.shape and np.array_equal(self._load, load):
+            return
+        self._load = np.array(load, dtype=float)
+        # the padding should be long enough to avoid circular convolution
+        self._n_fft = fft.next_fast_len(2 * load.size - 1, real=True)
+        self._load_spectrum = fft.rfft(self._load, self._n_fft)
+        self._anchors = {}
+
+    def _response(self, idx: int, g_value_differences: Callable[[float], np.ndarray]) -> np.ndarray:
+        """
+        This function returns the convolved response at an anchor. If it is not yet stored, it is calculated
+        with the stored load spectrum.
+
+        Parameters
+        ----------
+        idx : int
+            Index of the anchor on the geometric grid
+        g_value_differences : callable
+            Function that returns the g-value differences for a given borehole length
+
+        Returns
+        -------
+        np.ndarray
+            Convolved response, with the same length as the load
+        """
+        if idx in self._anchors:
+            # move to the end, so it is the most recently used anchor
+            self._anchors[idx] = self._anchors.pop(idx)
+            return self._anchors[idx]
+
+        spectrum = fft.rfft(g_value_differences(self._anchor_length(idx)), self._n_fft)
+        self._anchors[idx] = fft.irfft(self._load_spectrum * spectrum, self._n_fft)[:self._load.size]
+        while len(self._anchors) > self.max_number_of_anchors:
+            self._anchors.pop(next(iter(self._anchors)))
+        return self._anchors[idx]
+
+    def convolve(self, load: np.ndarray, length: float,
+                 g_value_differences: Callable[[float], np.ndarray]) -> np.ndarray:
+        """
+        This function returns the convolution of the load with the g-value differences at the given borehole length.
+        The result is interpolated between the two anchors that enclose this length.
+
+        Parameters
+        ----------
+        load : np.ndarray
+            Load array [W]
+        length : float
+            Borehole length [m]
+        g_value_differences : callable
+            Function that returns the g-value differences for a given borehole length.
+            It is only called for anchors that are not yet stored.
+
+        Returns
+        -------
+        np.ndarray
+            Convolved response, with the same length as the load
+        """
+        self.set_load(load)
+
+        idx = math.floor(math.log(length) / math.log(1 + self.anchor_spacing))
+        # correct for rounding errors
+        if self._anchor_length(idx + 1) <= length:
+            idx += 1
+        H_prev = self._anchor_length(idx)
+        if math.isclose(H_prev, length):
+            return self._response(idx, g_value_differences).copy()
+        H_next = self._anchor_length(idx + 1)
+
+        weight = (length - H_prev) / (H_next - H_prev)
+        return (1 - weight) * self._response(idx, g_value_differences) + \
+            weight * self._response(idx + 1, g_value_differences)
@@ -5,6 +5,6 @@ from .LoadData import *
 from .PipeData import *
 from .Efficiency import *
 from .CalculationSetup import CalculationSetup
-from .Borehole import Borehole
+from .Borehole import Borehole, RbTableCache
 from .Result import ResultsMonthly, ResultsHourly, _Results
 from .Gfunctions import *
@@ -178,12 +178,12 @@ def test_choose_quadrant_None(borefield_quadrants):
 
 
 @pytest.mark.slow
-def test_load_custom_gfunction(borefield):
+def test_load_custom_gfunction(borefield, tmp_path):
     borefield.create_custom_dataset()
-    borefield.custom_gfunction.dump_custom_dataset("./", "test")
+    borefield.custom_gfunction.dump_custom_dataset(str(tmp_path) + '/', "test")
     dataset = copy.copy(borefield.custom_gfunction)
 
-    borefield.load_custom_gfunction("./test.gvalues")
+    borefield.load_custom_gfunction(tmp_path / "test.gvalues")
     assert borefield.custom_gfunction == dataset
 
 
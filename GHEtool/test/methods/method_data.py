@@ -487,30 +487,30 @@ list_of_test_objects.add(
 hourly_load = HourlyBuildingLoad(efficiency_heating=10 ** 6, efficiency_cooling=10 ** 6)
 hourly_load.load_hourly_profile(FOLDER.joinpath("test\methods\hourly_data\hourly_profile.csv"))
 # set borefield depth to 150
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 87.506, 97.012,
-                                                   305.842, 384.199888, 230.19356748567617, 292.2167663088656,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 87.4134407, 96.8813243,
+                                                   305.195914, 380.64615, 230.839916, 295.770501,
                                                    name='Optimise load profile 1 (power)', power=1, hourly=False))
 
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 100, 70.054, 87.899,
-                                                   210.800, 247.181790, 325.2359184159649, 429.23472764038456,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 100, 69.8303796, 87.6906282,
+                                                   209.802398, 245.339111, 326.233528, 431.077405,
                                                    name='Optimise load profile 2 (power)', power=1, hourly=False))
 
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 50, 44.791, 63.79798,
-                                                   117.89775525978715, 117.80039058481954, 418.138, 558.6159977154532,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 50, 44.9183897, 63.9419873,
+                                                   118.315272, 118.282694, 417.720745, 558.133694,
                                                    name='Optimise load profile 3 (power)', power=1, hourly=False))
 
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 87.506, 96.404,
-                                                   305.842, 368.463, 230.193, 307.954,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 87.4251841, 96.3832621,
+                                                   305.278172, 367.969484, 230.757659, 308.447155,
                                                    name='Optimise load profile 1 (power, hourly)', power=1,
                                                    hourly=True))
 
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 100, 69.662, 87.022,
-                                                   209.053, 239.590, 326.983, 436.827,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 100, 69.4190244, 86.716926,
+                                                   207.969354, 237.051538, 328.066574, 439.364969,
                                                    name='Optimise load profile 2 (power, hourly)', power=1,
                                                    hourly=True))
 
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 50, 44.635, 63.467,
-                                                   117.388, 116.699, 418.648, 559.718,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 50, 44.5445826, 63.4389725,
+                                                   117.090798, 116.607445, 418.945221, 559.808943,
                                                    name='Optimise load profile 3 (power, hourly)', power=1,
                                                    hourly=True))
 list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 40.231, 96.043,
@@ -661,12 +661,12 @@ borefield.set_max_fluid_temperature(16)
 borefield.set_min_fluid_temperature(0)
 hourly_load.load_hourly_profile(FOLDER.joinpath("test\methods\hourly_data\hourly_profile.csv"), col_heating=1,
                                 col_cooling=0)
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 99.976, 66.492,
-                                                   643.137, 195.331, 33.28226963696875, 340.705,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 99.9701959, 66.3702737,
+                                                   638.334706, 194.83084, 38.0809261, 341.205491,
                                                    name='Optimise load profile 1, reversed (power)', power=1,
                                                    hourly=False))
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 99.971, 66.424,
-                                                   639.283, 195.053, 37.132, 340.983,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 99.9665255, 66.3043259,
+                                                   635.059011, 194.559704, 41.356624, 341.476626,
                                                    name='Optimise load profile 1, reversed (power, hourly)', power=1,
                                                    hourly=True))
 list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 99.956, 41.9184,
@@ -695,25 +695,25 @@ list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150,
 borefield.borehole = temp_borehole
 borefield.set_max_fluid_temperature(20)
 borefield.set_min_fluid_temperature(4)
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 97.012, 87.506,
-                                                   384.20003438433275, 305.8416132537297, 292.21585191524866,
-                                                   230.19482858757777,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 96.8813612, 87.4132628,
+                                                   380.646376, 305.195279, 295.769514,
+                                                   230.841162,
                                                    name='Optimise load profile 2, reversed (power)', power=1,
                                                    hourly=False))
 
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 100, 87.899, 70.054,
-                                                   247.1818850288293, 210.79978273642746, 429.23413828903847,
-                                                   325.23656406314456,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 100, 87.6907026, 69.8302445,
+                                                   245.339275, 209.802216, 431.07675,
+                                                   326.23413,
                                                    name='Optimise load profile 3, reversed (power)', power=1,
                                                    hourly=False))
 
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 96.404, 87.506,
-                                                   368.463, 305.842, 307.953, 230.195,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 96.3833045, 87.4250099,
+                                                   367.969781, 305.277562, 308.446121, 230.758879,
                                                    name='Optimise load profile 2, reversed (power, hourly)', power=1,
                                                    hourly=True))
 
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 100, 87.022, 69.662,
-                                                   239.590, 209.053, 436.826, 326.984,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 100, 86.7170014, 69.4188912,
+                                                   237.051685, 207.969176, 439.364348, 328.067168,
                                                    name='Optimise load profile 3, reversed (power, hourly)', power=1,
                                                    hourly=True))
 list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 96.043, 40.231,
@@ -779,12 +779,12 @@ borefield.ground_data = GroundTemperatureGradient(1.9, 10, gradient=2)
 borefield.fluid_data = ConstantFluidData(0.475, 1033, 3930, 0.001)
 borefield.flow_data = ConstantFlowRate(mfr=0.1)
 borefield.pipe_data = SingleUTube(1.5, 0.016, 0.02, 0.42, 0.04)
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 81.74619424986747, 86.4450620561209,
-                                                   22.3508, 37.60682541280639, 55.21378992502661, 60.239900259224626,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 81.8072991, 86.7794883,
+                                                   22.3820242, 37.9676429, 55.1721769, 59.8929603,
                                                    name='Optimise load profile (stuck in loop) (power)', power=1,
                                                    hourly=False))
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 80.572, 83.887,
-                                                   21.7649, 35.0615, 55.995, 62.6873,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 80.6782682, 84.4029131,
+                                                   21.816966, 35.5499319, 55.9255878, 62.2176825,
                                                    name='Optimise load profile (stuck in loop) (power, hourly)',
                                                    power=1, hourly=True))
 list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 29.86737590252756, 82.77895335975978,
@@ -914,9 +914,9 @@ borefield.ground_data = GroundTemperatureGradient(1.9, 10, gradient=2)
 borefield.fluid_data = ConstantFluidData(0.475, 1033, 3930, 0.001)
 borefield.flow_data = ConstantFlowRate(mfr=0.1)
 borefield.pipe_data = SingleUTube(1.5, 0.016, 0.02, 0.42, 0.04)
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 45.978137699335, 10.93,
-                                                   52.82586122830533, 27.731458, 605.9817888622596,
-                                                   512.9266,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 45.9595135, 10.9482465,
+                                                   52.7954061, 27.7824534, 606.022396,
+                                                   512.884091,
                                                    name='Optimise load profile (eer combined) (power)', power=1,
                                                    hourly=False))
 list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 50.20552887448856, 12.775993964027224,
@@ -980,13 +980,13 @@ borefield.set_max_fluid_temperature(16)
 borefield.set_min_fluid_temperature(0)
 hourly_load.load_hourly_profile(FOLDER.joinpath("test\methods\hourly_data\hourly_profile.csv"), col_heating=1,
                                 col_cooling=0)
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 99.976, 66.492,
-                                                   643.137, 195.331, 33.28226963696875, 340.705,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 99.9701959, 66.3702737,
+                                                   638.334706, 194.83084, 38.0809261, 341.205491,
                                                    name='Optimise load profile 1, reversed (power, dhw not preferential)',
                                                    power=1,
                                                    hourly=False, dhw_preferential=False))
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 99.971, 66.424,
-                                                   639.283, 195.053, 37.132, 340.983,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 99.9665255, 66.3043259,
+                                                   635.059011, 194.559704, 41.356624, 341.476626,
                                                    name='Optimise load profile 1, reversed (power, hourly, dhw not preferential)',
                                                    power=1,
                                                    hourly=True, dhw_preferential=False))
@@ -1006,23 +1006,23 @@ hourly_load.load_hourly_profile(FOLDER.joinpath("test\methods\hourly_data\hourly
                                 col_cooling=0, col_dhw=1)
 hourly_load.set_hourly_heating_load(np.zeros(8760))
 hourly_load.cop_dhw = 10 ** 6
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 99.976, 66.492,
-                                                   643.137, 195.331, 0, 340.705,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 99.9701959, 66.3702737,
+                                                   638.334706, 194.83084, 0, 341.205491,
                                                    name='Optimise load profile 1, reversed (power, dhw load)',
                                                    power=1,
                                                    hourly=False, dhw_preferential=False))
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 99.971, 66.424,
-                                                   639.283, 195.053, 0, 340.983,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 99.9665255, 66.3043259,
+                                                   635.059011, 194.559704, 0, 341.476626,
                                                    name='Optimise load profile 1, reversed (power, hourly, dhw load)',
                                                    power=1,
                                                    hourly=True, dhw_preferential=False))
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 99.976, 66.492,
-                                                   643.137, 195.331, 0, 340.705,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 99.9701959, 66.3702737,
+                                                   638.334706, 194.83084, 0, 341.205491,
                                                    name='Optimise load profile 1, reversed (power, dhw load, preferential)',
                                                    power=1,
                                                    hourly=False, dhw_preferential=True))
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 99.971, 66.424,
-                                                   639.283, 195.053, 0, 340.983,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 99.9665255, 66.3043259,
+                                                   635.059011, 194.559704, 0, 341.476626,
                                                    name='Optimise load profile 1, reversed (power, hourly, dhw load, preferential)',
                                                    power=1,
                                                    hourly=True, dhw_preferential=True))
@@ -1051,9 +1051,9 @@ hourly_load.load_hourly_profile(FOLDER.joinpath("test\methods\hourly_data\hourly
                                 col_cooling=0, col_dhw=1)
 hourly_load.cop_dhw = 10 ** 6
 hourly_load.exclude_DHW_from_peak = True
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 50.0408, 66.59413927618634,
-                                                   642.4146383835514, 195.75123383540765, 34.10098970116769,
-                                                   340.28509791563044,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 50.0395067, 66.3522066,
+                                                   640.112352, 194.756559, 36.4032788,
+                                                   341.279771,
                                                    name='Optimise load profile 1, reversed (power, dhw load, include DHW)',
                                                    power=1,
                                                    hourly=False, dhw_preferential=False))
@@ -1070,8 +1070,8 @@ list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150,
                                                    hourly=False, dhw_preferential=False))
 hourly_load.exclude_DHW_from_peak = False
 
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 50.0407722, 66.559,
-                                                   642.371, 195.608, 34.14809938164649, 340.42902155006277,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, hourly_load, 150, 50.0394508, 66.3521811,
+                                                   640.012557, 194.756455, 36.5030731, 341.279876,
                                                    name='Optimise load profile 1, reversed (power, dhw load, exclude DHW)',
                                                    power=1,
                                                    hourly=False, dhw_preferential=False))
@@ -1140,9 +1140,9 @@ borefield.fluid_data = ConstantFluidData(0.475, 1033, 3930, 0.001)
 borefield.flow_data = ConstantFlowRate(mfr=0.15)
 borefield.pipe_data = SingleUTube(1.5, 0.016, 0.02, 0.42, 0.04)
 borefield.borehole.use_constant_rb = False
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 27.78528424167, 30.91226214261,
-                                                   48.3385715, 43.49507, 471.584707,
-                                                   634.99238764,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 27.8350288, 30.8022743,
+                                                   48.4417099, 43.3021679, 471.447189,
+                                                   635.176111,
                                                    name='Optimise load profile (power, average)', power=1,
                                                    hourly=False))
 list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 32.27763398561526, 39.67386235382791,
@@ -1156,9 +1156,9 @@ list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 7.76810
                                                    name='Optimise load profile (balance, average)', power=3,
                                                    hourly=False))
 borefield.calculation_setup(size_based_on='inlet')
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 22.594766670427443, 23.833448445189433,
-                                                   38.04006508498196, 31.743722234593672, 485.3160492200241,
-                                                   646.1841540861012,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 22.6693114, 23.9374913,
+                                                   38.1816569, 31.9067688, 485.12726,
+                                                   646.028872,
                                                    name='Optimise load profile (power, inlet)', power=1, hourly=False))
 list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 32.70976476793236, 38.08447935043446,
                                                    86.14281622401376, 87.60597379779806, 463.93210633039513,
@@ -1170,9 +1170,9 @@ list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 0.06548
                                                    name='Optimise load profile (balance, inlet)', power=3,
                                                    hourly=False))
 borefield.calculation_setup(size_based_on='outlet')
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 36.75868179800523, 43.8208513601771,
-                                                   68.82277631200198, 69.09594393913034, 444.2724342506641,
-                                                   610.6106096055902,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 36.8757678, 43.8730323,
+                                                   69.1018977, 69.211423, 443.900272,
+                                                   610.50063,
                                                    name='Optimise load profile (power, outlet)', power=1, hourly=False))
 list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 30.016482290954972, 39.69813586531677,
                                                    72.49814402681608, 105.90664907765058, 466.8507088517479,
@@ -1185,9 +1185,9 @@ list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 24.3548
                                                    name='Optimise load profile (balance, outlet)', power=3,
                                                    hourly=False))
 borefield.flow_data = ConstantFlowRate(mfr=0.15 * 18, flow_per_borehole=False)
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 36.75868179800523, 43.8208513601771,
-                                                   68.82277631200198, 69.09594393913034, 444.2724342506641,
-                                                   610.6106096055902,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 36.8757678, 43.8730323,
+                                                   69.1018977, 69.211423, 443.900272,
+                                                   610.50063,
                                                    name='Optimise load profile (power, outlet, flow borefield)',
                                                    power=1, hourly=False))
 list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 30.016482290954972, 39.69813586531677,
@@ -1205,9 +1205,9 @@ list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 24.3548
 borefield.calculation_setup(size_based_on='average')
 borefield.fluid_data = TemperatureDependentFluidData('MPG', 25)
 borefield.flow_data = ConstantDeltaTFlowRate()
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 24.212056052962087, 25.750678943889987,
-                                                   41.1119786760319, 34.791392610197995, 481.2201644319575,
-                                                   643.28161087124,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 24.3714504, 25.9523774,
+                                                   41.4217608, 35.1179751, 480.807122,
+                                                   642.97058,
                                                    name='Optimise load profile (power, average, var flow)', power=1,
                                                    hourly=False))
 list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 29.469091502295186, 38.59024834792813,
@@ -1221,9 +1221,9 @@ list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 13.6964
                                                    name='Optimise load profile (balance, average, var flow)', power=3,
                                                    hourly=False))
 borefield.calculation_setup(size_based_on='inlet')
-list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 17.477913367656956, 15.1900163253187,
-                                                   28.790074281883236, 18.988083079232872, 497.6493702908224,
-                                                   658.3323818531115,
+list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 17.6837749, 15.431479,
+                                                   29.1503044, 19.3227212, 497.169063,
+                                                   658.013679,
                                                    name='Optimise load profile (power, inlet, var flow)', power=1,
                                                    hourly=False))
 list_of_test_objects.add(OptimiseLoadProfileObject(borefield, load, 146, 28.4206346064365, 29.7813899030333,
@@ -6,7 +6,7 @@ import pytest
 
 from GHEtool import FluidData, DoubleUTube, SingleUTube, MultipleUTube, ConstantFluidData, ConstantFlowRate, \
     TemperatureDependentFluidData, ConicalPipe, VariableHourlyFlowRate
-from GHEtool.VariableClasses import Borehole
+from GHEtool.VariableClasses import Borehole, RbTableCache
 
 fluid_data = ConstantFluidData(0.568, 998, 4180, 1e-3)
 flow_data = ConstantFlowRate(mfr=0.2)
@@ -228,28 +228,58 @@ def test_saved_data_reynolds():
     borehole.fluid_data = TemperatureDependentFluidData('MPG', 25)
     borehole.flow_data = ConstantFlowRate(vfr=0.3)
 
+    Borehole.rb_table_cache.clear()
     resistance1 = borehole.calculate_Rb(100, 1, 0.075, 3, temperature=np.array([0, 1, 2, 5]))
-    assert borehole._stored_interp_data == {'D': 1,
-                                            'H': 100,
-                                            'flow': "{'vfr per borehole [l/s]': 0.3}",
-                                            'fluid': "{'name': 'MPG', 'percentage': 25, 'type': 'mass percentage'}",
-                                            'k_s': 3,
-                                            'pipe': "{'type': 'U', 'nb_of_tubes': 2, 'thickness [mm]': 5.0, 'diameter "
-                                                    "[mm]': 40.0, 'spacing [mm]': 50.0, 'k_g [W/(m·K)]': 1, 'k_p "
-                                                    "[W/(m·K)]': 0.4, 'epsilon [mm]': 0.001}",
-                                            'r_b': 0.075}
+    key = borehole._stored_interp_data
+    assert key[3:8] == (100, 1, 0.075, 3, 50)
+    assert Borehole.rb_table_cache.misses == 1
     resistance2 = borehole.calculate_Rb(110, 1, 0.075, 3, temperature=np.array([0, 1, 2, 5]))
     assert not np.allclose(resistance1, resistance2)
-    assert borehole._stored_interp_data == {'D': 1,
-                                            'H': 110,
-                                            'flow': "{'vfr per borehole [l/s]': 0.3}",
-                                            'fluid': "{'name': 'MPG', 'percentage': 25, 'type': 'mass percentage'}",
-                                            'k_s': 3,
-                                            'pipe': "{'type': 'U', 'nb_of_tubes': 2, 'thickness [mm]': 5.0, 'diameter "
-                                                    "[mm]': 40.0, 'spacing [mm]': 50.0, 'k_g [W/(m·K)]': 1, 'k_p "
-                                                    "[W/(m·K)]': 0.4, 'epsilon [mm]': 0.001}",
-                                            'r_b': 0.075}
+    assert borehole._stored_interp_data[3] == 110
+    assert Borehole.rb_table_cache.misses == 2
     assert np.allclose(resistance1, borehole.calculate_Rb(100, 1, 0.075, 3, temperature=np.array([0, 1, 2, 5])))
+    assert borehole._stored_interp_data == key
+    assert Borehole.rb_table_cache.hits == 1
+
+
+def test_rb_table_cache_shared():
+    borehole = Borehole()
+    borehole.pipe_data = MultipleUTube(1, 0.015, 0.02, 0.4, 0.05, 2)
+    borehole.fluid_data = TemperatureDependentFluidData('MPG', 25)
+    borehole.flow_data = ConstantFlowRate(vfr=0.3)
+    Borehole.rb_table_cache.clear()
+    resistance = borehole.calculate_Rb(100, 1, 0.075, 3, temperature=np.array([0, 1, 2, 5]))
+    # the pipe resistances are calculated, but they do not change the key
+    key = borehole._stored_interp_data
+
+    # copies and new objects with the same design use the same table
+    borehole_copy = copy.deepcopy(borehole)
+    assert np.array_equal(resistance, borehole_copy.calculate_Rb(100, 1, 0.075, 3,
+                                                                 temperature=np.array([0, 1, 2, 5])))
+    other = Borehole(TemperatureDependentFluidData('MPG', 25), MultipleUTube(1, 0.015, 0.02, 0.4, 0.05, 2),
+                     ConstantFlowRate(vfr=0.3))
+    other.calculate_Rb(100, 1, 0.075, 3, temperature=np.array([0, 1, 2, 5]))
+    assert other._stored_interp_data == key
+    assert Borehole.rb_table_cache.hits == 2 and Borehole.rb_table_cache.misses == 1
+    assert len(Borehole.rb_table_cache) == 1
+
+    # a different design gives a different table
+    other.pipe_data = MultipleUTube(1, 0.015, 0.02, 0.4, 0.05, 2, config='adjacent')
+    other.calculate_Rb(100, 1, 0.075, 3, temperature=np.array([0, 1, 2, 5]))
+    assert other._stored_interp_data != key
+    other.pipe_data = MultipleUTube(1, 0.015, 0.02, 0.4, 0.05, 2)
+    other.flow_data = ConstantFlowRate(vfr=0.6, flow_per_borehole=False)
+    assert np.allclose(resistance, other.calculate_Rb(100, 1, 0.075, 3, temperature=np.array([0, 1, 2, 5]),
+                                                      nb_of_boreholes=2))
+    assert not np.allclose(other.calculate_Rb(100, 1, 0.075, 3, temperature=np.array([0, 1, 2, 5]), nb_of_boreholes=2),
+                           other.calculate_Rb(100, 1, 0.075, 3, temperature=np.array([0, 1, 2, 5]), nb_of_boreholes=4))
+
+    # least recently used tables are removed
+    Borehole.rb_table_cache.max_size = 1
+    borehole.calculate_Rb(120, 1, 0.075, 3, temperature=np.array([0, 1, 2, 5]))
+    assert len(Borehole.rb_table_cache) == 1
+    Borehole.rb_table_cache.max_size = RbTableCache.DEFAULT_MAX_SIZE
+    Borehole.rb_table_cache.clear()
 
 
 def test_saved_data_reynolds_commercial():
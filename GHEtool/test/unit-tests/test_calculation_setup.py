@@ -79,3 +79,46 @@ def test_assign_incorrect_variable():
     setup = CalculationSetup()
     with pytest.raises(ValueError):
         setup.update_variables(test='test')
+
+
+def test_convolution_method():
+    setup = CalculationSetup()
+    assert setup.convolution_method == 'direct'
+    setup.update_variables(convolution_method='spectral')
+    assert setup.convolution_method == 'spectral'
+    setup.update_variables(convolution_method='load_aggregation')
+    assert setup.convolution_method == 'load_aggregation'
+    with pytest.raises(ValueError):
+        setup.update_variables(convolution_method='test')
+    with pytest.raises(ValueError):
+        CalculationSetup(convolution_method='test')
+
+
+def test_sizing_solver():
+    setup = CalculationSetup()
+    assert setup.sizing_solver == 'fixed_point'
+    for solver in ('secant', 'illinois', 'brent'):
+        setup.update_variables(sizing_solver=solver)
+        assert setup.sizing_solver == solver
+    with pytest.raises(ValueError):
+        setup.update_variables(sizing_solver='test')
+    with pytest.raises(ValueError):
+        CalculationSetup(sizing_solver='test')
+
+
+def test_cascade_sizing():
+    setup = CalculationSetup()
+    assert not setup.cascade_sizing
+    assert setup.cascade_tolerance_factor == 10
+    setup.update_variables(cascade_sizing=True, cascade_tolerance_factor=5)
+    assert setup.cascade_sizing
+    assert setup.cascade_tolerance_factor == 5
+
+
+def test_sparse_hourly_sizing():
+    setup = CalculationSetup()
+    assert not setup.sparse_hourly_sizing
+    assert setup.sparse_hourly_candidates == 10
+    setup.update_variables(sparse_hourly_sizing=True, sparse_hourly_candidates=5)
+    assert setup.sparse_hourly_sizing
+    assert setup.sparse_hourly_candidates == 5
@@ -3,8 +3,11 @@ import copy
 import numpy as np
 import pygfunction as gt
 import pytest
+from scipy import interpolate
 
-from GHEtool.VariableClasses import CustomGFunction, load_custom_gfunction
+from GHEtool import FOLDER
+from GHEtool.VariableClasses import CustomGFunction, load_custom_gfunction, read_custom_gfunction_header, \
+    geometry_hash
 
 
 @pytest.fixture
@@ -69,8 +72,79 @@ def test_create_dataset():
     assert not np.any(custom_gfunction.gvalues_array)
 
 
-def test_dump_dataset(custom_gfunction):
-    custom_gfunction.dump_custom_dataset("", "test")
+def test_create_dataset_parallel():
+    borefield = gt.borefield.Borefield.rectangle_field(3, 3, 6, 6, 100, 4, 0.075)
+    serial = CustomGFunction(borehole_length_array=np.array([50, 100, 150]), options={'method': 'equivalent'})
+    serial.create_custom_dataset(borefield, 2. * 10 ** -6)
+
+    calls = []
+    parallel = CustomGFunction(borehole_length_array=np.array([50, 100, 150]), options={'method': 'equivalent'})
+    parallel.create_custom_dataset(borefield, 2. * 10 ** -6, n_workers=2, chunksize=2,
+                                   progress=lambda done, total, length: calls.append((done, total, length)))
+    assert np.array_equal(serial.gvalues_array, parallel.gvalues_array)
+    assert calls == [(1, 3, 50), (2, 3, 100), (3, 3, 150)]
+
+    with pytest.raises(ValueError):
+        parallel.create_custom_dataset(borefield, 2. * 10 ** -6, n_workers=0)
+    with pytest.raises(ValueError):
+        parallel.create_custom_dataset(borefield, 2. * 10 ** -6, chunksize=0)
+
+
+def test_create_adaptive_dataset():
+    borefield = gt.borefield.Borefield.rectangle_field(2, 1, 6, 6, 100, 4, 0.075)
+    reference = CustomGFunction(borehole_length_array=np.linspace(10, 350, 35), options={'method': 'equivalent'})
+    reference.create_custom_dataset(borefield, 2. * 10 ** -6)
+
+    calls = []
+    adaptive = CustomGFunction(options={'method': 'equivalent'})
+    adaptive.create_adaptive_custom_dataset(borefield, 2. * 10 ** -6, rtol=0.01,
+                                            progress=lambda done, total, length: calls.append(done))
+    assert adaptive.min_borehole_length == 10 and adaptive.max_borehole_length == 350
+    assert adaptive.borehole_length_array.size < CustomGFunction.DEFAULT_LENGTH_ARRAY.size
+    assert calls == list(range(1, adaptive.borehole_length_array.size + 1))
+    assert adaptive.interpolation_error <= 0.01
+    for length, gvalues in zip(reference.borehole_length_array, reference.gvalues_array):
+        assert np.max(np.abs(adaptive.calculate_gfunction(adaptive.time_array, length) - gvalues)) <= \
+               adaptive.interpolation_error * np.max(gvalues)
+
+    # maximum number of lengths
+    adaptive.create_adaptive_custom_dataset(borefield, 2. * 10 ** -6, rtol=0.0001, max_number_of_lengths=5)
+    assert adaptive.borehole_length_array.size == 5
+    assert adaptive.interpolation_error > 0.0001
+    with pytest.raises(ValueError):
+        adaptive.create_adaptive_custom_dataset(borefield, 2. * 10 ** -6, max_number_of_lengths=2)
+
+
+def test_dump_dataset(custom_gfunction, tmp_path):
+    custom_gfunction.dump_custom_dataset(str(tmp_path) + '/', "test")
+    assert load_custom_gfunction(tmp_path / "test.gvalues") == custom_gfunction
+
+
+def test_dump_dataset_options(tmp_path):
+    custom_gfunction = CustomGFunction(np.array([3600, 7200]), np.array([50, 100]))
+    custom_gfunction.gvalues_array = np.array([[1, 2], [3, 4]], dtype=float)
+
+    # options that can be stored in JSON are stored in the binary format
+    custom_gfunction.set_options_gfunction_calculation({'method': 'similarities', 'linear_threshold': 5.,
+                                                        'nSegments': [8, 12], 'approximate_FLS': True,
+                                                        'disp': False, 'profiles': None})
+    custom_gfunction.dump_custom_dataset(str(tmp_path) + '/', 'json')
+    assert read_custom_gfunction_header(tmp_path / 'json.gvalues')['options'] == custom_gfunction.options
+    assert load_custom_gfunction(tmp_path / 'json.gvalues') == custom_gfunction
+
+    # other options are stored with pickle
+    for options in ({'method': 'equivalent', 'segment_ratios': gt.utilities.segment_ratios},
+                    {'method': 'equivalent', 'segment_ratios': np.array([0.25, 0.75])},
+                    {'method': 'equivalent', 'nSegments': (8, 12)}):
+        custom_gfunction.set_options_gfunction_calculation(options)
+        with pytest.warns(UserWarning):
+            custom_gfunction.dump_custom_dataset(str(tmp_path) + '/', 'options')
+        assert read_custom_gfunction_header(tmp_path / 'options.gvalues') is None
+        loaded = load_custom_gfunction(tmp_path / 'options.gvalues')
+        assert loaded.options.keys() == options.keys()
+        for key in options:
+            assert np.array_equal(loaded.options[key], options[key]) if isinstance(options[key], np.ndarray) else \
+                loaded.options[key] == options[key]
 
 
 def test_set_options():
@@ -80,7 +154,12 @@ def test_set_options():
 
 
 def test_load_custom_gfunction():
-    assert isinstance(load_custom_gfunction("test.gvalues"), CustomGFunction)
+    # dataset in the legacy pickle format, without the attributes of the current version
+    loaded_custom_gfunction = load_custom_gfunction(FOLDER.joinpath("test/unit-tests/data/test_pickle.gvalues"))
+    assert isinstance(loaded_custom_gfunction, CustomGFunction)
+    assert loaded_custom_gfunction.interpolation_error is None
+    assert loaded_custom_gfunction.geometry_hash is None
+    assert isinstance(loaded_custom_gfunction.alpha, np.ndarray) and loaded_custom_gfunction.alpha.size == 0
 
 
 def test_check():
@@ -134,8 +213,89 @@ def test_within_range(custom_gfunction):
 def test_gfunction_calculation(custom_gfunction):
     assert np.isclose(0.03586207, custom_gfunction.calculate_gfunction(4000, 100, True)[0])
     assert np.allclose(np.array([0.03586207, 0.1343308]), custom_gfunction.calculate_gfunction([4000, 8000], 100, True))
-    # test with loading
-    loaded_custom_gfunction = load_custom_gfunction("test.gvalues")
-    assert np.isclose(0.03586207, loaded_custom_gfunction.calculate_gfunction(4000, 100, True)[0])
-    assert np.allclose(np.array([0.03586207, 0.1343308]),
+    # test with loading a dataset in the legacy pickle format, which contains another borefield
+    loaded_custom_gfunction = load_custom_gfunction(FOLDER.joinpath("test/unit-tests/data/test_pickle.gvalues"))
+    assert np.isclose(0.46831494, loaded_custom_gfunction.calculate_gfunction(4000, 100, True)[0])
+    assert np.allclose(np.array([0.46831494, 0.7538033]),
                        loaded_custom_gfunction.calculate_gfunction([4000, 8000], 100, True))
+
+
+def test_gfunction_calculation_vectorised():
+    custom_gfunction = CustomGFunction(np.array([3600, 7200, 36000, 3.6e6]), np.array([50, 100, 200]))
+    custom_gfunction.gvalues_array = np.array([[1, 2, 3, 4], [2, 4, 6, 8], [3, 5, 9, 10]], dtype=float)
+    time_values = np.array([3600, 5000, 10000, 3.6e6])
+    for length in (50, 75, 100, 150.5, 200):
+        reference = interpolate.interpn((custom_gfunction.borehole_length_array, custom_gfunction.time_array),
+                                        custom_gfunction.gvalues_array,
+                                        np.array([[length, t] for t in time_values]))
+        assert np.allclose(custom_gfunction.calculate_gfunction(time_values, length), reference)
+        assert np.allclose(custom_gfunction.calculate_gfunction(5000, length), reference[1])
+    # the interpolation weights of the time values are reused
+    indices, weights = custom_gfunction._time_weights(time_values)
+    assert custom_gfunction._time_weights(time_values.copy())[0] is indices
+    # same time grid
+    assert np.allclose(custom_gfunction.calculate_gfunction(custom_gfunction.time_array, 75), [1.5, 3, 4.5, 6])
+
+    with pytest.raises(ValueError):
+        custom_gfunction.calculate_gfunction(time_values, 250)
+    with pytest.raises(ValueError):
+        custom_gfunction.calculate_gfunction(np.array([10, 3600]), 100)
+
+
+def test_calculate_gfunctions(custom_gfunction):
+    time_values = np.array([3600 * 24, 3600 * 24 * 30, 3600 * 8760 * 5])
+    lengths = np.array([100, 137, 250])
+    gvalues = custom_gfunction.calculate_gfunctions(time_values, lengths)
+    assert gvalues.shape == (3, 3)
+    for i, length in enumerate(lengths):
+        assert np.allclose(gvalues[i], custom_gfunction.calculate_gfunction(time_values, length))
+    assert np.allclose(custom_gfunction.calculate_gfunctions(custom_gfunction.time_array, [137])[0],
+                       custom_gfunction.calculate_gfunction(custom_gfunction.time_array, 137))
+    with pytest.raises(ValueError):
+        custom_gfunction.calculate_gfunctions(time_values, [100, 400])
+
+
+def test_binary_format(tmp_path):
+    borefield = gt.borefield.Borefield.rectangle_field(2, 2, 6, 6, 100, 4, 0.075)
+    custom_gfunction = CustomGFunction(borehole_length_array=np.array([50, 100]), options={'method': 'equivalent'})
+    custom_gfunction.create_custom_dataset(borefield, lambda depth, D: depth * 1e-8)
+    assert custom_gfunction.geometry_hash == geometry_hash(borefield)
+    assert np.allclose(custom_gfunction.alpha, [50 * 1e-8 + 4e-8, 100 * 1e-8 + 4e-8])
+
+    custom_gfunction.dump_custom_dataset(str(tmp_path) + '/', 'binary')
+    header = read_custom_gfunction_header(tmp_path / 'binary.gvalues')
+    assert header['version'] == 1
+    assert header['offset'] % 64 == 0
+    assert header['geometry_hash'] == geometry_hash(borefield)
+    assert header['borehole_length_array_size'] == 2
+
+    loaded = load_custom_gfunction(tmp_path / 'binary.gvalues', validate=True)
+    assert isinstance(loaded.gvalues_array, np.memmap)
+    assert not loaded.gvalues_array.flags.writeable
+    assert loaded == custom_gfunction
+    assert np.allclose(loaded.calculate_gfunction([4000, 8000], 75), custom_gfunction.calculate_gfunction([4000, 8000], 75))
+    assert load_custom_gfunction(tmp_path / 'binary.gvalues', mmap=False) == custom_gfunction
+
+    # pickle is still supported
+    custom_gfunction.dump_custom_dataset(str(tmp_path) + '/', 'pickle', use_pickle=True)
+    assert read_custom_gfunction_header(tmp_path / 'pickle.gvalues') is None
+    assert load_custom_gfunction(tmp_path / 'pickle.gvalues') == custom_gfunction
+
+    # corrupted files
+    with open(tmp_path / 'binary.gvalues', 'rb') as f:
+        data = bytearray(f.read())
+    data[-1] ^= 0xFF
+    with open(tmp_path / 'corrupt.gvalues', 'wb') as f:
+        f.write(data)
+    load_custom_gfunction(tmp_path / 'corrupt.gvalues', mmap=False)
+    with pytest.raises(ValueError):
+        load_custom_gfunction(tmp_path / 'corrupt.gvalues', mmap=False, validate=True)
+    with open(tmp_path / 'truncated.gvalues', 'wb') as f:
+        f.write(data[:-8])
+    with pytest.raises(ValueError):
+        load_custom_gfunction(tmp_path / 'truncated.gvalues')
+    data[8] = 99
+    with open(tmp_path / 'version.gvalues', 'wb') as f:
+        f.write(data)
+    with pytest.raises(ValueError):
+        load_custom_gfunction(tmp_path / 'version.gvalues')
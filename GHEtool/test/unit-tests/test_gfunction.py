@@ -6,8 +6,9 @@ import pandas as pd
 import pygfunction as gt
 import pytest
 from pytest import raises
+from scipy import interpolate
 
-from GHEtool import Borefield, FOLDER
+from GHEtool import Borefield, FOLDER, GroundConstantTemperature
 from GHEtool.VariableClasses import FIFO, GFunction
 
 borehole_length_array = np.array([1, 5, 6])
@@ -569,3 +570,139 @@ def test_no_borefield_description_ann():
     time_steps = np.arange(3600, 3600 * 24 * 365 * 100, 3600)
     with pytest.raises(ValueError):
         gfunc.calculate(time_steps, borefield, 1e-6, use_neural_network=True)
+
+
+def test_cache_multiple_borefields():
+    gfunc = GFunction()
+    alpha = 0.00005
+    time_values = borefield_ghe.load.time_L4
+    borefield_1 = gt.borefield.Borefield.rectangle_field(2, 2, 5, 5, 100, 1, 0.075)
+    borefield_2 = gt.borefield.Borefield.rectangle_field(3, 2, 5, 5, 100, 1, 0.075)
+
+    gfunc.calculate(time_values, borefield_1, alpha)
+    _change_borefield_borehole_length(borefield_1, 120)
+    gfunc.calculate(time_values, borefield_1, alpha)
+    assert gfunc.cache_misses == 2 and gfunc.cache_hits == 0
+    gvalues = gfunc.previous_gfunctions.copy()
+
+    gfunc.calculate(time_values, borefield_2, alpha)
+    assert gfunc.borehole_length_array.size == 1
+    assert len(gfunc._cache) == 1
+
+    # the data of the first borefield is restored, so it can be interpolated
+    _change_borefield_borehole_length(borefield_1, 110)
+    gfunc.calculate(time_values, borefield_1, alpha)
+    assert gfunc.cache_hits == 1
+    assert np.array_equal(gfunc.previous_gfunctions, gvalues)
+    assert len(gfunc._cache) == 1
+
+    # other alpha
+    gfunc.calculate(time_values, borefield_1, alpha * 2)
+    assert len(gfunc._cache) == 2
+
+    # the least recently used entry is removed
+    gfunc.max_cache_entries = 1
+    gfunc.cache_previous_data()
+    assert len(gfunc._cache) == 1
+    assert gfunc._cache_key(borefield_1, alpha * 2) in gfunc._cache
+    gfunc.max_cache_memory = 0
+    gfunc.calculate(time_values, borefield_2, alpha)
+    gfunc.cache_previous_data()
+    assert len(gfunc._cache) == 0
+
+    gfunc.clear_cache()
+    assert gfunc.cache_hits == 0 and gfunc.cache_misses == 0
+    assert gfunc.previous_gfunctions.size == 0
+
+
+def test_cache_borefield_class():
+    borefield_test = Borefield()
+    borefield_test.ground_data = GroundConstantTemperature(3, 10)
+    borefield_test.create_rectangular_borefield(2, 2, 5, 5, 100, 1, 0.075)
+    borefield_test.gfunction(borefield_ghe.load.time_L4)
+    borefield_test.create_rectangular_borefield(3, 2, 5, 5, 100, 1, 0.075)
+    borefield_test.gfunction(borefield_ghe.load.time_L4)
+    gvalues = borefield_test.gfunction(borefield_ghe.load.time_L4, 101)
+    borefield_test.create_rectangular_borefield(2, 2, 5, 5, 100, 1, 0.075)
+    hits = borefield_test.gfunction_calculation_object.cache_hits
+    borefield_test.gfunction(borefield_ghe.load.time_L4)
+    assert borefield_test.gfunction_calculation_object.cache_hits == hits + 1
+    borefield_test.create_rectangular_borefield(3, 2, 5, 5, 100, 1, 0.075)
+    assert np.array_equal(gvalues, borefield_test.gfunction(borefield_ghe.load.time_L4, 101))
+
+
+def test_neural_network_batch():
+    gfunc = GFunction()
+    configurations = np.array([[2, 3, 5, 6, 100, 1, 0.075, 1e-6],
+                               [10, 12, 6, 6, 150, 2, 0.075, 1.5e-6],
+                               [5, 5, 5, 5, 300, 4, 0.1, 2e-6]])
+    time_steps = GFunction.DEFAULT_TIMESTEPS
+    result = gfunc.calculate_with_neural_network_batch(configurations, [3, 1, 3])
+    assert result.shape == (3, 87)
+    for row, shape, gvalues in zip(configurations, [3, 1, 3], result):
+        borefield = gt.borefield.Borefield.rectangle_field(int(row[0]), int(row[1]), row[2], row[3], row[4], row[5],
+                                                           row[6])
+        assert np.allclose(gvalues, gfunc.calculate(time_steps, borefield, row[7], use_neural_network=True,
+                                                    borefield_description={"type": shape, "N_1": row[0],
+                                                                           "N_2": row[1], "B_1": row[2],
+                                                                           "B_2": row[3]}))
+    # one shape for all configurations
+    assert np.allclose(gfunc.calculate_with_neural_network_batch(configurations, 3)[[0, 2]], result[[0, 2]])
+    # one configuration
+    assert np.allclose(gfunc.calculate_with_neural_network_batch(configurations[1], 1), result[1])
+    with pytest.raises(ValueError):
+        gfunc.calculate_with_neural_network_batch(configurations[:, :7], 3)
+    with pytest.raises(ValueError):
+        gfunc.calculate_with_neural_network_batch(configurations, [3, 1, 6])
+    with pytest.warns():
+        gfunc.calculate_with_neural_network_batch(np.array([[2, 3, 5, 6, 500, 1, 0.075, 1e-6]]), 3)
+
+
+def test_ann_model_shared():
+    gfunc = GFunction()
+    gfunc_copy = copy.deepcopy(gfunc)
+    assert gfunc.model_weights is GFunction().model_weights
+    assert gfunc.model_weights is gfunc_copy.model_weights
+    assert len(gfunc.model_weights) == 5
+    assert [weights.shape for weights in gfunc.model_weights[0]] == \
+           [(8, 256), (256, 1), (256, 128), (128, 1), (128, 87), (87, 1)]
+    assert gfunc.short_term_ann_correction['g_store'].shape == (6, 6, 10, 5, 12)
+    # the shared arrays cannot be changed
+    with pytest.raises(ValueError):
+        gfunc.model_weights[0][0][0, 0] = 1
+
+
+def test_previous_gfunctions_buffer():
+    gfunc = GFunction()
+    gfunc.threshold_borehole_length_interpolation = 10
+    time_values = np.linspace(3600, 3600 * 8760 * 10, 20)
+    lengths = [150, 50, 100, 300, 75, 200, 250, 125, 60]
+    for length in lengths:
+        gfunc.set_new_calculated_data(time_values, length, np.log(length) * np.sqrt(time_values), borefield, 0.00005)
+        if length == 150:
+            assert gfunc.previous_gfunctions.ndim == 1
+    assert np.array_equal(gfunc.borehole_length_array, np.sort(lengths))
+    assert gfunc.previous_gfunctions.shape == (len(lengths), time_values.size)
+    assert np.allclose(gfunc.previous_gfunctions[:, -1], np.log(np.sort(lengths)) * np.sqrt(time_values[-1]))
+    # the capacity is doubled instead of growing on every insert
+    assert gfunc._borehole_length_buffer.size == 16
+
+    time_request = np.linspace(3600 * 5, 3600 * 8760 * 9, 15)
+    for length in (50, 80, 110.5, 300):
+        reference = interpolate.interpn((gfunc.borehole_length_array, gfunc.time_array), gfunc.previous_gfunctions,
+                                        np.array([[length, t] for t in time_request]))
+        assert np.allclose(gfunc.interpolate_gfunctions(time_request, length, 0.00005, borefield), reference)
+    assert np.allclose(gfunc.interpolate_gfunctions(time_values, 80, 0.00005, borefield),
+                       (0.8 * np.log(75) + 0.2 * np.log(100)) * np.sqrt(time_values))
+
+
+def test_interpolate_gfunctions_returns_copy():
+    gfunc = GFunction()
+    time_values = np.linspace(3600, 3600 * 8760 * 10, 20)
+    gfunc.set_new_calculated_data(time_values, 100, np.log(100) * np.sqrt(time_values), borefield, 0.00005)
+    gvalues = gfunc.interpolate_gfunctions(gfunc.time_array, 100, 0.00005, borefield)
+    expected = gvalues.copy()
+    # storing shorter borehole lengths shifts the rows of the buffer
+    for length in (80, 60, 40):
+        gfunc.set_new_calculated_data(time_values, length, np.log(length) * np.sqrt(time_values), borefield, 0.00005)
+    assert np.array_equal(gvalues, expected)
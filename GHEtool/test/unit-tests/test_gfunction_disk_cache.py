@@ -0,0 +1,89 @@
+import os
+import time
+
+import numpy as np
+import pygfunction as gt
+
+from GHEtool import Borefield, GroundConstantTemperature
+from GHEtool.VariableClasses import GFunction, GFunctionDiskCache
+
+borefield = gt.borefield.Borefield.rectangle_field(2, 2, 5, 5, 100, 1, 0.075)
+time_values = np.array([3600, 3600 * 24, 3600 * 8760])
+options = {'method': 'equivalent'}
+
+
+def test_key():
+    key = GFunctionDiskCache.key(borefield, 1e-6, time_values, options)
+    assert key == GFunctionDiskCache.key(gt.borefield.Borefield.rectangle_field(2, 2, 5, 5, 100, 1, 0.075), 1e-6,
+                                         time_values.astype(float), {'method': 'equivalent'})
+    assert key != GFunctionDiskCache.key(gt.borefield.Borefield.rectangle_field(2, 2, 5, 5, 101, 1, 0.075), 1e-6,
+                                         time_values, options)
+    assert key != GFunctionDiskCache.key(borefield, 1.1e-6, time_values, options)
+    assert key != GFunctionDiskCache.key(borefield, 1e-6, time_values[:2], options)
+    assert key != GFunctionDiskCache.key(borefield, 1e-6, time_values, {'method': 'similarities'})
+
+
+def test_put_get(tmp_path):
+    cache = GFunctionDiskCache(tmp_path)
+    assert cache.get('test') is None
+    cache.put('test', np.array([1., 2., 3.]))
+    assert np.array_equal(cache.get('test'), np.array([1., 2., 3.]))
+    assert cache.hits == 1 and cache.misses == 1
+    # no temporary files are left
+    assert os.listdir(tmp_path) == ['test.npy']
+    # another cache object on the same directory (e.g. in another process) sees the entry
+    assert np.array_equal(GFunctionDiskCache(tmp_path).get('test'), np.array([1., 2., 3.]))
+    cache.clear()
+    assert cache.get('test') is None
+
+
+def test_evict(tmp_path):
+    # every entry is a little over 8 kB
+    cache = GFunctionDiskCache(tmp_path, max_size=0.02)
+    cache.put('first', np.zeros(1000))
+    cache.put('second', np.zeros(1000))
+    os.utime(tmp_path / 'first.npy', (time.time() - 100, time.time() - 100))
+    os.utime(tmp_path / 'second.npy', (time.time() - 50, time.time() - 50))
+    # first is used, so second is the least recently used entry
+    cache.get('first')
+    cache.put('third', np.zeros(1000))
+    assert sorted(os.listdir(tmp_path)) == ['first.npy', 'third.npy']
+
+
+def test_gfunction_disk_cache(tmp_path):
+    gfunc = GFunction()
+    gfunc.set_disk_cache(tmp_path)
+    cache = gfunc.disk_cache
+    gvalues = gfunc.calculate(time_values, borefield, 1e-6)
+    assert cache.misses == 1 and cache.hits == 0
+    assert len(os.listdir(tmp_path)) == 1
+    # the cache is only recreated when the settings change
+    gfunc.set_disk_cache(tmp_path)
+    assert gfunc.disk_cache is cache
+    gfunc.set_disk_cache(tmp_path, 10)
+    assert gfunc.disk_cache is not cache
+
+    gfunc_new = GFunction()
+    gfunc_new.set_disk_cache(tmp_path)
+    assert np.array_equal(gvalues, gfunc_new.calculate(time_values, borefield, 1e-6))
+    assert gfunc_new.disk_cache.hits == 1
+
+    gfunc_new.set_disk_cache()
+    assert gfunc_new.disk_cache is None
+
+
+def test_borefield_disk_cache(tmp_path):
+    borefield_ghe = Borefield()
+    borefield_ghe.ground_data = GroundConstantTemperature(3, 10)
+    borefield_ghe.borefield = gt.borefield.Borefield.rectangle_field(2, 2, 5, 5, 100, 1, 0.075)
+    borefield_ghe.calculation_setup(gfunction_cache_directory=tmp_path, gfunction_cache_size=10)
+    gvalues = borefield_ghe.gfunction(time_values, 120)
+    assert borefield_ghe.gfunction_calculation_object.disk_cache.max_size == 10
+    assert len(os.listdir(tmp_path)) == 1
+
+    borefield_ghe = Borefield()
+    borefield_ghe.ground_data = GroundConstantTemperature(3, 10)
+    borefield_ghe.borefield = gt.borefield.Borefield.rectangle_field(2, 2, 5, 5, 100, 1, 0.075)
+    borefield_ghe.calculation_setup(gfunction_cache_directory=tmp_path)
+    assert np.array_equal(gvalues, borefield_ghe.gfunction(time_values, 120))
+    assert borefield_ghe.gfunction_calculation_object.disk_cache.hits == 1
@@ -0,0 +1,95 @@
+import os
+
+import numpy as np
+import pygfunction as gt
+
+from GHEtool import Borefield, GroundConstantTemperature
+from GHEtool.VariableClasses import CustomGFunction, GFunctionLibrary
+
+borefield = gt.borefield.Borefield.rectangle_field(2, 2, 5, 5, 100, 1, 0.075)
+time_values = np.array([3600 * 24, 3600 * 8760])
+alpha = 3 / 2.4e6
+
+
+def create_dataset(directory, name, alpha, options={'method': 'equivalent'}):
+    custom_gfunction = CustomGFunction(borehole_length_array=np.array([50, 100, 150]), options=dict(options))
+    custom_gfunction.create_custom_dataset(borefield, alpha)
+    custom_gfunction.dump_custom_dataset(str(directory) + '/', name)
+    return custom_gfunction
+
+
+def test_find(tmp_path):
+    library = GFunctionLibrary(tmp_path)
+    assert library.find(borefield, alpha, {'method': 'equivalent'}, time_values, 120) is None
+    assert library.misses == 1
+
+    dataset = create_dataset(tmp_path, 'dataset', alpha)
+    # pickled datasets and other files are skipped
+    dataset.dump_custom_dataset(str(tmp_path) + '/', 'pickle', use_pickle=True)
+    with open(tmp_path / 'other.txt', 'w') as f:
+        f.write('test')
+
+    # the index is rebuilt since the directory has changed
+    found = library.find(borefield, alpha, {'method': 'equivalent', 'display': False}, time_values, 120)
+    assert found == dataset
+    assert isinstance(found.gvalues_array, np.memmap)
+    assert library.hits == 1
+    assert len(library._index) == 1
+    # the loaded dataset is reused
+    assert library.find(borefield, alpha * 1.0005, {'method': 'equivalent'}, time_values, 120) is found
+
+    # multiple borehole lengths
+    assert library.find(borefield, alpha, {'method': 'equivalent'}, time_values, np.array([60, 140])) is found
+    assert library.find(borefield, alpha, {'method': 'equivalent'}, time_values, np.array([60, 160])) is None
+
+    # no match
+    assert library.find(borefield, alpha * 1.01, {'method': 'equivalent'}, time_values, 120) is None
+    assert library.find(borefield, alpha, {'method': 'similarities'}, time_values, 120) is None
+    assert library.find(borefield, alpha, {'method': 'equivalent'}, time_values, 200) is None
+    assert library.find(borefield, alpha, {'method': 'equivalent'}, [1e20], 120) is None
+    assert library.find(gt.borefield.Borefield.rectangle_field(2, 2, 6, 6, 100, 1, 0.075), alpha,
+                        {'method': 'equivalent'}, time_values, 120) is None
+    # with a larger tolerance
+    assert GFunctionLibrary(tmp_path, 0.02).find(borefield, alpha * 1.01, {'method': 'equivalent'},
+                                                 time_values, 120) == dataset
+
+
+def test_find_nearest(tmp_path):
+    create_dataset(tmp_path, 'low', alpha * 0.99)
+    high = create_dataset(tmp_path, 'high', alpha * 1.005)
+    library = GFunctionLibrary(tmp_path, 0.02)
+    assert library.find(borefield, alpha, {'method': 'equivalent'}, time_values, 120) == high
+    # variable ground thermal diffusivity
+    assert library.find(borefield, lambda depth, D: alpha * 1.004, {'method': 'equivalent'}, time_values, 120) == high
+
+
+def test_borefield_gfunction_library(tmp_path):
+    dataset = create_dataset(tmp_path, 'dataset', alpha)
+    borefield_ghe = Borefield()
+    borefield_ghe.ground_data = GroundConstantTemperature(3, 10)
+    borefield_ghe.borefield = gt.borefield.Borefield.rectangle_field(2, 2, 5, 5, 100, 1, 0.075)
+    assert borefield_ghe._get_gfunction_library() is None
+
+    borefield_ghe.calculation_setup(gfunction_library_directory=tmp_path)
+    gvalues = borefield_ghe.gfunction(time_values, 120)
+    library = borefield_ghe._gfunction_library
+    assert library.hits == 1
+    assert np.array_equal(gvalues, dataset.calculate_gfunction(time_values, 120))
+    assert np.allclose(borefield_ghe.gfunction_batch(time_values, [80, 120]),
+                       dataset.calculate_gfunctions(time_values, [80, 120]))
+    assert library.hits == 2
+    # the library is only recreated when the settings change
+    assert borefield_ghe._get_gfunction_library() is library
+    borefield_ghe.calculation_setup(gfunction_library_tolerance=0.01)
+    assert borefield_ghe._get_gfunction_library() is not library
+
+    # outside the range of the library, the g-values are calculated with pygfunction
+    assert np.allclose(borefield_ghe.gfunction(time_values, 200),
+                       gt.gfunction.gFunction(gt.borefield.Borefield.rectangle_field(2, 2, 5, 5, 200, 1, 0.075),
+                                              alpha, time_values, method='equivalent').gFunc)
+    assert borefield_ghe._gfunction_library.misses == 1
+
+    # the library is not used when the precalculated datasets are bypassed
+    borefield_ghe.calculation_setup(use_precalculated_dataset=False)
+    borefield_ghe.gfunction(time_values, 120)
+    assert borefield_ghe._gfunction_library.hits == 0
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+HEAVY_MODULES = ('torch', 'joblib', 'optuna', 'matplotlib', 'sklearn')
+
+
+def _run(code: str) -> str:
+    return subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+
+
+def test_import_does_not_load_heavy_modules():
+    loaded = _run('import sys\n'
+                  'import GHEtool\n'
+                  f'print(",".join(m for m in {HEAVY_MODULES} if m in sys.modules))')
+    assert loaded.strip() == ''
+
+
+def _import_times(code: str) -> dict:
+    # cumulative import time [us] of every imported module, as reported by python -X importtime
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                            check=True).stderr
+    times = {}
+    for line in stderr.splitlines():
+        fields = line.removeprefix('import time:').split('|')
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            times[fields[2].strip()] = int(fields[1])
+    return times
+
+
+def test_import_time():
+    # the import time of GHEtool itself depends on the machine, so instead of a threshold on the (wall-clock) import
+    # time, the import tree is checked: no time may be spent on the heavy modules when GHEtool is imported
+    times = _import_times('import GHEtool')
+    assert times['GHEtool'] > 0
+    assert [name for name in times if name.split('.')[0] in HEAVY_MODULES] == []
+    # a heavy module that is imported does show up in the import tree
+    assert 'optuna' in _import_times('import GHEtool\nimport optuna')
+
+
+def test_lazy_import_on_use():
+    loaded = _run('import sys\n'
+                  'from GHEtool import MuoviEllipse\n'
+                  'pipe = MuoviEllipse(1.5, 37e-3, 26e-3, 3e-3, 0.3)\n'
+                  'pipe.predict_Rb_Ra_series(0.075, 0.04, 0.1, 1.5, 2)\n'
+                  f'print(",".join(m for m in {HEAVY_MODULES} if m in sys.modules))')
+    assert loaded.strip() == ''
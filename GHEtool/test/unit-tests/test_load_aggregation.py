@@ -0,0 +1,53 @@
+import numpy as np
+import pygfunction as gt
+import pytest
+from scipy.signal import convolve
+
+from GHEtool.VariableClasses.LoadAggregation import LoadAggregation
+
+rng = np.random.default_rng(0)
+load = rng.uniform(-100, 100, 2000)
+
+
+def g_function(time: np.ndarray) -> np.ndarray:
+    return np.log(1 + time / 3600) ** 1.2
+
+
+def test_get_times():
+    aggregation = LoadAggregation()
+    times = aggregation.get_times(2000)
+    assert np.allclose(times, gt.load_aggregation.ClaessonJaved(3600, 2000 * 3600).get_times_for_simulation())
+    assert np.allclose(times[:5], np.arange(1, 6) * 3600)
+    assert times[-1] >= 2000 * 3600
+    assert len(LoadAggregation(cells_per_level=10).get_times(2000)) > len(times)
+
+
+def test_convolve_pygfunction():
+    aggregation = LoadAggregation()
+    times = aggregation.get_times(len(load))
+    result = aggregation.convolve(load, g_function(times))
+
+    reference = gt.load_aggregation.ClaessonJaved(3600, len(load) * 3600)
+    reference.initialize(g_function(times))
+    for i, q in enumerate(load):
+        reference.next_time_step(i * 3600)
+        reference.set_current_load(q)
+        assert np.isclose(result[i], reference.temporal_superposition())
+
+
+def test_convolve_direct():
+    aggregation = LoadAggregation()
+    result = aggregation.convolve(load, g_function(aggregation.get_times(len(load))))
+    exact = convolve(load, np.diff(g_function(np.arange(1, len(load) + 1) * 3600), prepend=0))[:len(load)]
+    # the first cells have a width of one hour, so the first hours are exact
+    assert np.allclose(result[:5], exact[:5])
+    assert np.max(np.abs(result - exact)) < 0.02 * np.max(np.abs(exact))
+
+
+def test_convolve_shorter_load():
+    aggregation = LoadAggregation()
+    g_values = g_function(aggregation.get_times(len(load)))
+    assert np.allclose(aggregation.convolve(load[:500], g_values, len(load)),
+                       aggregation.convolve(load, g_values)[:500])
+    with pytest.raises(ValueError):
+        aggregation.convolve(load[:500], g_values)
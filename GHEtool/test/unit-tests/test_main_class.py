@@ -1,5 +1,6 @@
 # noinspection PyPackageRequirements
 import copy
+import importlib
 import math
 from GHEtool import *
 
@@ -16,6 +17,7 @@ from GHEtool.VariableClasses.LoadData import MonthlyGeothermalLoadAbsolute, Hour
     HourlyBuildingLoadMultiYear, MonthlyBuildingLoadAbsolute
 from GHEtool.VariableClasses.BaseClass import UnsolvableDueToTemperatureGradient
 from GHEtool.Methods import *
+from GHEtool.Methods.optimise_load_profile import _PeakLimiter
 from GHEtool.VariableClasses.FlowData import VariableHourlyFlowRate, VariableHourlyMultiyearFlowRate
 
 data = GroundConstantTemperature(3, 10)
@@ -209,19 +211,19 @@ def test_create_custom_dataset():
         borefield_test.create_custom_dataset([100, 1000], [50, 100])
 
 
-def test_load_custom_gfunction():
+def test_load_custom_gfunction(tmp_path):
     borefield = Borefield()
     borefield.ground_data = ground_data_constant
     borefield.borefield = copy.deepcopy(borefield_gt)
     borefield.create_custom_dataset()
-    borefield.custom_gfunction.dump_custom_dataset("./", "test")
+    borefield.custom_gfunction.dump_custom_dataset(str(tmp_path) + '/', "test")
     dataset = copy.copy(borefield.custom_gfunction)
     borefield.borefield = None
     assert borefield.custom_gfunction is None
     borefield.custom_gfunction = dataset
     borefield.set_borefield(None)
     assert borefield.custom_gfunction is None
-    borefield.load_custom_gfunction("./test.gvalues")
+    borefield.load_custom_gfunction(tmp_path / "test.gvalues")
     assert borefield.custom_gfunction == dataset
 
 
@@ -507,6 +509,26 @@ def test_size_L3(quadrant, result):
     assert np.isclose(result, borefield.H)
 
 
+@pytest.mark.parametrize("solver", ['secant', 'illinois', 'brent'])
+@pytest.mark.parametrize("quadrant, result", zip([1, 2, 3, 4],
+                                                 [56.372611810628065, 71.43023711680347, 27.162673692721025,
+                                                  21.602240810876843]))
+def test_size_L3_sizing_solver(solver, quadrant, result):
+    borefield = Borefield()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.set_max_fluid_temperature(18)
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(2))
+    borefield.ground_data = ground_data_constant
+    borefield.size_L3(100, quadrant_sizing=quadrant)
+    iterations = borefield.sizing_iterations
+
+    borefield.calculation_setup(sizing_solver=solver)
+    # the interpolation of the g-functions causes small differences between both solvers
+    assert np.isclose(result, borefield.size_L3(100, quadrant_sizing=quadrant), rtol=0.01)
+    assert np.isclose(result, borefield.H, rtol=0.01)
+    assert 0 < borefield.sizing_iterations <= iterations
+
+
 def test_size_L4_value_errors():
     borefield = Borefield()
     with pytest.raises(ValueError):
@@ -559,6 +581,196 @@ def test_size_L4():
     assert borefield.calculate_quadrant() == 4
 
 
+def test_size_L4_spectral_convolution():
+    borefield = Borefield()
+    borefield.ground_data = ground_data_constant
+    load = HourlyGeothermalLoad()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+
+    borefield.calculation_setup(convolution_method='spectral')
+    length = borefield.size_L4(100, quadrant_sizing=1)
+    assert np.isclose(182.17317343989652, length, rtol=0.001)
+    assert borefield._spectral_convolution.anchor_lengths.size > 0
+    # the stored responses are removed when the borefield changes
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    assert borefield._spectral_convolution.anchor_lengths.size == 0
+
+
+@pytest.mark.parametrize("solver", ['secant', 'illinois', 'brent'])
+def test_size_L4_sizing_solver(solver):
+    borefield = Borefield()
+    borefield.ground_data = ground_data_constant
+    load = HourlyGeothermalLoad()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+
+    borefield.calculation_setup(sizing_solver=solver)
+    assert np.isclose(182.17317343989652, borefield.size_L4(100, quadrant_sizing=1), rtol=0.005)
+    assert borefield.sizing_iterations <= 6
+    borefield.set_max_fluid_temperature(25)
+    assert np.isclose(borefield.size_L4(100, quadrant_sizing=4), 174.2214456661528, rtol=0.005)
+
+
+@pytest.mark.parametrize("candidates", [1, 10])
+def test_size_L4_sparse(candidates):
+    borefield = Borefield()
+    borefield.ground_data = ground_data_constant
+    load = HourlyGeothermalLoad()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+    borefield.calculation_setup(sparse_hourly_sizing=True, sparse_hourly_candidates=candidates)
+
+    assert np.isclose(182.17317343989652, borefield.size_L4(100, quadrant_sizing=1))
+    assert borefield.calculate_quadrant() == 1
+    # the results are the full temperature profile
+    assert np.all(np.isfinite(borefield.results.peak_injection))
+    # quadrant 2
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"), col_injection=0, col_extraction=1)
+    borefield.load = load
+    assert np.isclose(305.26723226385184, borefield.size_L4(100, quadrant_sizing=2))
+    borefield.calculation_setup(sizing_solver='secant')
+    assert np.isclose(305.26723226385184, borefield.size_L4(100, quadrant_sizing=2), rtol=0.005)
+    borefield.calculation_setup(sizing_solver='fixed_point')
+
+
+def test_size_cascade():
+    borefield = Borefield()
+    borefield.ground_data = ground_data_constant
+    load = HourlyGeothermalLoad()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+
+    assert np.isclose(182.17317343989652, borefield.size(100, L4_sizing=True), rtol=0.005)
+    assert list(borefield.sizing_stage_times) == ['L4']
+    assert np.isclose(182.17317343989652, borefield.size(100, L4_sizing=True, cascade_sizing=True), rtol=0.005)
+    assert list(borefield.sizing_stage_times) == ['L2', 'L3', 'L4']
+    assert all(value > 0 for value in borefield.sizing_stage_times.values())
+    # the tolerances are restored
+    assert borefield._calculation_setup.atol == 0.05 and not borefield._calculation_setup.cascade_sizing
+    borefield.size(100, L3_sizing=True, cascade_sizing=True)
+    assert list(borefield.sizing_stage_times) == ['L2', 'L3']
+    borefield.size(100, L2_sizing=True, cascade_sizing=True)
+    assert list(borefield.sizing_stage_times) == ['L2']
+
+    # the L2 sizing is skipped for building loads
+    borefield.load = HourlyBuildingLoad(efficiency_heating=4, efficiency_cooling=20)
+    borefield.load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.size(100, L4_sizing=True, cascade_sizing=True)
+    assert list(borefield.sizing_stage_times) == ['L3', 'L4']
+
+
+def test_load_aggregation():
+    borefield = Borefield()
+    borefield.ground_data = ground_data_constant
+    load = HourlyGeothermalLoad()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+
+    borefield.calculate_temperatures(hourly=True)
+    temperatures = borefield.results.Tf.copy()
+    borefield.calculation_setup(convolution_method='load_aggregation')
+    borefield.calculate_temperatures(hourly=True)
+    assert borefield._temp_results['g_values'].size == \
+           borefield._load_aggregation.get_times(borefield.load.simulation_period * 8760).size
+    assert np.allclose(temperatures, borefield.results.Tf, atol=0.3)
+    assert np.isclose(182.17317343989652, borefield.size_L4(100, quadrant_sizing=1), rtol=0.002)
+
+
+@pytest.mark.parametrize("hourly", [False, True])
+def test_calculate_temperature_profiles(hourly):
+    borefield = Borefield()
+    borefield.ground_data = GroundFluxTemperature(3, 10)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.pipe_data = pipeData
+    borefield.fluid_data = ConstantFluidData(0.5, 1200, 4000, 0.001)
+    borefield.flow_data = ConstantFlowRate(mfr=0.2)
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+
+    lengths = np.array([80, 100, 150])
+    peak_injection, peak_extraction = borefield.calculate_temperature_profiles(lengths, hourly=hourly)
+    assert peak_injection.shape == peak_extraction.shape == \
+           (3, borefield.load.simulation_period * (8760 if hourly else 12))
+    # the borehole length and the results are not changed
+    assert borefield.H == 110
+    for i, length in enumerate(lengths):
+        borefield.calculate_temperatures(length, hourly=hourly)
+        assert np.allclose(peak_injection[i], borefield.results.peak_injection)
+        assert np.allclose(peak_extraction[i], borefield.results.peak_extraction)
+
+    # temperature dependent load
+    borefield.load = HourlyBuildingLoad(efficiency_cooling=EERCombined(20, 5, 17))
+    borefield.load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    peak_injection, peak_extraction = borefield.calculate_temperature_profiles(lengths, hourly=hourly)
+    borefield.calculate_temperatures(150, hourly=hourly)
+    assert np.allclose(peak_injection[2], borefield.results.peak_injection)
+    assert np.allclose(peak_extraction[2], borefield.results.peak_extraction)
+
+
+@pytest.mark.parametrize("hourly, flow_data, size_based_on", [
+    (False, ConstantFlowRate(mfr=0.2), 'inlet'),
+    (False, ConstantDeltaTFlowRate(delta_temp_extraction=3, delta_temp_injection=4), 'average'),
+    (False, ConstantDeltaTFlowRate(delta_temp_extraction=3, delta_temp_injection=4), 'outlet'),
+    (True, VariableHourlyFlowRate(mfr=0.2 + 0.1 * np.sin(np.arange(8760) / 200)), 'average'),
+    (True, VariableHourlyFlowRate(mfr=0.2 + 0.1 * np.sin(np.arange(8760) / 200)), 'inlet'),
+    (True, ConstantDeltaTFlowRate(delta_temp_extraction=3, delta_temp_injection=4), 'outlet')])
+def test_calculate_temperature_profiles_single_length(hourly, flow_data, size_based_on):
+    borefield = Borefield()
+    borefield.ground_data = GroundFluxTemperature(3, 10)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.pipe_data = pipeData
+    borefield.fluid_data = ConstantFluidData(0.5, 1200, 4000, 0.001)
+    borefield.flow_data = flow_data
+    borefield.calculation_setup(use_constant_Rb=False, size_based_on=size_based_on)
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+
+    lengths = np.array([80, 100, 150])
+    peak_injection, peak_extraction = borefield.calculate_temperature_profiles(lengths, hourly=hourly)
+    suffix = '' if size_based_on == 'average' else f'_{size_based_on}'
+    # every row is the temperature profile for a single borehole length
+    for i, length in enumerate(lengths):
+        borefield._calculate_temperature_profile(length, hourly=hourly)
+        assert np.allclose(peak_injection[i], getattr(borefield.results, f'peak_injection{suffix}'), rtol=0, atol=1e-9)
+        assert np.allclose(peak_extraction[i], getattr(borefield.results, f'peak_extraction{suffix}'), rtol=0,
+                           atol=1e-9)
+
+
+def test_calculate_temperature_profiles_errors():
+    borefield = Borefield()
+    borefield.ground_data = ground_data_constant
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(2))
+    with pytest.raises(ValueError):
+        borefield.calculate_temperature_profiles([100, 120], hourly=True)
+
+
+def test_gfunction_batch():
+    borefield = Borefield()
+    borefield.ground_data = ground_data_constant
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    time_values = np.array([3600, 3600 * 24 * 30, 3600 * 8760 * 10])
+    gvalues = borefield.gfunction_batch(time_values, [100, 150])
+    assert borefield.H == 110
+    assert np.allclose(gvalues, [borefield.gfunction(time_values, 100), borefield.gfunction(time_values, 150)])
+    borefield.create_custom_dataset(borehole_length_array=[50, 100, 150, 200])
+    assert np.allclose(borefield.gfunction_batch(time_values, [100, 150]),
+                       [borefield.custom_gfunction.calculate_gfunction(time_values, 100),
+                        borefield.custom_gfunction.calculate_gfunction(time_values, 150)])
+    with pytest.raises(UnsolvableDueToTemperatureGradient):
+        borefield.ground_data = GroundFluxTemperature(3, 10)
+        borefield.gfunction_batch(time_values, [100, Borefield.THRESHOLD_DEPTH_ERROR + 1])
+
+
 def test_calculate_temperatures_eer_combined():
     eer_combined = EERCombined(20, 5, 17)
     borefield = Borefield()
@@ -836,6 +1048,76 @@ def test_optimise_load_profile_power(monkeypatch):
     assert len(borefield.results.peak_extraction) == 0
 
 
+@pytest.mark.parametrize("dhw_preferential", [None, True, False])
+def test_optimise_load_profile_power_threshold(dhw_preferential):
+    borefield = Borefield()
+    borefield.ground_data = ground_data_constant
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.H = 50
+    load = HourlyBuildingLoad(efficiency_heating=10 ** 6, efficiency_cooling=10 * 66)
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    load.set_hourly_dhw_load(load.hourly_heating_load * 0.3)
+    borefield_load, external_load = optimise_load_profile_power(borefield, load, dhw_preferential=dhw_preferential)
+
+    # the fluid temperatures are within the threshold of their limits
+    borefield.load = borefield_load
+    borefield.calculate_temperatures(hourly=True)
+    assert borefield.Tf_min - 0.05 <= np.min(borefield.results.peak_extraction) <= borefield.Tf_min + 0.05
+    assert np.max(borefield.results.peak_injection) <= borefield.Tf_max + 0.05
+    assert borefield_load.max_peak_heating < load.max_peak_heating
+    if dhw_preferential is None:
+        assert np.isclose(borefield_load.max_peak_dhw, load.max_peak_dhw)
+    elif dhw_preferential:
+        # the heating is reduced before the dhw
+        assert borefield_load.max_peak_dhw == load.max_peak_dhw or borefield_load.max_peak_heating <= 0.1
+    else:
+        assert borefield_load.max_peak_dhw <= 0.1
+
+
+def test_optimise_load_profile_power_incremental_convolution(monkeypatch):
+    borefield_module = importlib.import_module('GHEtool.Borefield')
+    lengths = []
+
+    def convolve(load, g_value_differences):
+        lengths.append(len(load))
+        return borefield_module.fftconvolve(load, g_value_differences)
+
+    monkeypatch.setattr(borefield_module, 'convolve', convolve)
+    borefield = Borefield()
+    borefield.ground_data = ground_data_constant
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.H = 50
+    load = HourlyBuildingLoad(efficiency_heating=10 ** 6, efficiency_cooling=10 * 66)
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    optimise_load_profile_power(borefield, load)
+
+    # only the first profile is convolved over the full simulation period, the next ones only update the
+    # convolution from the first hour with a different load onwards
+    n_hours = load.simulation_period * 8760
+    assert len(lengths) > 1
+    assert lengths[0] == n_hours
+    assert all(length < n_hours for length in lengths[1:])
+
+
+def test_peak_limiter():
+    limiter = _PeakLimiter(0, 10, 0.01)
+    assert limiter.update(10, 2) == (5, False)
+    # secant step between both ends of the bracket
+    assert limiter.update(5, -2) == (7.5, False)
+    # bisection when the same end is moved twice in a row
+    level, converged = limiter.update(7.5, -1)
+    assert level == 8.75 and not converged
+    assert limiter.update(8.75, 0.005) == (8.75, True)
+    # converged at the bounds
+    assert _PeakLimiter(0, 10, 0.01).update(10, -1) == (10, True)
+    assert _PeakLimiter(0, 10, 0.01).update(0, 1) == (0, True)
+
+    # bisection when the secant step does not fall strictly inside the bracket due to rounding
+    limiter = _PeakLimiter(0, 10, 0.01)
+    assert limiter.update(10, 1e300) == (5, False)
+    assert limiter.update(5, -1) == (7.5, False)
+
+
 def test_optimise_load_profile_power_multiyear(monkeypatch):
     # multiyear should also have a multiyear as output
     borefield = Borefield()
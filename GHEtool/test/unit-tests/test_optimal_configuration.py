@@ -1,8 +1,10 @@
+import numpy as np
 import pytest
 
 from GHEtool import *
 from GHEtool.Validation.cases import load_case
-from GHEtool.Methods.optimise_borefield_configuration import optimise_borefield_configuration, _check_identical_field
+from GHEtool.Methods.optimise_borefield_configuration import optimise_borefield_configuration, _check_identical_field, \
+    brute_force_config
 from GHEtool.VariableClasses.BaseClass import UnsolvableOptimalFieldError
 
 
@@ -54,3 +56,127 @@ def test_flow_field():
     borefield.calculation_setup(use_neural_network=True)
     with pytest.raises(AttributeError):
         optimise_borefield_configuration(borefield, 100, 100, 5, 7, 0.5, 150, 150, nb_max=50, flow_field=1)
+
+
+def test_n_workers():
+    borefield = Borefield(ground_data=GroundConstantTemperature(3.5, 10),
+                          load=MonthlyGeothermalLoadAbsolute(*load_case(1)))
+    borefield.create_rectangular_borefield(10, 6, 6.5, 6.5, 100, 4, 0.075)
+    borefield.calculation_setup(use_neural_network=True)
+
+    results = optimise_borefield_configuration(borefield, 100, 100, 5, 7, 0.5, 60, 150, nb_of_trials=10, n_workers=2)
+    assert len(results) > 0
+    # the results are sorted and every configuration is only given once
+    assert [result[0] for result in results] == sorted(result[0] for result in results)
+    assert len({tuple(sorted(result[1].items())) for result in results}) == len(results)
+    for total_length, params, number, field in results:
+        assert number == field.nBoreholes
+        assert np.isclose(total_length, field.H * field.nBoreholes)
+    # the original borefield is not altered
+    assert borefield.number_of_boreholes == 60
+
+    with pytest.raises(ValueError):
+        optimise_borefield_configuration(borefield, 100, 100, 5, 7, 0.5, 60, 150, n_workers=0)
+
+
+@pytest.mark.parametrize("optimise", ['length', 'number'])
+def test_pruning(optimise):
+    borefield = Borefield(ground_data=GroundConstantTemperature(3.5, 10),
+                          load=MonthlyGeothermalLoadAbsolute(*load_case(1)))
+    borefield.create_rectangular_borefield(10, 6, 6.5, 6.5, 100, 4, 0.075)
+    borefield.calculation_setup(use_neural_network=True)
+
+    statistics = {}
+    results = optimise_borefield_configuration(borefield, 100, 100, 5, 7, 0.5, 60, 150, nb_of_trials=50,
+                                               optimise=optimise, pruning=True, statistics=statistics)
+    assert statistics['trials'] == 50
+    assert statistics['completed'] + sum(statistics['pruned'].values()) == 50
+    assert sum(statistics['pruned'].values()) > 0
+    if optimise == 'number':
+        # the L2 sizing is only used to prune when optimising for the total length
+        assert statistics['pruned']['L2'] == 0
+    assert len(results) <= statistics['completed']
+    total_length, params, number, field = results[0]
+    assert (60 - borefield.D) * number <= total_length * (1 + 1e-6)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_pruning_optimum(seed):
+    borefield = Borefield(ground_data=GroundConstantTemperature(3.5, 10),
+                          load=MonthlyGeothermalLoadAbsolute(*load_case(1)))
+    borefield.create_rectangular_borefield(10, 6, 6.5, 6.5, 100, 4, 0.075)
+    borefield.calculation_setup(use_neural_network=True)
+
+    results = []
+    for pruning in (False, False, True):
+        statistics = {}
+        results.append(optimise_borefield_configuration(borefield, 35, 30, 5, 7, 1, 60, 150, nb_of_trials=40,
+                                                        types=[3], pruning=pruning, seed=seed,
+                                                        statistics=statistics)[0])
+        assert (statistics['pruned']['L2'] > 0) == pruning
+    # the same seed gives the same study
+    assert results[0][:3] == results[1][:3]
+    # the heuristic L2 margin does not prune the optimal configuration, although the borehole length can differ
+    # slightly since the g-values are interpolated between other borehole lengths
+    assert results[0][1:3] == results[2][1:3]
+    assert np.isclose(results[0][0], results[2][0], rtol=1e-4)
+
+
+def test_surrogate():
+    borefield = Borefield(ground_data=GroundConstantTemperature(3.5, 10),
+                          load=MonthlyGeothermalLoadAbsolute(*load_case(1)))
+    borefield.create_rectangular_borefield(10, 6, 6.5, 6.5, 100, 4, 0.075)
+    borefield.calculation_setup(use_neural_network=True)
+
+    statistics = {}
+    results = optimise_borefield_configuration(borefield, 100, 100, 5, 7, 0.5, 60, 150, nb_of_trials=60,
+                                               surrogate=True, surrogate_warmup=15, statistics=statistics, seed=3)
+    assert statistics['trials'] == 60
+    assert statistics['completed'] + sum(statistics['pruned'].values()) == 60
+    assert statistics['pruned']['configuration'] == statistics['pruned']['L2'] == 0
+    assert statistics['pruned']['surrogate'] > 0
+    assert 0 <= statistics['surrogate_error'] < 0.1
+    assert len(results) <= statistics['completed']
+    # the screened trials do not contain the optimum of the study without screening
+    total_length, params, number, _ = optimise_borefield_configuration(borefield, 100, 100, 5, 7, 0.5, 60, 150,
+                                                                       nb_of_trials=60, seed=3)[0]
+    assert results[0][1:3] == (params, number)
+    assert np.isclose(results[0][0], total_length, rtol=1e-4)
+
+    statistics = {}
+    optimise_borefield_configuration(borefield, 100, 100, 5, 7, 0.5, 60, 150, nb_of_trials=10, surrogate=True,
+                                     statistics=statistics)
+    # not enough sized trials to fit the surrogate model
+    assert statistics['pruned']['surrogate'] == 0
+    assert statistics['surrogate_error'] is None
+
+
+@pytest.mark.parametrize("optimise, n_workers, expected", [
+    ('length', 1, (4711.927129957181, [6, 6, 5, 5, 3], 36)),
+    ('length', 2, (4711.927129957181, [6, 6, 5, 5, 3], 36)),
+    ('number', 1, (4713.349721731048, [7, 5, 5, 5, 3], 35))])
+def test_brute_force_config(optimise, n_workers, expected):
+    borefield = Borefield(ground_data=GroundConstantTemperature(3.5, 10),
+                          load=MonthlyGeothermalLoadAbsolute(*load_case(1)))
+    borefield.create_rectangular_borefield(10, 6, 6.5, 6.5, 100, 4, 0.075)
+    borefield.calculation_setup(use_neural_network=True)
+
+    # the results are the same as for an exhaustive search over all configurations
+    total_length, params, number, field = brute_force_config(borefield, 35, 30, 5, 7, 1, 60, 150, types=[0, 3],
+                                                             optimise=optimise, n_workers=n_workers)
+    assert np.isclose(total_length, expected[0])
+    assert params == expected[1]
+    assert number == expected[2] == field.nBoreholes
+    assert np.isclose(field.H, total_length / number)
+
+
+def test_brute_force_config_unsolvable():
+    borefield = Borefield(ground_data=GroundConstantTemperature(3.5, 10),
+                          load=MonthlyGeothermalLoadAbsolute(*load_case(1)))
+    borefield.create_rectangular_borefield(10, 6, 6.5, 6.5, 100, 4, 0.075)
+    borefield.calculation_setup(use_neural_network=True)
+
+    with pytest.raises(UnsolvableOptimalFieldError):
+        brute_force_config(borefield, 8, 7, 5, 7, 1, 60, 150, types=[3])
+    with pytest.raises(ValueError):
+        brute_force_config(borefield, 8, 7, 5, 7, 1, 60, 150, n_workers=0)
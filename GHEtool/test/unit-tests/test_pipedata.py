@@ -523,6 +523,29 @@ def test_muoviEllipse():
     MuoviEllipse(1.5, 73e-3, 52e-3, 3e-3, 0.3)
 
 
+def test_muoviEllipse_ann():
+    test = MuoviEllipse(1.5, 37e-3, 26e-3, 3e-3, 0.05)
+    # reference values of the original model
+    R_b, R_a = test.predict_Rb_Ra_series([0.075, 0.09], [0.04, 0.05], [0.1, 0.15], 1.5, [2, 3])
+    assert np.allclose(R_b, [0.12806362, 0.16050482], rtol=1e-5)
+    assert np.allclose(R_a, [0.5304198, 0.65240204], rtol=1e-5)
+    R_b, R_a = MuoviEllipse(1.5, 73e-3, 52e-3, 3e-3, 0.05).predict_Rb_Ra_series([0.075, 0.09], [0.04, 0.05],
+                                                                                [0.1, 0.15], 1.5, [2, 3])
+    assert np.allclose(R_b, [0.0930602, 0.12643385], rtol=1e-5)
+    assert np.allclose(R_a, [0.3965547, 0.51135707], rtol=1e-5)
+
+    # arrays
+    R_b, R_a = test.predict_Rb_Ra_series(0.075, 0.04, np.full((3, 2), 0.1), 1.5, 2)
+    assert R_b.shape == R_a.shape == (3, 2)
+    assert np.allclose(R_b, 0.12806362, rtol=1e-5)
+    R_b, R_a = test.predict_Rb_Ra_series(0.075, 0.04, 0.1, 1.5, 2)
+    assert R_b.shape == ()
+
+    # the model is shared between objects of the same size
+    assert MuoviEllipse(1.5, 37e-3, 26e-3, 3e-3, 0.3)._model is test._model
+    assert MuoviEllipse(1.5, 46e-3, 33e-3, 3e-3, 0.3)._model is not test._model
+
+
 def test_muoviEllipse_error():
     with pytest.raises(ValueError):
         MuoviEllipse(1.5, 0.2, 0.2, 0.04, 0.03)
@@ -960,6 +983,38 @@ def test_explicit_models_double_U():
                       pipe.explicit_model_borehole_resistance(fluid, flow, 3, borehole, 1, R_p=0.05))
 
 
+@pytest.mark.parametrize("pipe", [SingleUTube(1.5, 0.013, 0.016, 0.4, 0.035),
+                                  DoubleUTube(1.5, 0.013, 0.016, 0.4, 0.035, config='adjacent'),
+                                  DoubleUTube(1.5, 0.013, 0.016, 0.4, 0.035),
+                                  CoaxialPipe(0.0221, 0.025, 0.0487, 0.055, 0.4, 1, is_inner_inlet=True)])
+def test_explicit_models_arrays(pipe):
+    fluid = TemperatureDependentFluidData('MPG', 25)
+    flow_range = np.tile(np.linspace(0.1, 0.5, 24), 365)
+    temperature = np.tile(np.linspace(0, 20, 24), 365)
+    borehole = Borehole(fluid, pipe, VariableHourlyFlowRate(mfr=flow_range))
+    lengths = np.array([80, 100, 150])
+    r_b = np.array([0.06, 0.075, 0.08])
+    k_s = np.array([1.5, 2, 3])
+
+    # all the borehole designs at once
+    result = borehole.calculate_Rb(lengths[:, np.newaxis], 1, r_b[:, np.newaxis], k_s[:, np.newaxis],
+                                   use_explicit_models=True, temperature=temperature, simulation_period=1)
+    assert result.shape == (3, 8760)
+    for i in range(3):
+        assert np.allclose(result[i], borehole.calculate_Rb(lengths[i], 1, r_b[i], k_s[i], use_explicit_models=True,
+                                                            temperature=temperature, simulation_period=1))
+    # scalar values
+    constant = Borehole(fluid, pipe, ConstantFlowRate(mfr=flow_range[5]))
+    assert np.isclose(result[1, 5], constant.calculate_Rb(100, 1, 0.075, 2, use_explicit_models=True,
+                                                          temperature=temperature[5]))
+    assert np.isclose(result[1, 5], pipe.explicit_model_borehole_resistance(
+        fluid, ConstantFlowRate(mfr=flow_range[5]), 2, gt.boreholes.Borehole(100, 1, 0.075, 0, 0),
+        temperature=temperature[5]))
+    assert np.allclose(result[:, 5], pipe.explicit_model_borehole_resistance(
+        fluid, ConstantFlowRate(mfr=flow_range[5]), k_s, r_b=r_b, borehole_length=lengths,
+        temperature=temperature[5]))
+
+
 def test_convective_resistance_variable_flow_constant_fluid():
     single = SingleUTube(1.5, 0.013, 0.016, 0.4, 0.035)
     coaxial = CoaxialPipe(r_in_in, r_in_out, r_out_in, r_out_out, k_p, k_g, is_inner_inlet=True)
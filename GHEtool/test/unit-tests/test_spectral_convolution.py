@@ -0,0 +1,59 @@
+import numpy as np
+from scipy.signal import convolve
+
+from GHEtool.VariableClasses.SpectralConvolution import SpectralConvolution
+
+rng = np.random.default_rng(0)
+load = rng.uniform(-100, 100, 500)
+
+
+def g_value_differences(length: float) -> np.ndarray:
+    return np.diff(np.log(1 + np.arange(load.size)) * length / 100, prepend=0)
+
+
+def test_convolve_anchor():
+    engine = SpectralConvolution()
+    length = engine._anchor_length(95)
+    assert np.allclose(engine.convolve(load, length, g_value_differences),
+                       convolve(load, g_value_differences(length))[:load.size])
+    assert engine.anchor_lengths.size == 1
+
+
+def test_convolve_interpolation():
+    engine = SpectralConvolution()
+    # the test function is linear in the length, so the interpolation is exact
+    assert np.allclose(engine.convolve(load, 100, g_value_differences),
+                       convolve(load, g_value_differences(100))[:load.size])
+    assert engine.anchor_lengths.size == 2
+    assert engine.anchor_lengths[0] <= 100 <= engine.anchor_lengths[1]
+
+    # no new anchors are needed when the length is in the same interval
+    calls = []
+
+    def counter(length):
+        calls.append(length)
+        return g_value_differences(length)
+
+    assert np.allclose(engine.convolve(load, 101, counter), convolve(load, g_value_differences(101))[:load.size])
+    assert calls == []
+
+
+def test_new_load():
+    engine = SpectralConvolution()
+    engine.convolve(load, 100, g_value_differences)
+    assert engine.anchor_lengths.size == 2
+    engine.convolve(load.copy(), 100, g_value_differences)
+    assert engine.anchor_lengths.size == 2
+    engine.convolve(load * 2, 150, g_value_differences)
+    assert engine.anchor_lengths.size == 2
+    assert np.all(engine.anchor_lengths > 140)
+    engine.reset()
+    assert engine.anchor_lengths.size == 0
+
+
+def test_max_number_of_anchors():
+    engine = SpectralConvolution(anchor_spacing=0.1, max_number_of_anchors=4)
+    for length in (50, 100, 150, 200):
+        engine.convolve(load, length, g_value_differences)
+    assert engine.anchor_lengths.size == 4
+    assert np.all(engine.anchor_lengths > 130)